@@ -62,6 +62,59 @@ RUN_IN_REALTIME = False
 CONNECT_TO_PROFILES_DB = False
 SEND_EVENTS_RESPONSES_TO_SDK_VIA_RQ = False
 
+# Controls when the garbage collector is forced to run during the simulation, one of
+# none / every_n_slots / rss_threshold / freeze_after_setup (see gsy_e_core.memory_policy).
+MEMORY_POLICY_MODE = "none"
+MEMORY_POLICY_COLLECT_EVERY_N_SLOTS = 1
+MEMORY_POLICY_RSS_THRESHOLD_MB = None
+
+# Controls whether the simulation state (used to resume interrupted simulations) is sent as
+# compressed binary checkpoints that only contain the changes since the previous checkpoint,
+# instead of the full JSON state of all areas (see gsy_e_core.sim_results.state_checkpoint).
+SIMULATION_STATE_BINARY_CHECKPOINTS = False
+# Number of delta checkpoints that are sent between two full checkpoints
+SIMULATION_STATE_FULL_CHECKPOINT_INTERVAL = 96
+
+# Controls whether the internal matcher uses the NumPy matching engine of gsy-e for the pay as bid
+# and pay as clear matching types (see myco_matcher.vectorized_matching), instead of the matching
+# algorithms of gsy-framework.
+VECTORIZED_MATCHING_ENGINE = False
+
+# Number of threads that calculate the first recommendations of the internal matcher for different
+# markets concurrently (the trades are still applied one market after the other, and are the same
+# as without threads). Only faster if the matching releases the GIL, e.g. with the
+# VECTORIZED_MATCHING_ENGINE. 0 disables the threads.
+MATCHING_WORKER_THREADS = 0
+
+# Markets are created without locks if this is enabled, which is only safe if no other thread than
+# the simulation thread accesses the markets. The simulation enables it if there is no redis
+# connection (no external connections, external matching or redis event dispatching).
+SINGLE_THREADED_MARKETS = False
+
+# Controls whether market events are only dispatched to the strategies and market agents that
+# subscribed to them (see EventMixin.get_market_event_subscriptions), instead of all children and
+# market agents of the area. The random numbers drawn for the fairness shuffling are the same.
+MARKET_EVENT_SUBSCRIPTIONS = False
+
+# Controls whether the children of an area and the listeners of a market receive their events in
+# an order that is drawn once per tick (see FairnessOrdering), instead of being shuffled again for
+# every event. The results differ from the default shuffling, but are reproducible for a seed.
+FAIRNESS_PERMUTATIONS_PER_TICK = False
+
+# Controls whether the market agents forward all orders that are due on a tick in one batch
+# (see OneSidedMarket.offers_bulk and TwoSidedMarket.bids_bulk), with one OFFERS_BULK event for
+# all forwarded offers instead of one OFFER event per offer. The strategies receive the offers in
+# a different order than with single events, therefore the results differ. Not used if the events
+# are dispatched via redis.
+BULK_ORDER_FORWARDING = False
+
+# Controls whether the market agents of two-sided spot markets only forward a bid to the market of
+# the parent area if the bid can be matched with an offer of that market or of one of the markets
+# above it (compared with the best offer rate of each market, after the grid fees of all markets
+# that the bid would pass). Bids that can not be matched anywhere above stay in their market until
+# matching offers are posted, which saves their copies in the markets above.
+MATCHABLE_BID_FORWARDING = False
+
 
 class SettlementTemplateStrategiesConstants:
     """Constants related to the configuration of settlement template strategies"""
@@ -15,43 +15,61 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
-from typing import Union, List  # noqa
+from functools import lru_cache
+from typing import FrozenSet, Union, List  # noqa
 from gsy_e.events.event_structures import MarketEvent, AreaEvent
 
+AREA_EVENT_HANDLER_NAMES = {
+    AreaEvent.TICK: "event_tick",
+    AreaEvent.MARKET_CYCLE: "event_market_cycle",
+    AreaEvent.BALANCING_MARKET_CYCLE: "event_balancing_market_cycle",
+    AreaEvent.ACTIVATE: "event_activate",
+}
+
+MARKET_EVENT_HANDLER_NAMES = {
+    MarketEvent.OFFER: "event_offer",
+    MarketEvent.OFFER_SPLIT: "event_offer_split",
+    MarketEvent.OFFER_DELETED: "event_offer_deleted",
+    MarketEvent.OFFER_TRADED: "event_offer_traded",
+    MarketEvent.BID_TRADED: "event_bid_traded",
+    MarketEvent.BID_DELETED: "event_bid_deleted",
+    MarketEvent.BID_SPLIT: "event_bid_split",
+    MarketEvent.BALANCING_OFFER: "event_balancing_offer",
+    MarketEvent.BALANCING_OFFER_SPLIT: "event_balancing_offer_split",
+    MarketEvent.BALANCING_OFFER_DELETED: "event_balancing_offer_deleted",
+    MarketEvent.BALANCING_TRADE: "event_balancing_trade",
+    MarketEvent.OFFERS_BULK: "event_offers_bulk",
+}
+
+# Market events that aggregate several events of another type, they are delivered to the
+# listeners that subscribed to the aggregated event type
+AGGREGATED_MARKET_EVENTS = {MarketEvent.OFFERS_BULK: MarketEvent.OFFER}
+
+EVENT_HANDLER_NAMES = {**AREA_EVENT_HANDLER_NAMES, **MARKET_EVENT_HANDLER_NAMES}
+
+
+@lru_cache(maxsize=None)
+def get_overridden_market_event_handlers(listener_class: type) -> FrozenSet[MarketEvent]:
+    """Return the market events whose handler methods are overridden by the listener class."""
+    return frozenset(
+        event for event, handler_name in MARKET_EVENT_HANDLER_NAMES.items()
+        if getattr(listener_class, handler_name, None) is not getattr(EventMixin, handler_name))
+
 
 class EventMixin:
 
     def _event_mapping(self, event):
-        if event == AreaEvent.TICK:
-            return self.event_tick
-        elif event == AreaEvent.MARKET_CYCLE:
-            return self.event_market_cycle
-        elif event == AreaEvent.BALANCING_MARKET_CYCLE:
-            return self.event_balancing_market_cycle
-        elif event == AreaEvent.ACTIVATE:
-            return self.event_activate
-        elif event == MarketEvent.OFFER:
-            return self.event_offer
-        elif event == MarketEvent.OFFER_SPLIT:
-            return self.event_offer_split
-        elif event == MarketEvent.OFFER_DELETED:
-            return self.event_offer_deleted
-        elif event == MarketEvent.OFFER_TRADED:
-            return self.event_offer_traded
-        elif event == MarketEvent.BID_TRADED:
-            return self.event_bid_traded
-        elif event == MarketEvent.BID_DELETED:
-            return self.event_bid_deleted
-        elif event == MarketEvent.BID_SPLIT:
-            return self.event_bid_split
-        elif event == MarketEvent.BALANCING_OFFER:
-            return self.event_balancing_offer
-        elif event == MarketEvent.BALANCING_OFFER_SPLIT:
-            return self.event_balancing_offer_split
-        elif event == MarketEvent.BALANCING_OFFER_DELETED:
-            return self.event_balancing_offer_deleted
-        elif event == MarketEvent.BALANCING_TRADE:
-            return self.event_balancing_trade
+        handler_name = EVENT_HANDLER_NAMES.get(event)
+        return getattr(self, handler_name) if handler_name else None
+
+    def get_market_event_subscriptions(self) -> FrozenSet[MarketEvent]:
+        """
+        Return the market events that the listener reacts to, the dispatcher does not need to
+        deliver the other market events to the listener (see AreaDispatcher). By default these
+        are the events whose handler methods are overridden, since the handlers of the EventMixin
+        do not react to the events.
+        """
+        return get_overridden_market_event_handlers(type(self))
 
     def event_listener(self, event_type: Union[AreaEvent, MarketEvent], **kwargs):
         self.log.trace("Dispatching event %s", event_type.name)
@@ -102,3 +120,8 @@ class EventMixin:
 
     def event_balancing_trade(self, *, market_id, trade):
         pass
+
+    def event_offers_bulk(self, *, market_id, offers):
+        """Method triggered by the MarketEvent.OFFERS_BULK event, handles the offers one by one."""
+        for offer in offers:
+            self.event_offer(market_id=market_id, offer=offer)
@@ -36,6 +36,7 @@ class MarketEvent(Enum):
     BALANCING_OFFER_SPLIT = 9
     BALANCING_OFFER_DELETED = 10
     BALANCING_TRADE = 11
+    OFFERS_BULK = 12
 
 
 class AreaEvent(Enum):
@@ -0,0 +1,244 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from logging import getLogger
+from time import perf_counter
+from typing import Dict, Iterable, List, Optional
+
+from gsy_framework.constants_limits import ConstSettings, GlobalConfig
+from gsy_framework.enums import SpotMarketTypeEnum
+from pendulum import Duration, now, today
+
+from gsy_e.constants import TIME_ZONE
+from gsy_e.models.config import SimulationConfig
+
+log = getLogger(__name__)
+
+BENCHMARK_SETUP_MODULE_NAME = "benchmark.scaling_houses"
+BENCHMARK_NUMBER_OF_HOUSES = (10, 100, 1000, 5000)
+BENCHMARK_FUTURE_MARKET_DURATION_HOURS = 4
+IMPORT_TIME_MODULE_NAME = "gsy_e.gsy_e_core.cli"
+IMPORT_TIME_TOP_PACKAGES = 15
+
+
+@dataclass(frozen=True)
+class BenchmarkScenario:
+    """Synthetic setup that is used in order to measure the performance of the simulation."""
+    number_of_houses: int
+    market_type: int = SpotMarketTypeEnum.ONE_SIDED.value
+    enable_settlement_markets: bool = False
+    future_market_duration_hours: int = 0
+
+    @property
+    def name(self) -> str:
+        """Unique name of the scenario, used for selecting it and reporting its results."""
+        market_type_str = (
+            "one_sided" if self.market_type == SpotMarketTypeEnum.ONE_SIDED.value
+            else "two_sided")
+        name = f"houses_{self.number_of_houses}_{market_type_str}"
+        if self.enable_settlement_markets:
+            name += "_settlement"
+        if self.future_market_duration_hours:
+            name += "_future"
+        return name
+
+    def apply_settings(self) -> None:
+        """Configure the global settings and the setup module according to the scenario."""
+        ConstSettings.MASettings.MARKET_TYPE = self.market_type
+        ConstSettings.SettlementMarketSettings.ENABLE_SETTLEMENT_MARKETS = (
+            self.enable_settlement_markets)
+        GlobalConfig.FUTURE_MARKET_DURATION_HOURS = self.future_market_duration_hours
+        # pylint: disable=import-outside-toplevel
+        from gsy_e.setup.benchmark import scaling_houses
+        scaling_houses.NUMBER_OF_HOUSES = self.number_of_houses
+
+
+def _create_benchmark_scenarios() -> List[BenchmarkScenario]:
+    scenarios = []
+    for number_of_houses in BENCHMARK_NUMBER_OF_HOUSES:
+        scenarios.extend([
+            BenchmarkScenario(number_of_houses, SpotMarketTypeEnum.ONE_SIDED.value),
+            BenchmarkScenario(number_of_houses, SpotMarketTypeEnum.TWO_SIDED.value),
+            BenchmarkScenario(
+                number_of_houses, SpotMarketTypeEnum.TWO_SIDED.value,
+                enable_settlement_markets=True,
+                future_market_duration_hours=BENCHMARK_FUTURE_MARKET_DURATION_HOURS),
+        ])
+    return scenarios
+
+
+BENCHMARK_SCENARIOS: Dict[str, BenchmarkScenario] = {
+    scenario.name: scenario for scenario in _create_benchmark_scenarios()}
+
+
+def _get_peak_rss_mb() -> float:
+    """Return the peak resident set size of the current process in MB."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    if platform.system() == "Darwin":
+        return max_rss / 1000000.0
+    return max_rss / 1000.0
+
+
+def _run_scenario(scenario: BenchmarkScenario, sim_duration: Duration, slot_length: Duration,
+                  tick_length: Duration, seed: int) -> Dict:
+    """Run the simulation of one scenario and return its performance figures.
+
+    Executed in a separate process, in order for the global settings and the peak memory of
+    each scenario to be isolated from the other scenarios. The simulation is only imported here,
+    since the command line interface imports the scenarios.
+    """
+    from gsy_e.gsy_e_core.simulation import Simulation  # pylint: disable=import-outside-toplevel
+
+    scenario.apply_settings()
+    simulation_config = SimulationConfig(
+        sim_duration, slot_length, tick_length,
+        cloud_coverage=ConstSettings.PVSettings.DEFAULT_POWER_PROFILE,
+        start_date=today(tz=TIME_ZONE), external_connection_enabled=False)
+
+    setup_start_time = perf_counter()
+    simulation = Simulation(BENCHMARK_SETUP_MODULE_NAME, simulation_config, seed=seed,
+                            no_export=True)
+    setup_time_s = perf_counter() - setup_start_time
+
+    simulation.phase_timer.enabled = True
+    run_start_time = perf_counter()
+    simulation.run()
+    run_time_s = perf_counter() - run_start_time
+
+    ticks = simulation.area.current_tick
+    slots = ticks / simulation_config.ticks_per_slot
+    return {
+        "name": scenario.name,
+        "number_of_houses": scenario.number_of_houses,
+        "market_type": scenario.market_type,
+        "enable_settlement_markets": scenario.enable_settlement_markets,
+        "future_market_duration_hours": scenario.future_market_duration_hours,
+        "setup_time_s": setup_time_s,
+        "run_time_s": run_time_s,
+        "ticks": ticks,
+        "slots": slots,
+        "ticks_per_second": ticks / run_time_s if run_time_s else 0.0,
+        "slots_per_second": slots / run_time_s if run_time_s else 0.0,
+        "peak_rss_mb": _get_peak_rss_mb(),
+        "phases": simulation.phase_timer.as_dict(),
+        "memory_policy": simulation.memory_policy.report(),
+    }
+
+
+def parse_import_time_output(output: str, module_name: str) -> Dict:
+    """Summarize the output of "python -X importtime" (total and per top-level package)."""
+    total_us = 0
+    package_self_us = defaultdict(int)
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, imported_name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            # header line
+            continue
+        imported_name = imported_name.strip()
+        package_self_us[imported_name.split(".")[0]] += int(self_us)
+        if imported_name == module_name:
+            total_us = int(cumulative_us)
+    slowest_packages = sorted(package_self_us.items(), key=lambda item: item[1], reverse=True)
+    return {
+        "module": module_name,
+        "total_s": total_us / 1e6,
+        "packages_s": {package: self_us / 1e6
+                       for package, self_us in slowest_packages[:IMPORT_TIME_TOP_PACKAGES]},
+    }
+
+
+def measure_import_time(module_name: str = IMPORT_TIME_MODULE_NAME) -> Dict:
+    """Measure the time needed to import the module in a new interpreter.
+
+    This is the startup overhead that every simulation run from the command line pays before
+    the setup is even loaded.
+    """
+    completed_process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        capture_output=True, text=True, check=True)
+    return parse_import_time_output(completed_process.stderr, module_name)
+
+
+def _get_gsy_e_version() -> Optional[str]:
+    try:
+        # pylint: disable=import-outside-toplevel
+        from importlib.metadata import PackageNotFoundError, version
+        return version("gsy-e")
+    except (ImportError, PackageNotFoundError):
+        return None
+
+
+def run_benchmark(scenario_names: Iterable[str], sim_duration: Duration, slot_length: Duration,
+                  tick_length: Duration, seed: int, output_path: str) -> Dict:
+    """Run the selected benchmark scenarios and write the results to a JSON file.
+
+    Args:
+        scenario_names: Names of the scenarios that should be executed (see BENCHMARK_SCENARIOS)
+        sim_duration: Simulated duration of each scenario
+        slot_length: Length of a market slot
+        tick_length: Length of a tick
+        seed: Random seed that is used for all scenarios, in order to make runs comparable
+        output_path: Path of the JSON file that the results are written to
+
+    Returns: Dict with the benchmark results
+    """
+    results = {
+        "created_at": now(tz=TIME_ZONE).to_iso8601_string(),
+        "gsy_e_version": _get_gsy_e_version(),
+        "python_version": sys.version.split()[0],
+        "python_implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "settings": {
+            "sim_duration_s": sim_duration.total_seconds(),
+            "slot_length_s": slot_length.total_seconds(),
+            "tick_length_s": tick_length.total_seconds(),
+            "seed": seed,
+        },
+        "import_time": measure_import_time(),
+        "scenarios": [],
+    }
+    log.info("Import of %s took %.3f s.", IMPORT_TIME_MODULE_NAME,
+             results["import_time"]["total_s"])
+    for scenario_name in scenario_names:
+        scenario = BENCHMARK_SCENARIOS[scenario_name]
+        log.info("Running benchmark scenario %s.", scenario_name)
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            scenario_results = executor.submit(
+                _run_scenario, scenario, sim_duration, slot_length, tick_length, seed).result()
+        log.info("Benchmark scenario %s: %.2f ticks/s, %.4f slots/s, peak RSS %.1f MB.",
+                 scenario_name, scenario_results["ticks_per_second"],
+                 scenario_results["slots_per_second"], scenario_results["peak_rss_mb"])
+        results["scenarios"].append(scenario_results)
+
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(output_dir, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as output_file:
+        json.dump(results, output_file, indent=2)
+    log.info("Benchmark results were written to %s.", output_path)
+    return results
@@ -17,6 +17,7 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 import logging
 import multiprocessing
+import os
 import platform
 from multiprocessing import Process
 
@@ -30,7 +31,9 @@ from gsy_framework.settings_validators import validate_global_settings
 from pendulum import DateTime, today
 
 import gsy_e.constants
-from gsy_e.gsy_e_core.simulation import run_simulation
+from gsy_e.gsy_e_core.benchmark import BENCHMARK_SCENARIOS
+from gsy_e.gsy_e_core.memory_policy import MemoryPolicy, MemoryPolicyMode
+from gsy_e.gsy_e_core.sweep import SWEEP_PARAMETERS
 from gsy_e.gsy_e_core.util import (
     DateType, IntervalType, available_simulation_scenarios, convert_str_to_pause_after_interval,
     read_settings_from_file, update_advanced_settings)
@@ -107,10 +110,42 @@ _setup_modules = available_simulation_scenarios
               help=(
                 "Enable or disable Degrees of Freedom "
                 "(orders can't contain attributes/requirements)."))
+@click.option("--enable-phase-profiling", is_flag=True, default=False,
+              help="Record per-slot histograms of the duration of each phase of the simulation "
+                   "loop and export them alongside the CSV files.")
+@click.option("--fast-forward", is_flag=True, default=False,
+              help="Skip the ticks in which no strategy or market agent needs to act. "
+                   "Results are not identical to a run that simulates every tick.")
+@click.option("--memory-policy", "memory_policy_mode",
+              type=Choice([mode.value for mode in MemoryPolicyMode]),
+              default=gsy_e.constants.MEMORY_POLICY_MODE, show_default=True,
+              help="Controls when the garbage collector is forced to run during the simulation.")
+@click.option("--gc-every-n-slots", type=int,
+              default=gsy_e.constants.MEMORY_POLICY_COLLECT_EVERY_N_SLOTS, show_default=True,
+              help="Number of slots between garbage collections (every_n_slots memory policy).")
+@click.option("--gc-rss-threshold-mb", type=float,
+              default=gsy_e.constants.MEMORY_POLICY_RSS_THRESHOLD_MB,
+              help="Memory usage in MB that triggers a garbage collection "
+                   "(rss_threshold memory policy).")
+@click.option("--matching-worker-threads", type=int,
+              default=gsy_e.constants.MATCHING_WORKER_THREADS, show_default=True,
+              help="Number of threads that calculate the recommendations of the internal matcher "
+                   "for different markets concurrently (0 disables the threads).")
+@click.option("--snapshot-at-slot", "snapshot_slot", type=int, default=None,
+              help="Save a snapshot of the simulation at the beginning of this slot, in order to "
+                   "start branches from it (see the branch command).")
+@click.option("--snapshot-path", type=str, default="gsy_e_snapshot.pickle", show_default=True,
+              help="Path of the snapshot file")
 def run(setup_module_name, settings_file, duration, slot_length, tick_length,
         cloud_coverage, compare_alt_pricing, enable_external_connection, start_date,
-        pause_at, incremental, slot_length_realtime, enable_dof: bool, **kwargs):
+        pause_at, incremental, slot_length_realtime, enable_dof: bool, memory_policy_mode,
+        gc_every_n_slots, gc_rss_threshold_mb, matching_worker_threads, **kwargs):
     """Configure settings and run a simulation."""
+    # The simulation is only imported by the commands that need it, in order to keep the
+    # startup of the command line interface fast.
+    # pylint: disable=import-outside-toplevel
+    from gsy_e.gsy_e_core.simulation import run_simulation
+
     # Force the multiprocessing start method to be 'fork' on macOS.
     if platform.system() == "Darwin":
         multiprocessing.set_start_method("fork")
@@ -138,6 +173,14 @@ def run(setup_module_name, settings_file, duration, slot_length, tick_length,
         if incremental:
             kwargs["incremental"] = incremental
 
+        try:
+            kwargs["memory_policy"] = MemoryPolicy(
+                memory_policy_mode, gc_every_n_slots, gc_rss_threshold_mb)
+        except ValueError as ex:
+            raise click.BadParameter(str(ex)) from ex
+
+        gsy_e.constants.MATCHING_WORKER_THREADS = matching_worker_threads
+
         if compare_alt_pricing is True:
             ConstSettings.MASettings.AlternativePricing.COMPARE_PRICING_SCHEMES = True
             # we need the seconds in the export dir name
@@ -165,3 +208,157 @@ def run(setup_module_name, settings_file, duration, slot_length, tick_length,
     except GSyException as ex:
         log.exception(ex)
         raise click.ClickException(ex.args[0])
+
+
+@main.command()
+@click.option("-d", "--duration", type=IntervalType("D:H"), default="4h", show_default=True,
+              help="Simulated duration of each benchmark scenario")
+@click.option("-t", "--tick-length", type=IntervalType("M:S"), default="15s", show_default=True,
+              help="Length of a tick")
+@click.option("-s", "--slot-length", type=IntervalType("M:S"), default="15m", show_default=True,
+              help="Length of a market slot")
+@click.option("--scenario", "scenario_names", type=Choice(list(BENCHMARK_SCENARIOS.keys())),
+              multiple=True, default=None,
+              help="Benchmark scenario to run, can be repeated [default: all scenarios]")
+@click.option("--seed", type=int, default=0, show_default=True,
+              help="Random seed that is used for all scenarios")
+@click.option("-o", "--output", "output_path", type=str, default="gsy_e_benchmark.json",
+              show_default=True, help="Path of the JSON file that the results are written to")
+@click.option("--import-time-only", is_flag=True, default=False,
+              help="Only measure the import time of the command line interface")
+def benchmark(duration, tick_length, slot_length, scenario_names, seed, output_path,
+              import_time_only):
+    """Run synthetic scaling scenarios and report the performance of the simulation."""
+    from gsy_e.gsy_e_core.benchmark import run_benchmark  # pylint: disable=import-outside-toplevel
+
+    # Force the multiprocessing start method to be 'fork' on macOS.
+    if platform.system() == "Darwin":
+        multiprocessing.set_start_method("fork")
+
+    try:
+        if import_time_only:
+            scenario_names = []
+        elif not scenario_names:
+            scenario_names = list(BENCHMARK_SCENARIOS.keys())
+        run_benchmark(scenario_names, duration, slot_length, tick_length, seed, output_path)
+    except GSyException as ex:
+        log.exception(ex)
+        raise click.ClickException(ex.args[0])
+
+
+def _parse_sweep_parameters(parameters):
+    """Convert the "name=value1,value2" strings of the sweep command to a parameter grid."""
+    parameter_grid = {}
+    for parameter in parameters:
+        name, separator, values = parameter.partition("=")
+        if not separator or not values:
+            raise click.BadParameter(
+                f"Sweep parameter '{parameter}' does not have the format name=value1,value2.")
+        try:
+            parameter_grid[name.strip()] = [
+                int(value) if value.strip().lstrip("-").isdigit() else float(value)
+                for value in values.split(",")]
+        except ValueError as ex:
+            raise click.BadParameter(
+                f"Sweep parameter '{parameter}' contains non numerical values.") from ex
+    return parameter_grid
+
+
+@main.command()
+@click.option("-d", "--duration", type=IntervalType("D:H"), default="1d", show_default=True,
+              help="Duration of simulation")
+@click.option("-t", "--tick-length", type=IntervalType("M:S"), default="1s", show_default=True,
+              help="Length of a tick")
+@click.option("-s", "--slot-length", type=IntervalType("M:S"), default="15m", show_default=True,
+              help="Length of a market slot")
+@click.option("-c", "--cloud-coverage", type=int,
+              default=ConstSettings.PVSettings.DEFAULT_POWER_PROFILE, show_default=True,
+              help="Cloud coverage, 0 for sunny, 1 for partial coverage, 2 for clouds.")
+@click.option("--setup", "setup_module_name", default="default_2a",
+              help=("Simulation setup module use. "
+                    f"Available modules: [{', '.join(_setup_modules)}]"))
+@click.option("-g", "--settings-file", default=None,
+              help="Settings file path")
+@click.option("--start-date", type=DateType(gsy_e.constants.DATE_FORMAT),
+              default=today(tz=gsy_e.constants.TIME_ZONE).format(gsy_e.constants.DATE_FORMAT),
+              show_default=True,
+              help=f"Start date of the Simulation ({gsy_e.constants.DATE_FORMAT})")
+@click.option("--enable-dof/--disable-dof",
+              is_flag=True, default=True,
+              help=(
+                "Enable or disable Degrees of Freedom "
+                "(orders can't contain attributes/requirements)."))
+@click.option("-p", "--parameter", "parameters", multiple=True, required=True,
+              help="Swept parameter and its values (e.g. -p seed=0,1,2), can be repeated. "
+                   f"Available parameters: [{', '.join(SWEEP_PARAMETERS)}]")
+@click.option("-j", "--max-workers", type=int, default=None,
+              help="Number of simulations that run in parallel [default: number of CPUs]")
+@click.option("--export-path",  type=str, default=None, show_default=False,
+              help="Directory of the results of all runs and of the sweep summary "
+                   "(default: ~/gsy_e-simulation/sweep_<date>)")
+def sweep(duration, tick_length, slot_length, cloud_coverage, setup_module_name,
+          settings_file, start_date, enable_dof, parameters, max_workers, export_path):
+    """Run a setup for every combination of the swept parameters and summarize the KPIs."""
+    from gsy_e.gsy_e_core.sweep import run_sweep  # pylint: disable=import-outside-toplevel
+
+    # Force the multiprocessing start method to be 'fork' on macOS.
+    if platform.system() == "Darwin":
+        multiprocessing.set_start_method("fork")
+
+    parameter_grid = _parse_sweep_parameters(parameters)
+    if export_path is None:
+        export_path = os.path.join(
+            os.path.expanduser("~"), "gsy_e-simulation",
+            "sweep_" + DateTime.now(tz=gsy_e.constants.TIME_ZONE).format(
+                f"{gsy_e.constants.DATE_TIME_FORMAT}:ss"))
+
+    try:
+        advanced_settings = None
+        if settings_file is not None:
+            simulation_settings, advanced_settings = read_settings_from_file(settings_file)
+            update_advanced_settings(advanced_settings)
+            validate_global_settings(simulation_settings)
+        else:
+            simulation_settings = {"sim_duration": duration,
+                                   "slot_length": slot_length,
+                                   "tick_length": tick_length,
+                                   "cloud_coverage": cloud_coverage,
+                                   "enable_degrees_of_freedom": enable_dof}
+            validate_global_settings(simulation_settings)
+            simulation_settings["start_date"] = start_date
+
+        run_sweep(setup_module_name, simulation_settings, parameter_grid, export_path,
+                  max_workers=max_workers, advanced_settings=advanced_settings)
+    except GSyException as ex:
+        log.exception(ex)
+        raise click.ClickException(ex.args[0])
+
+
+@main.command()
+@click.argument("snapshot_path", type=click.Path(exists=True, dir_okay=False))
+@click.option("-e", "--live-events", "live_events_paths", multiple=True,
+              type=click.Path(exists=True, dir_okay=False),
+              help="JSON file with the live events of a branch, can be repeated (one branch per "
+                   "file) [default: one branch without live events]")
+@click.option("-j", "--max-workers", type=int, default=None,
+              help="Number of branches that run in parallel [default: number of CPUs]")
+@click.option("--export-path",  type=str, default=None, show_default=False,
+              help="Directory of the results of all branches (default: ~/gsy_e-simulation)")
+@click.option("--fast-forward", is_flag=True, default=False,
+              help="Skip the ticks in which no strategy or market agent needs to act.")
+def branch(snapshot_path, live_events_paths, max_workers, export_path, fast_forward):
+    """Continue a simulation snapshot in parallel branches with different live events."""
+    # pylint: disable=import-outside-toplevel
+    from gsy_e.gsy_e_core.simulation_branches import run_simulation_branches
+
+    # Force the multiprocessing start method to be 'fork' on macOS.
+    if platform.system() == "Darwin":
+        multiprocessing.set_start_method("fork")
+
+    try:
+        run_simulation_branches(snapshot_path, list(live_events_paths) or [None],
+                                export_path=export_path, max_workers=max_workers,
+                                fast_forward=fast_forward)
+    except GSyException as ex:
+        log.exception(ex)
+        raise click.ClickException(ex.args[0])
@@ -27,7 +27,6 @@ from copy import deepcopy
 from functools import reduce  # forward compatibility for Python 3
 from typing import Dict, Tuple, List, Mapping, TYPE_CHECKING
 
-import plotly.graph_objs as go
 from gsy_framework.constants_limits import ConstSettings, GlobalConfig, DATE_TIME_FORMAT
 from gsy_framework.data_classes import (
     Trade, BalancingTrade, Bid, Offer, BalancingOffer, MarketClearingState, Clearing)
@@ -40,7 +39,8 @@ from sortedcontainers import SortedDict
 import gsy_e.constants
 from gsy_e.gsy_e_core.myco_singleton import bid_offer_matcher
 from gsy_e.gsy_e_core.sim_results.plotly_graph import PlotlyGraph
-from gsy_e.gsy_e_core.util import constsettings_to_dict, round_floats_for_ui
+from gsy_e.gsy_e_core.util import (
+    LazyModuleImport, constsettings_to_dict, round_floats_for_ui)
 from gsy_e.data_classes import PlotDescription
 from gsy_e.models.area import Area
 from gsy_e.models.market.market_structures import (AvailableMarketTypes,
@@ -55,6 +55,8 @@ if TYPE_CHECKING:
 
 _log = logging.getLogger(__name__)
 
+go = LazyModuleImport("plotly.graph_objs")
+
 
 ENERGY_BUYER_SIGN_PLOTS = 1
 ENERGY_SELLER_SIGN_PLOTS = -1 * ENERGY_BUYER_SIGN_PLOTS
@@ -672,7 +674,7 @@ class PlotSupplyDemandCurve:
 
     @classmethod
     def _render_supply_demand_curve(cls, dataset: Dict, time: DateTime,
-                                    supply: bool) -> go.Scatter:
+                                    supply: bool) -> "go.Scatter":
         rate, energy = cls._calc_supply_demand_curve(dataset, supply=supply)
         name = str(time) + "-" + ("supply" if supply else "demand")
         data_obj = go.Scatter(x=energy,
@@ -834,7 +836,7 @@ class PlotOrderInfo:
                 info_dict.update({"tool_tip": tool_tip})
 
     @staticmethod
-    def _plot_tooltip_for_tick(info_dicts: Dict, fig: go.Figure, tick_time: DateTime):
+    def _plot_tooltip_for_tick(info_dicts: Dict, fig: "go.Figure", tick_time: DateTime):
         for info_dict in info_dicts:
             size = 5 if info_dict["tag"] in ["offer", "bid"] else 10
             all_info_dicts = list([
@@ -0,0 +1,74 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from typing import Dict, Hashable, List, Sequence, Tuple, TypeVar
+
+from numpy import random
+
+T = TypeVar("T")
+
+
+class FairnessOrdering:
+    """
+    Provide the random order in which the children of an area or the listeners of a market
+    receive their events, in order to ensure that no participant is always served first.
+
+    If enabled, one permutation is drawn per owner (area or market) and tick, and is reused for
+    all events of the tick, instead of drawing one random number per participant and event. The
+    permutations are drawn from the numpy random number generator, so that the order stays
+    reproducible for a given seed.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._permutations: Dict[Tuple[Hashable, int], Tuple[List[int], List[int]]] = {}
+
+    def activate(self, enabled: bool) -> None:
+        """Enable or disable the per-tick permutations and discard the drawn ones."""
+        self.enabled = enabled
+        self._permutations = {}
+
+    def start_tick(self) -> None:
+        """Discard the permutations of the previous tick, new ones are drawn on demand."""
+        if self._permutations:
+            self._permutations = {}
+
+    def _get_permutation(self, owner_id: Hashable, size: int) -> Tuple[List[int], List[int]]:
+        """Return the permutation of the owner for the current tick and the rank of each item."""
+        key = (owner_id, size)
+        if key not in self._permutations:
+            permutation = random.permutation(size)
+            ranks = permutation.argsort()
+            self._permutations[key] = (permutation.tolist(), ranks.tolist())
+        return self._permutations[key]
+
+    def shuffle(self, owner_id: Hashable, items: Sequence[T]) -> List[T]:
+        """Return the items of the owner in random order."""
+        if not self.enabled:
+            return sorted(items, key=lambda _: random.random())
+        permutation, _ = self._get_permutation(owner_id, len(items))
+        return [items[index] for index in permutation]
+
+    def get_fairness_keys(self, owner_id: Hashable, size: int) -> Sequence[float]:
+        """
+        Return one sort key per item of the owner, so that a subset of the items can be visited
+        in the same order as by shuffle.
+        """
+        if not self.enabled:
+            return random.random(size)
+        _, ranks = self._get_permutation(owner_id, size)
+        return ranks
@@ -15,8 +15,10 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
+from gsy_e.gsy_e_core.fairness_ordering import FairnessOrdering
 from gsy_e.gsy_e_core.user_profile_handler import ProfilesHandler
 from gsy_e.gsy_e_core.global_stats import ExternalConnectionGlobalStatistics
+from gsy_e.gsy_e_core.tick_scheduler import TickScheduler
 from gsy_e.gsy_e_core.util import FutureMarketCounter
 
 
@@ -24,6 +26,8 @@ class GlobalObjects:
     profiles_handler = ProfilesHandler()
     external_global_stats = ExternalConnectionGlobalStatistics()
     future_market_counter = FutureMarketCounter()
+    tick_scheduler = TickScheduler()
+    fairness_ordering = FairnessOrdering()
 
 
 global_objects = GlobalObjects()
@@ -142,8 +142,14 @@ class LiveEvents:
         return False
 
     def handle_all_events(self, root_area):
+        """Apply all buffered events, return True if areas were added to or removed from
+        the area tree."""
+        area_tree_changed = False
         with self.lock:
             for event in self.event_buffer:
                 if self._handle_event(root_area, event) is False:
                     logging.warning(f"Event {event} not applied.")
+                elif isinstance(event, (CreateAreaEvent, DeleteAreaEvent)):
+                    area_tree_changed = True
             self.event_buffer.clear()
+        return area_tree_changed
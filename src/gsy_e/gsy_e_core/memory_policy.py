@@ -0,0 +1,124 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import gc
+import os
+from enum import Enum
+from logging import getLogger
+from time import perf_counter
+from typing import Dict, Optional
+
+import psutil
+
+import gsy_e.constants
+
+log = getLogger(__name__)
+
+# After a collection that was triggered by the RSS threshold, the next collection is only
+# triggered if the RSS has grown by this factor, in order to not collect on every slot when the
+# memory of the process is not released back to the OS.
+RSS_THRESHOLD_GROWTH_FACTOR = 1.1
+
+
+class MemoryPolicyMode(Enum):
+    """Available strategies for managing the memory of the simulation process."""
+    NONE = "none"
+    EVERY_N_SLOTS = "every_n_slots"
+    RSS_THRESHOLD = "rss_threshold"
+    FREEZE_AFTER_SETUP = "freeze_after_setup"
+
+
+class MemoryPolicy:
+    """Decide when the garbage collector is forced to run during the simulation.
+
+    - NONE: Rely on the automatic generational garbage collection of Python.
+    - EVERY_N_SLOTS: Force a full collection every collect_every_n_slots market slots.
+    - RSS_THRESHOLD: Force a full collection whenever the resident set size of the process
+      exceeds rss_threshold_mb.
+    - FREEZE_AFTER_SETUP: Move all objects that were created during the setup to the permanent
+      generation (gc.freeze), so that the automatic collections do not need to traverse them.
+    """
+
+    def __init__(self, mode: Optional[str] = None,
+                 collect_every_n_slots: Optional[int] = None,
+                 rss_threshold_mb: Optional[float] = None):
+        self.mode = MemoryPolicyMode(
+            mode if mode is not None else gsy_e.constants.MEMORY_POLICY_MODE)
+        self.collect_every_n_slots = (
+            collect_every_n_slots if collect_every_n_slots is not None
+            else gsy_e.constants.MEMORY_POLICY_COLLECT_EVERY_N_SLOTS)
+        self.rss_threshold_mb = (
+            rss_threshold_mb if rss_threshold_mb is not None
+            else gsy_e.constants.MEMORY_POLICY_RSS_THRESHOLD_MB)
+        if self.collect_every_n_slots < 1:
+            raise ValueError("collect_every_n_slots should be a positive integer.")
+        if self.mode == MemoryPolicyMode.RSS_THRESHOLD and not self.rss_threshold_mb:
+            raise ValueError("rss_threshold_mb is required by the rss_threshold memory policy.")
+
+        self._process = None
+        self._next_rss_threshold_mb = self.rss_threshold_mb
+        self.collections = 0
+        self.collected_objects = 0
+        self.collection_time_s = 0.0
+        self.frozen_objects = 0
+        self.max_sampled_rss_mb = 0.0
+
+    def _get_rss_mb(self) -> float:
+        if self._process is None:
+            self._process = psutil.Process(os.getpid())
+        rss_mb = self._process.memory_info().rss / 1000000.0
+        self.max_sampled_rss_mb = max(self.max_sampled_rss_mb, rss_mb)
+        return rss_mb
+
+    def _collect(self) -> None:
+        start_time = perf_counter()
+        self.collected_objects += gc.collect()
+        self.collection_time_s += perf_counter() - start_time
+        self.collections += 1
+
+    def event_setup_finished(self) -> None:
+        """Apply the policy after the area tree of the simulation has been created."""
+        if self.mode != MemoryPolicyMode.FREEZE_AFTER_SETUP:
+            return
+        # Collect before freezing, in order to not move garbage to the permanent generation.
+        self._collect()
+        gc.freeze()
+        self.frozen_objects = gc.get_freeze_count()
+        log.debug("Moved %s objects to the permanent generation of the garbage collector.",
+                  self.frozen_objects)
+
+    def event_market_cycle(self, slot_number: int) -> None:
+        """Apply the policy at the start of a market slot."""
+        if self.mode == MemoryPolicyMode.EVERY_N_SLOTS:
+            if slot_number % self.collect_every_n_slots == 0:
+                self._collect()
+        elif self.mode == MemoryPolicyMode.RSS_THRESHOLD:
+            if self._get_rss_mb() >= self._next_rss_threshold_mb:
+                self._collect()
+                self._next_rss_threshold_mb = max(
+                    self.rss_threshold_mb, self._get_rss_mb() * RSS_THRESHOLD_GROWTH_FACTOR)
+
+    def report(self) -> Dict:
+        """Return what the policy did during the simulation."""
+        return {
+            "mode": self.mode.value,
+            "collections": self.collections,
+            "collected_objects": self.collected_objects,
+            "collection_time_s": self.collection_time_s,
+            "frozen_objects": self.frozen_objects,
+            "max_sampled_rss_mb": self.max_sampled_rss_mb,
+        }
@@ -0,0 +1,132 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import csv
+import os
+from bisect import bisect_left
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Dict, Iterator, List, Optional
+
+# Upper edges (in seconds) of the histogram bins of the phase profiler, the last bin collects
+# all durations that exceed the last edge.
+PHASE_HISTOGRAM_BIN_EDGES_S = (1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0)
+PHASE_HISTOGRAM_BIN_LABELS = (
+    "0-10us", "10-100us", "100us-1ms", "1-10ms", "10-100ms", "100ms-1s", ">1s")
+PHASE_PROFILE_FILE_NAME = "phase_profile.csv"
+
+
+class PhaseTimer:
+    """Accumulate the wall time that is spent in each phase of the simulation loop.
+
+    Measurements are only performed if the timer is enabled, in order to keep the overhead of
+    the simulation loop unaffected for regular runs.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.total_time_s: Dict[str, float] = {}
+        self.call_count: Dict[str, int] = {}
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """Measure the wall time of the code block that is executed inside the context."""
+        if not self.enabled:
+            yield
+            return
+        start_time = perf_counter()
+        try:
+            yield
+        finally:
+            self._record(phase, perf_counter() - start_time)
+
+    def _record(self, phase: str, elapsed_time_s: float) -> None:
+        self.total_time_s[phase] = self.total_time_s.get(phase, 0.0) + elapsed_time_s
+        self.call_count[phase] = self.call_count.get(phase, 0) + 1
+
+    def start_slot(self, time_slot_str: str) -> None:
+        """Notify the timer that a new market slot has started."""
+
+    def reset(self) -> None:
+        """Discard all measurements."""
+        self.total_time_s = {}
+        self.call_count = {}
+
+    def as_dict(self) -> Dict[str, Dict]:
+        """Return the accumulated measurements for each phase in a serializable format."""
+        return {
+            phase: {"total_time_s": total_time_s,
+                    "calls": self.call_count[phase],
+                    "mean_time_s": total_time_s / self.call_count[phase]}
+            for phase, total_time_s in self.total_time_s.items()
+        }
+
+
+class PhaseProfiler(PhaseTimer):
+    """Extend the PhaseTimer by recording a histogram of the phase durations for each slot.
+
+    Each measurement (usually once per tick) is sorted into one of the bins of
+    PHASE_HISTOGRAM_BIN_EDGES_S, which allows to identify the phases that dominate the
+    duration of a slot and how their duration evolves throughout the simulation.
+    """
+
+    def __init__(self, enabled: bool = True):
+        super().__init__(enabled)
+        self._current_slot: Optional[str] = None
+        # {time_slot_str: {phase: {"calls", "total_time_s", "max_time_s", "histogram"}}}
+        self.slot_profiles: Dict[str, Dict[str, Dict]] = {}
+
+    def start_slot(self, time_slot_str: str) -> None:
+        self._current_slot = time_slot_str
+        self.slot_profiles.setdefault(time_slot_str, {})
+
+    def _record(self, phase: str, elapsed_time_s: float) -> None:
+        super()._record(phase, elapsed_time_s)
+        if self._current_slot is None:
+            return
+        phase_profile = self.slot_profiles[self._current_slot].get(phase)
+        if phase_profile is None:
+            phase_profile = {"calls": 0, "total_time_s": 0.0, "max_time_s": 0.0,
+                             "histogram": [0] * len(PHASE_HISTOGRAM_BIN_LABELS)}
+            self.slot_profiles[self._current_slot][phase] = phase_profile
+        phase_profile["calls"] += 1
+        phase_profile["total_time_s"] += elapsed_time_s
+        phase_profile["max_time_s"] = max(phase_profile["max_time_s"], elapsed_time_s)
+        phase_profile["histogram"][bisect_left(PHASE_HISTOGRAM_BIN_EDGES_S, elapsed_time_s)] += 1
+
+    def reset(self) -> None:
+        super().reset()
+        self._current_slot = None
+        self.slot_profiles = {}
+
+    def _csv_rows(self) -> List[List]:
+        rows = []
+        for time_slot_str, phase_profiles in self.slot_profiles.items():
+            for phase, phase_profile in phase_profiles.items():
+                rows.append([time_slot_str, phase, phase_profile["calls"],
+                             phase_profile["total_time_s"], phase_profile["max_time_s"],
+                             *phase_profile["histogram"]])
+        return rows
+
+    def export_to_csv(self, directory: str) -> None:
+        """Write the per-slot histograms of all phases to a CSV file in the given directory."""
+        file_path = os.path.join(directory, PHASE_PROFILE_FILE_NAME)
+        with open(file_path, "w", encoding="utf-8") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(["slot", "phase", "calls", "total_time_s", "max_time_s",
+                             *PHASE_HISTOGRAM_BIN_LABELS])
+            writer.writerows(self._csv_rows())
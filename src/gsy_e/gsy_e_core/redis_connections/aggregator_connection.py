@@ -2,18 +2,21 @@ import json
 import logging
 from copy import deepcopy
 from threading import Lock
+from typing import TYPE_CHECKING
 
 import gsy_e.constants
 from gsy_e.gsy_e_core.global_objects_singleton import global_objects
 from gsy_framework.utils import create_subdict_or_update
-from redis import StrictRedis
+
+if TYPE_CHECKING:
+    from redis import StrictRedis
 
 
 class AggregatorHandler:
     """
     Handles event sending, command responses to all connected aggregators
     """
-    def __init__(self, redis_db: StrictRedis):
+    def __init__(self, redis_db: "StrictRedis"):
         self.redis_db = redis_db
         self.pubsub = self.redis_db.pubsub()
         self.pending_batch_commands = {}
@@ -23,8 +23,6 @@ from typing import Dict
 from collections.abc import Callable
 
 from gsy_framework.constants_limits import ConstSettings
-from redis import StrictRedis
-from rq import Queue
 
 import gsy_e.constants
 from gsy_e.constants import REDIS_PUBLISH_RESPONSE_TIMEOUT
@@ -40,6 +38,10 @@ class RedisCommunicator:
     """Base class for redis communication using pubsub."""
 
     def __init__(self):
+        # redis is only imported when a communicator is created, in order to keep the startup
+        # of simulations that do not use redis fast.
+        # pylint: disable=import-outside-toplevel
+        from redis import StrictRedis
         self.redis_db = StrictRedis.from_url(REDIS_URL, retry_on_timeout=True)
         self.pubsub = self.redis_db.pubsub()
         self.pubsub_response = self.redis_db.pubsub()
@@ -141,6 +143,7 @@ class RQResettableCommunicator(ResettableCommunicator):
 
     def publish_json(self, channel: str, data: Dict) -> None:
         """Publish json serializable dict to redis queue."""
+        from rq import Queue  # pylint: disable=import-outside-toplevel
         queue = Queue(ConstSettings.GeneralSettings.SDK_COM_QUEUE_NAME, connection=self.redis_db)
         queue.enqueue(channel, json.dumps(data))
 
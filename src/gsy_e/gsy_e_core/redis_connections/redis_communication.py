@@ -26,10 +26,6 @@ from gsy_framework.constants_limits import HeartBeat, ConstSettings
 from gsy_framework.exceptions import GSyException
 from gsy_framework.results_validator import results_validator  # NOQA
 from gsy_framework.utils import RepeatingTimer
-from redis import StrictRedis
-from redis.exceptions import ConnectionError
-from rq import get_current_job
-from rq.exceptions import NoSuchJobError
 
 import gsy_e.constants
 
@@ -59,6 +55,11 @@ class RedisSimulationCommunication:
                 self._bulk_live_event_callback,
         }
 
+        # redis is only imported when the connection is created, in order to keep the startup
+        # of simulations that do not use redis fast.
+        # pylint: disable=import-outside-toplevel
+        from redis import StrictRedis
+        from redis.exceptions import ConnectionError  # pylint: disable=redefined-builtin
         try:
             self.redis_db = StrictRedis.from_url(REDIS_URL, retry_on_timeout=True)
             self.pubsub = self.redis_db.pubsub()
@@ -177,6 +178,9 @@ class RedisSimulationCommunication:
         )
 
     def _handle_redis_job_metadata(self):
+        # pylint: disable=import-outside-toplevel
+        from rq import get_current_job
+        from rq.exceptions import NoSuchJobError
         try:
             job = get_current_job()
             job.refresh()
@@ -201,6 +205,7 @@ class RedisSimulationCommunication:
 
 
 def publish_job_error_output(job_id, traceback):
+    from redis import StrictRedis  # pylint: disable=import-outside-toplevel
     StrictRedis.from_url(REDIS_URL).\
         publish(ConstSettings.GeneralSettings.EXCHANGE_ERROR_CHANNEL,
                 json.dumps({"job_id": job_id, "errors": traceback}))
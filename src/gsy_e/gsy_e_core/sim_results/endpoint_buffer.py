@@ -16,6 +16,7 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 import logging
+from base64 import b64encode
 from typing import Dict, TYPE_CHECKING, List
 
 from gsy_framework.constants_limits import (ConstSettings, DATE_TIME_UI_FORMAT, DATE_TIME_FORMAT,
@@ -25,7 +26,9 @@ from gsy_framework.sim_results.all_results import ResultsHandler
 from gsy_framework.utils import get_json_dict_memory_allocation_size
 from pendulum import DateTime
 
+import gsy_e.constants
 from gsy_e.gsy_e_core.sim_results.offer_bids_trades_hr_stats import OfferBidTradeGraphStats
+from gsy_e.gsy_e_core.sim_results.state_checkpoint import StateCheckpointWriter
 from gsy_e.gsy_e_core.util import (
     get_market_maker_rate_from_config, get_feed_in_tariff_rate_from_config)
 from gsy_e.models.strategy.commercial_producer import CommercialStrategy
@@ -73,6 +76,11 @@ class SimulationEndpointBuffer:
         self.last_energy_trades_high_resolution = {}
         self.results_handler = ResultsHandler(should_export_plots)
         self.simulation_state = {"general": {}, "areas": {}}
+        # The state of the areas is sent as binary (delta) checkpoints instead of JSON dicts
+        self._state_checkpoint_writer = (
+            StateCheckpointWriter()
+            if gsy_e.constants.SIMULATION_STATE_BINARY_CHECKPOINTS else None)
+        self.simulation_state_checkpoint = None
 
         if (ConstSettings.GeneralSettings.EXPORT_OFFER_BID_TRADE_HR or
                 ConstSettings.GeneralSettings.EXPORT_ENERGY_TRADE_PROFILE_HR):
@@ -87,6 +95,8 @@ class SimulationEndpointBuffer:
         if message_size > 64000:
             logging.error("Do not publish message bigger than 64 MB, "
                           "current message size %s MB.", (message_size / 1000.0))
+            if self._state_checkpoint_writer is not None:
+                self._state_checkpoint_writer.checkpoint_dropped()
             return {}
         logging.debug("Publishing %s KB of data via Redis.", message_size)
         return result_report
@@ -132,6 +142,9 @@ class SimulationEndpointBuffer:
             "bids_offers_trades": self.bids_offers_trades,
             "results_area_uuids": list(self.result_area_uuids),
             "simulation_state": self.simulation_state,
+            **({"simulation_state_checkpoint":
+                b64encode(self.simulation_state_checkpoint).decode("ascii")}
+               if self.simulation_state_checkpoint is not None else {}),
             "simulation_raw_data": self.flattened_area_core_stats_dict,
             "configuration_tree": self.area_result_dict
         }
@@ -295,7 +308,8 @@ class SimulationEndpointBuffer:
 
         self.flattened_area_core_stats_dict[area.uuid] = core_stats_dict
 
-        self.simulation_state["areas"][area.uuid] = area.get_state()
+        if self._state_checkpoint_writer is None:
+            self.simulation_state["areas"][area.uuid] = area.get_state()
 
         for child in area.children:
             self._populate_core_stats_and_sim_state(child)
@@ -321,6 +335,9 @@ class SimulationEndpointBuffer:
             self.current_market_time_slot = area.current_market.time_slot
         self.simulation_state["general"] = sim_state
         self._populate_core_stats_and_sim_state(area)
+        if self._state_checkpoint_writer is not None:
+            self.simulation_state_checkpoint = self._state_checkpoint_writer.create_checkpoint(
+                sim_state, area)
         self.simulation_progress = {
             "eta_seconds": progress_info.eta.seconds if progress_info.eta else None,
             "elapsed_time_seconds": progress_info.elapsed_time.seconds,
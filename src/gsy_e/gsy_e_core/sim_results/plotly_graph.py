@@ -18,20 +18,14 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import os
 
 import pendulum
-import plotly as py
-import plotly.graph_objs as go
 
 from gsy_framework.utils import limit_float_precision
 from gsy_e.constants import TIME_ZONE
 from gsy_e.data_classes import PlotDescription
-from gsy_e.models.strategy.commercial_producer import CommercialStrategy
-from gsy_e.models.strategy.finite_power_plant import FinitePowerPlant
-from gsy_e.models.strategy.infinite_bus import InfiniteBusStrategy
-from gsy_e.models.strategy.load_hours import LoadHoursStrategy
-from gsy_e.models.strategy.market_maker_strategy import MarketMakerStrategy
-from gsy_e.models.strategy.pv import PVStrategy
-from gsy_e.models.strategy.smart_meter import SmartMeterStrategy
-from gsy_e.models.strategy.storage import StorageStrategy
+from gsy_e.gsy_e_core.util import LazyModuleImport
+
+py = LazyModuleImport("plotly")
+go = LazyModuleImport("plotly.graph_objs")
 
 green = 'rgba(20,150,20, alpha)'
 purple = 'rgba(156, 110, 177, alpha)'
@@ -474,6 +468,17 @@ class PlotlyGraph:
 
     @classmethod
     def plot_device_profile(cls, device_dict, device_name, output_file, device_strategy):
+        # Device plots are optional, the strategies are only imported when they are requested.
+        # pylint: disable=import-outside-toplevel
+        from gsy_e.models.strategy.commercial_producer import CommercialStrategy
+        from gsy_e.models.strategy.finite_power_plant import FinitePowerPlant
+        from gsy_e.models.strategy.infinite_bus import InfiniteBusStrategy
+        from gsy_e.models.strategy.load_hours import LoadHoursStrategy
+        from gsy_e.models.strategy.market_maker_strategy import MarketMakerStrategy
+        from gsy_e.models.strategy.pv import PVStrategy
+        from gsy_e.models.strategy.smart_meter import SmartMeterStrategy
+        from gsy_e.models.strategy.storage import StorageStrategy
+
         trade_energy_var_name = "trade_energy_kWh"
         sold_trade_energy_var_name = "sold_trade_energy_kWh"
         bought_trade_energy_var_name = "bought_trade_energy_kWh"
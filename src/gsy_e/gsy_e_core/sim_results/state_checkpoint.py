@@ -0,0 +1,211 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import pickle
+from base64 import b64decode
+from copy import copy
+from logging import getLogger
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Tuple, Union
+from zlib import compress, decompress
+
+import numpy as np
+from gsy_framework.utils import convert_pendulum_to_str_in_dict
+from pendulum import DateTime, from_timestamp
+
+import gsy_e.constants
+from gsy_e.constants import TIME_ZONE
+from gsy_e.gsy_e_core.exceptions import SimulationException
+
+if TYPE_CHECKING:
+    from gsy_e.models.area import Area
+
+log = getLogger(__name__)
+
+CHECKPOINT_FORMAT_VERSION = 1
+# Separates the keys of nested state dicts in the flattened checkpoint state (e.g. area_stats)
+STATE_PATH_SEPARATOR = "/"
+
+_MISSING = object()
+
+
+def _is_time_series(value: Any) -> bool:
+    """Time series are the dicts of the state that use time slots as keys."""
+    return isinstance(value, dict) and (not value or isinstance(next(iter(value)), DateTime))
+
+
+def _flatten_state(state: Dict, prefix: str = "") -> Dict[str, Any]:
+    """Flatten the nested dicts of the state that are not time series."""
+    flattened_state = {}
+    for key, value in state.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict) and not _is_time_series(value):
+            flattened_state.update(_flatten_state(value, path + STATE_PATH_SEPARATOR))
+        else:
+            flattened_state[path] = value
+    return flattened_state
+
+
+def _encode_time_series(time_series: Dict[DateTime, Any]) -> Tuple[np.ndarray, Any]:
+    """Encode a time series to an array of epoch seconds and an array (or list) of values."""
+    time_slots = np.fromiter((time_slot.int_timestamp for time_slot in time_series),
+                             dtype=np.int64, count=len(time_series))
+    values = list(time_series.values())
+    if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+        values = np.array(values, dtype=np.float64)
+    return time_slots, values
+
+
+class StateCheckpointWriter:
+    """
+    Create compressed binary checkpoints of the state of all areas, that only contain the values
+    that changed since the previous checkpoint. Time slots are stored as epoch seconds instead
+    of strings, in order to keep the size and the serialization time of the checkpoints
+    independent of the simulated time.
+
+    Every full_checkpoint_interval checkpoints a full checkpoint is created, so that the
+    simulation can be restored from the last full checkpoint and all delta checkpoints after it.
+    If a checkpoint could not be published, checkpoint_dropped has to be called, in order for the
+    next checkpoint to be a full one (the following deltas would miss the changes otherwise).
+    """
+
+    def __init__(self, full_checkpoint_interval: int = None):
+        self._full_checkpoint_interval = (
+            full_checkpoint_interval or gsy_e.constants.SIMULATION_STATE_FULL_CHECKPOINT_INTERVAL)
+        self._checkpoints_since_full: Optional[int] = None
+        # area uuid -> state path -> last checkpointed value (or time slot -> value)
+        self._last_values: Dict[str, Dict[str, Any]] = {}
+
+    def create_checkpoint(self, general_state: Dict, root_area: "Area") -> bytes:
+        """Return the checkpoint of the general simulation state and the state of all areas."""
+        is_full = (self._checkpoints_since_full is None or
+                   self._checkpoints_since_full >= self._full_checkpoint_interval)
+        if is_full:
+            self._checkpoints_since_full = 0
+            self._last_values = {}
+        else:
+            self._checkpoints_since_full += 1
+
+        areas = {}
+        self._add_area_delta(root_area, areas)
+        return compress(pickle.dumps({
+            "version": CHECKPOINT_FORMAT_VERSION,
+            "is_full": is_full,
+            "general": general_state,
+            "areas": areas,
+        }, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def checkpoint_dropped(self) -> None:
+        """Create a full checkpoint next, since the last checkpoint did not reach the consumer."""
+        self._checkpoints_since_full = None
+
+    def _add_area_delta(self, area: "Area", areas: Dict) -> None:
+        last_values = self._last_values.setdefault(area.uuid, {})
+        is_new_area = not last_values
+        series = {}
+        deleted_series = {}
+        scalars = {}
+        for path, value in _flatten_state(area.get_checkpoint_state()).items():
+            if _is_time_series(value):
+                last_time_series = last_values.setdefault(path, {})
+                changed_values = {
+                    time_slot: slot_value for time_slot, slot_value in value.items()
+                    if last_time_series.get(time_slot, _MISSING) != slot_value}
+                # Time slots that were deleted from the state are also deleted on merge
+                deleted_time_slots = last_time_series.keys() - value.keys()
+                if deleted_time_slots:
+                    deleted_series[path] = np.fromiter(
+                        (time_slot.int_timestamp for time_slot in deleted_time_slots),
+                        dtype=np.int64, count=len(deleted_time_slots))
+                    for time_slot in deleted_time_slots:
+                        del last_time_series[time_slot]
+                last_time_series.update(
+                    (time_slot, copy(slot_value)) for time_slot, slot_value in
+                    changed_values.items())
+                if changed_values or is_new_area:
+                    series[path] = _encode_time_series(changed_values)
+            elif last_values.get(path, _MISSING) != value or is_new_area:
+                last_values[path] = copy(value)
+                scalars[path] = value
+        if series or deleted_series or scalars:
+            areas[area.uuid] = {
+                "series": series, "deleted_series": deleted_series, "scalars": scalars}
+
+        for child in area.children:
+            self._add_area_delta(child, areas)
+
+
+def _load_checkpoint(checkpoint: Union[bytes, str]) -> Dict:
+    if isinstance(checkpoint, str):
+        # base64 encoded, as published with the simulation results
+        checkpoint = b64decode(checkpoint)
+    checkpoint = pickle.loads(decompress(checkpoint))
+    if checkpoint.get("version") != CHECKPOINT_FORMAT_VERSION:
+        raise SimulationException(
+            f"Simulation state checkpoint has format version {checkpoint.get('version')}, only "
+            f"version {CHECKPOINT_FORMAT_VERSION} is supported.")
+    return checkpoint
+
+
+def _set_state_value(state: Dict, path: str, value: Any) -> None:
+    *parent_keys, key = path.split(STATE_PATH_SEPARATOR)
+    for parent_key in parent_keys:
+        state = state.setdefault(parent_key, {})
+    state[key] = value
+
+
+def merge_state_checkpoints(checkpoints: Iterable[Union[bytes, str]]) -> Dict:
+    """
+    Merge the checkpoints (in the order of their creation) to the saved simulation state, in the
+    same format as the JSON state that is accepted by run_simulation(saved_sim_state=...).
+
+    Checkpoints before the last full checkpoint are ignored.
+    """
+    general_state = None
+    area_series: Dict[str, Dict[str, Dict[int, Any]]] = {}
+    area_scalars: Dict[str, Dict[str, Any]] = {}
+    for checkpoint in checkpoints:
+        checkpoint = _load_checkpoint(checkpoint)
+        if checkpoint["is_full"]:
+            area_series, area_scalars = {}, {}
+        elif general_state is None:
+            log.warning("Ignoring delta checkpoint that precedes the first full checkpoint.")
+            continue
+        general_state = checkpoint["general"]
+        for area_uuid, area_delta in checkpoint["areas"].items():
+            series = area_series.setdefault(area_uuid, {})
+            for path, (time_slots, values) in area_delta["series"].items():
+                values = values.tolist() if isinstance(values, np.ndarray) else values
+                series.setdefault(path, {}).update(zip(time_slots.tolist(), values))
+            for path, time_slots in area_delta["deleted_series"].items():
+                time_series = series.get(path, {})
+                for time_slot in time_slots.tolist():
+                    time_series.pop(time_slot, None)
+            area_scalars.setdefault(area_uuid, {}).update(area_delta["scalars"])
+
+    if general_state is None:
+        raise SimulationException("The simulation state checkpoints contain no full checkpoint.")
+
+    areas = {}
+    for area_uuid, scalars in area_scalars.items():
+        area_state = areas.setdefault(area_uuid, {})
+        for path, value in scalars.items():
+            _set_state_value(area_state, path, value)
+        for path, time_series in area_series.get(area_uuid, {}).items():
+            _set_state_value(area_state, path, convert_pendulum_to_str_in_dict(
+                {from_timestamp(time_slot, tz=TIME_ZONE): value
+                 for time_slot, value in time_series.items()}))
+    return {"general": general_state, "areas": areas}
@@ -16,18 +16,15 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 import datetime
-import gc
-import os
 import sys
 from importlib import import_module
 from logging import getLogger
 from time import sleep, time, mktime
+from typing import Optional
 from numpy import random
 from pendulum import now, duration, DateTime
-import psutil
 
 from gsy_framework.constants_limits import ConstSettings, GlobalConfig
-from gsy_framework.kafka_communication.kafka_producer import kafka_connection_factory
 from gsy_framework.utils import format_datetime, str_to_pendulum_datetime
 import gsy_e.constants
 
@@ -36,16 +33,20 @@ from gsy_e.gsy_e_core.exceptions import SimulationException
 from gsy_e.gsy_e_core.export import ExportAndPlot
 from gsy_e.gsy_e_core.global_objects_singleton import global_objects
 from gsy_e.gsy_e_core.live_events import LiveEvents
+from gsy_e.gsy_e_core.memory_policy import MemoryPolicy
 from gsy_e.gsy_e_core.myco_singleton import bid_offer_matcher
+from gsy_e.gsy_e_core.phase_timer import PhaseProfiler, PhaseTimer
 from gsy_e.gsy_e_core.redis_connections.redis_communication import RedisSimulationCommunication
 from gsy_e.gsy_e_core.sim_results.endpoint_buffer import SimulationEndpointBuffer
 from gsy_e.gsy_e_core.sim_results.file_export_endpoints import FileExportEndpoints
+from gsy_e.gsy_e_core.sim_results.state_checkpoint import merge_state_checkpoints
+from gsy_e.gsy_e_core.simulation_snapshot import SimulationSnapshot
 from gsy_e.gsy_e_core.util import (
     NonBlockingConsole, validate_const_settings_for_simulation,
-    get_market_slot_time_str)
+    get_market_slot_time_str, is_external_matching_enabled)
+from gsy_e.models.area.area_tree_index import AreaTreeIndex
 from gsy_e.models.area.event_deserializer import deserialize_events_to_areas
 from gsy_e.models.config import SimulationConfig
-from gsy_e.models.power_flow.pandapower import PandaPowerFlow
 
 log = getLogger(__name__)
 
@@ -79,7 +80,10 @@ class Simulation:
                  paused: bool = False, pause_after: duration = None, repl: bool = False,
                  no_export: bool = False, export_path: str = None,
                  export_subdir: str = None, redis_job_id=None, enable_bc=False,
-                 slot_length_realtime=None, incremental: bool = False):
+                 slot_length_realtime=None, incremental: bool = False,
+                 enable_phase_profiling: bool = False, memory_policy: MemoryPolicy = None,
+                 fast_forward: bool = False, snapshot_slot: Optional[int] = None,
+                 snapshot_path: Optional[str] = None):
         self.paused = False
         self.pause_after = None
         self.initial_params = dict(
@@ -106,21 +110,55 @@ class Simulation:
         self.is_stopped = False
         self._is_incremental = incremental
         self.live_events = LiveEvents(self.simulation_config)
-        self.kafka_connection = kafka_connection_factory()
-        self.redis_connection = RedisSimulationCommunication(self, redis_job_id, self.live_events)
         self._simulation_id = redis_job_id
         self._started_from_cli = redis_job_id is None
+        self.kafka_connection = self._create_kafka_connection()
 
         self.run_start = None
         self.paused_time = None
+        self._enable_phase_profiling = enable_phase_profiling
+        self.phase_timer = PhaseProfiler() if enable_phase_profiling else PhaseTimer()
+        self.memory_policy = memory_policy if memory_policy is not None else MemoryPolicy()
+        self._fast_forward_requested = fast_forward
+        self._snapshot_slot = snapshot_slot
+        self._snapshot_path = snapshot_path
+        self._validate_snapshot_settings()
 
         self._load_setup_module()
         self._init(**self.initial_params, redis_job_id=redis_job_id, enable_bc=enable_bc)
+        self.redis_connection = self._create_redis_connection()
 
         deserialize_events_to_areas(simulation_events, self.area)
 
         validate_const_settings_for_simulation()
 
+        self.memory_policy.event_setup_finished()
+
+    def _create_kafka_connection(self):
+        """Results are only sent to the kafka broker for simulations that are not run locally."""
+        if self._started_from_cli:
+            return None
+        # The kafka client is only imported if it is needed, in order to reduce the startup time.
+        # pylint: disable=import-outside-toplevel
+        from gsy_framework.kafka_communication.kafka_producer import kafka_connection_factory
+        return kafka_connection_factory()
+
+    def _create_redis_connection(self) -> Optional[RedisSimulationCommunication]:
+        """
+        Connect to redis, in order to receive commands and live events, if the simulation is
+        controlled by the gsy-web or by external clients.
+        """
+        if not self._is_redis_connection_needed():
+            return None
+        return RedisSimulationCommunication(self, self._simulation_id, self.live_events)
+
+    def _is_redis_connection_needed(self) -> bool:
+        """Return whether the simulation is controlled or accessed via redis."""
+        return (not self._started_from_cli or
+                self.simulation_config.external_connection_enabled or
+                ConstSettings.GeneralSettings.EVENT_DISPATCHING_VIA_REDIS or
+                is_external_matching_enabled())
+
     def _set_traversal_length(self):
         no_of_levels = self._get_setup_levels(self.area) + 1
         num_ticks_to_propagate = no_of_levels * 2
@@ -164,8 +202,16 @@ class Simulation:
         global_objects.profiles_handler.activate()
 
         self.area = self.setup_module.get_setup(self.simulation_config)
+        # Without redis connection the markets are only accessed by the simulation thread and
+        # can be created without locks. Decided after get_setup, since setups can enable the
+        # external matching, and before the markets are created on the activation of the area.
+        gsy_e.constants.SINGLE_THREADED_MARKETS = not self._is_redis_connection_needed()
+        self.area_tree_index = AreaTreeIndex(self.area)
         bid_offer_matcher.activate()
         global_objects.external_global_stats(self.area, self.simulation_config.ticks_per_slot)
+        global_objects.tick_scheduler.activate(self._is_fast_forward_enabled())
+        global_objects.fairness_ordering.activate(
+            gsy_e.constants.FAIRNESS_PERMUTATIONS_PER_TICK)
 
         self.endpoint_buffer = SimulationEndpointBuffer(
             redis_job_id, self.initial_params,
@@ -178,8 +224,7 @@ class Simulation:
         self._update_and_send_results()
 
         if GlobalConfig.POWER_FLOW:
-            self.power_flow = PandaPowerFlow(self.area)
-            self.power_flow.run_power_flow()
+            self._init_power_flow()
 
         log.debug("Starting simulation with config %s", self.simulation_config)
 
@@ -187,6 +232,76 @@ class Simulation:
 
         self.area.activate(enable_bc, simulation_id=redis_job_id)
 
+    def _init_power_flow(self):
+        # pandapower is only imported if the power flow is enabled, due to its import time.
+        # pylint: disable=import-outside-toplevel
+        from gsy_e.models.power_flow.pandapower import PandaPowerFlow
+        self.power_flow = PandaPowerFlow(self.area)
+        self.power_flow.run_power_flow()
+
+    def _validate_snapshot_settings(self) -> None:
+        if self._snapshot_slot is None:
+            return
+        if self._snapshot_path is None:
+            raise SimulationException("A path is required in order to save a snapshot.")
+        if (self.simulation_config.external_connection_enabled or
+                ConstSettings.GeneralSettings.EVENT_DISPATCHING_VIA_REDIS or
+                is_external_matching_enabled() or not self._started_from_cli or
+                gsy_e.constants.RUN_IN_REALTIME):
+            raise SimulationException(
+                "Snapshots are only supported for simulations that are started from the CLI "
+                "without external connections, external matching or realtime settings.")
+
+    def save_snapshot(self, slot_number: int) -> None:
+        """Save the state of the simulation at the beginning of the slot to the snapshot path."""
+        snapshot = SimulationSnapshot.capture(
+            self.setup_module_name, slot_number, self.initial_params["seed"],
+            self.simulation_config, self.area, self.endpoint_buffer,
+            getattr(self, "file_stats_endpoint", None))
+        snapshot.save(self._snapshot_path)
+        log.warning("Snapshot of slot %s was saved to %s.", slot_number, self._snapshot_path)
+
+    def restore_snapshot(self, snapshot: SimulationSnapshot) -> None:
+        """
+        Replace the state of the simulation with the state of the snapshot, in order to continue
+        the simulation from the slot of the snapshot (see run_simulation_branch).
+        """
+        self.simulation_config = snapshot.simulation_config
+        self.live_events.config = snapshot.simulation_config
+        self.area = snapshot.area
+        self.area_tree_index = AreaTreeIndex(self.area)
+        self.endpoint_buffer = snapshot.endpoint_buffer
+        snapshot.restore_global_state()
+        global_objects.tick_scheduler.activate(self._is_fast_forward_enabled())
+        global_objects.fairness_ordering.activate(
+            gsy_e.constants.FAIRNESS_PERMUTATIONS_PER_TICK)
+
+        if self.export_results_on_finish:
+            self.file_stats_endpoint = snapshot.file_stats_endpoint or FileExportEndpoints()
+            self.export = ExportAndPlot(self.area, self.export_path, self.export_subdir,
+                                        self.file_stats_endpoint, self.endpoint_buffer)
+        if GlobalConfig.POWER_FLOW:
+            self._init_power_flow()
+
+        self.run_start = now(tz=TIME_ZONE)
+        self.paused_time = 0
+
+    def _is_fast_forward_enabled(self) -> bool:
+        """Return whether the idle ticks can be skipped for the current simulation."""
+        if not self._fast_forward_requested:
+            return False
+        if (self.simulation_config.external_connection_enabled or
+                ConstSettings.GeneralSettings.EVENT_DISPATCHING_VIA_REDIS or
+                is_external_matching_enabled()):
+            log.warning("Fast-forward mode is not supported for simulations with external "
+                        "connections or external matching. All ticks will be simulated.")
+            return False
+        if gsy_e.constants.RUN_IN_REALTIME or self.slot_length_realtime:
+            log.warning("Fast-forward mode is not supported for realtime simulations. "
+                        "All ticks will be simulated.")
+            return False
+        return True
+
     @property
     def finished(self):
         """Return if simulation has finished."""
@@ -299,11 +414,6 @@ class Simulation:
             slot_no + 1, self.simulation_config)
         self.progress_info.current_slot_number = slot_no
 
-    def _set_area_current_tick(self, area, current_tick):
-        area.current_tick = current_tick
-        for child in area.children:
-            self._set_area_current_tick(child, current_tick)
-
     def _get_current_market_time_slot(self, slot_number: int) -> DateTime:
         return (self.area.config.start_date + (slot_number * self.area.config.slot_length)
                 if GlobalConfig.IS_CANARY_NETWORK else self.area.now)
@@ -326,7 +436,7 @@ class Simulation:
             seconds_until_next_tick = config.tick_length.seconds - seconds_elapsed_in_tick
 
             ticks_since_midnight = int(seconds_since_midnight // config.tick_length.seconds) + 1
-            self._set_area_current_tick(self.area, ticks_since_midnight)
+            self.area_tree_index.set_current_tick(ticks_since_midnight)
 
             sleep(seconds_until_next_tick)
 
@@ -352,30 +462,42 @@ class Simulation:
                         self.progress_info.percentage_completed, self.progress_info.elapsed_time,
                         self.progress_info.eta)
 
-            self.area.cycle_markets()
+            self.phase_timer.start_slot(self.progress_info.current_slot_str)
+            if slot_no == self._snapshot_slot:
+                with self.phase_timer.measure("save_snapshot"):
+                    self.save_snapshot(slot_no)
 
-            global_objects.profiles_handler.update_time_and_buffer_profiles(
-                self._get_current_market_time_slot(slot_no))
+            global_objects.fairness_ordering.start_tick()
+            with self.phase_timer.measure("cycle_markets"):
+                self.area.cycle_markets()
+
+            with self.phase_timer.measure("update_profiles"):
+                global_objects.profiles_handler.update_time_and_buffer_profiles(
+                    self._get_current_market_time_slot(slot_no))
 
             if self.simulation_config.external_connection_enabled:
-                global_objects.external_global_stats.update(market_cycle=True)
-                self.area.publish_market_cycle_to_external_clients()
+                with self.phase_timer.measure("publish_market_cycle_to_external_clients"):
+                    global_objects.external_global_stats.update(market_cycle=True)
+                    self.area.publish_market_cycle_to_external_clients()
 
-            bid_offer_matcher.event_market_cycle(
-                slot_completion="0%",
-                market_slot=self.progress_info.current_slot_str)
+            with self.phase_timer.measure("bid_offer_matcher.event_market_cycle"):
+                bid_offer_matcher.event_market_cycle(
+                    slot_completion="0%",
+                    market_slot=self.progress_info.current_slot_str)
 
-            self._update_and_send_results()
-            self.live_events.handle_all_events(self.area)
+            with self.phase_timer.measure("_update_and_send_results"):
+                self._update_and_send_results()
+            with self.phase_timer.measure("live_events.handle_all_events"):
+                if self.live_events.handle_all_events(self.area):
+                    self.area_tree_index.rebuild()
 
-            gc.collect()
-            process = psutil.Process(os.getpid())
-            mbs_used = process.memory_info().rss / 1000000.0
-            log.debug("Used %s MBs.", mbs_used)
+            with self.phase_timer.measure("memory_management"):
+                self.memory_policy.event_market_cycle(slot_no)
 
             self.tick_time_counter = time()
 
-            for tick_no in range(tick_resume, config.ticks_per_slot):
+            tick_no = tick_resume
+            while tick_no < config.ticks_per_slot:
                 self._handle_paused(console)
 
                 # reset tick_resume after possible resume
@@ -383,8 +505,9 @@ class Simulation:
                 log.trace("Tick %s of %s in slot %s (%.1f%)", tick_no + 1, config.ticks_per_slot,
                           slot_no + 1, (tick_no + 1) / config.ticks_per_slot * 100)
 
-                self.simulation_config.external_redis_communicator.\
-                    approve_aggregator_commands()
+                with self.phase_timer.measure("approve_aggregator_commands"):
+                    self.simulation_config.external_redis_communicator.\
+                        approve_aggregator_commands()
 
                 current_tick_in_slot = tick_no % config.ticks_per_slot
                 if (self.simulation_config.external_connection_enabled and
@@ -392,14 +515,19 @@ class Simulation:
                             current_tick_in_slot)):
                     global_objects.external_global_stats.update()
 
-                self.area.tick_and_dispatch()
-                self.area.execute_actions_after_tick_event()
-                bid_offer_matcher.event_tick(
-                    current_tick_in_slot=current_tick_in_slot,
-                    slot_completion=f"{int((tick_no / config.ticks_per_slot) * 100)}%",
-                    market_slot=self.progress_info.next_slot_str)
-                self.simulation_config.external_redis_communicator.\
-                    publish_aggregator_commands_responses_events()
+                global_objects.fairness_ordering.start_tick()
+                with self.phase_timer.measure("area.tick_and_dispatch"):
+                    self.area_tree_index.tick_and_dispatch()
+                with self.phase_timer.measure("area.execute_actions_after_tick_event"):
+                    self.area_tree_index.execute_actions_after_tick_event()
+                with self.phase_timer.measure("bid_offer_matcher.event_tick"):
+                    bid_offer_matcher.event_tick(
+                        current_tick_in_slot=current_tick_in_slot,
+                        slot_completion=f"{int((tick_no / config.ticks_per_slot) * 100)}%",
+                        market_slot=self.progress_info.next_slot_str)
+                with self.phase_timer.measure("publish_aggregator_commands_responses_events"):
+                    self.simulation_config.external_redis_communicator.\
+                        publish_aggregator_commands_responses_events()
 
                 self._handle_slowdown_and_realtime(tick_no)
                 self.tick_time_counter = time()
@@ -411,15 +539,35 @@ class Simulation:
                     self._simulation_finish_actions(slot_count)
                     return
 
+                tick_no = self._get_next_tick_no(tick_no, config.ticks_per_slot)
+
             if self.export_results_on_finish:
-                self.export.data_to_csv(self.area, slot_no == 0)
+                with self.phase_timer.measure("export.data_to_csv"):
+                    self.export.data_to_csv(self.area, slot_no == slot_resume)
 
             if self._is_incremental:
                 self.paused = True
         self._simulation_finish_actions(slot_count)
 
+    def _get_next_tick_no(self, tick_no: int, ticks_per_slot: int) -> int:
+        """
+        Return the number of the next tick in the slot that needs to be simulated. In fast-forward
+        mode, the areas are moved directly to this tick, skipping the idle ticks in between.
+        """
+        next_tick = self.area.current_tick
+        slot_end_tick = next_tick + ticks_per_slot - tick_no - 1
+        wake_up_tick = global_objects.tick_scheduler.pop_next_tick(next_tick, slot_end_tick)
+        if wake_up_tick > next_tick:
+            with self.phase_timer.measure("area_tree_index.fast_forward"):
+                self.area_tree_index.fast_forward(wake_up_tick)
+        return tick_no + 1 + wake_up_tick - next_tick
+
     def _simulation_finish_actions(self, slot_count):
         self.sim_status = "finished"
+        log.info("Memory policy report: %s", self.memory_policy.report())
+        if global_objects.tick_scheduler.enabled:
+            log.info("Fast-forward mode skipped %s ticks.",
+                     global_objects.tick_scheduler.skipped_ticks)
         self.deactivate_areas(self.area)
         self.simulation_config.external_redis_communicator.\
             publish_aggregator_commands_responses_events()
@@ -440,6 +588,8 @@ class Simulation:
             self.export.data_to_csv(self.area, False)
             self.export.area_tree_summary_to_json(self.endpoint_buffer.area_result_dict)
             self.export.export(power_flow=self.power_flow if GlobalConfig.POWER_FLOW else None)
+            if self._enable_phase_profiling:
+                self.phase_timer.export_to_csv(str(self.export.directory))
 
     @property
     def should_send_results_to_broker(self):
@@ -612,8 +762,14 @@ class Simulation:
 def run_simulation(setup_module_name="", simulation_config=None, simulation_events=None,
                    redis_job_id=None, saved_sim_state=None,
                    slot_length_realtime=None, kwargs=None):
-    """Initiate simulation class and start simulation."""
+    """Initiate simulation class and start simulation.
+
+    The saved simulation state is either the JSON state of the simulation results, or the
+    list of its binary checkpoints (see SIMULATION_STATE_BINARY_CHECKPOINTS).
+    """
     # pylint: disable=too-many-arguments
+    if isinstance(saved_sim_state, (list, tuple)):
+        saved_sim_state = merge_state_checkpoints(saved_sim_state)
     try:
         if "pricing_scheme" in kwargs:
             ConstSettings.MASettings.AlternativePricing.PRICING_SCHEME = (
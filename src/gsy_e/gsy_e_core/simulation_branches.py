@@ -0,0 +1,129 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from logging import getLogger
+from time import perf_counter
+from typing import Dict, List, Optional, Sequence
+
+from numpy import random
+
+from gsy_e.gsy_e_core.simulation import Simulation
+from gsy_e.gsy_e_core.simulation_snapshot import SimulationSnapshot
+
+log = getLogger(__name__)
+
+
+def read_live_events_file(path: str) -> List[Dict]:
+    """Read the list of live events (as accepted by LiveEvents.add_event) of a branch."""
+    with open(path, "r", encoding="utf-8") as live_events_file:
+        live_events = json.load(live_events_file)
+    if isinstance(live_events, dict):
+        live_events = [live_events]
+    return live_events
+
+
+def get_branch_name(live_events_path: Optional[str], index: int) -> str:
+    """Name of a branch, also used as the name of its results directory."""
+    if live_events_path is None:
+        return f"branch_{index:04d}"
+    return os.path.splitext(os.path.basename(live_events_path))[0]
+
+
+# pylint: disable=too-many-arguments
+def run_simulation_branch(snapshot_path: str, branch_name: str,
+                          live_events: Optional[List[Dict]] = None,
+                          export_path: Optional[str] = None, seed: Optional[int] = None,
+                          fast_forward: bool = False) -> Dict:
+    """Continue the simulation of a snapshot, after applying the live events of the branch.
+
+    Args:
+        snapshot_path: File that was written by a simulation with snapshot_slot / snapshot_path
+        branch_name: Name of the branch and of its results directory
+        live_events: Live events that are applied at the beginning of the first slot
+        export_path: Directory that contains the results directory of the branch
+        seed: Reseed the random number generators after restoring the snapshot, in order to
+            make branches without different live events diverge
+        fast_forward: Skip the ticks in which no strategy or market agent needs to act
+
+    Returns: Summary of the branch
+    """
+    run_start_time = perf_counter()
+    snapshot = SimulationSnapshot.load(snapshot_path)
+    snapshot.restore_settings()
+    simulation = Simulation(snapshot.setup_module_name, snapshot.simulation_config,
+                            seed=snapshot.seed, export_path=export_path,
+                            export_subdir=branch_name, fast_forward=fast_forward)
+    simulation.restore_snapshot(snapshot)
+    if seed is not None:
+        random.seed(seed)
+    for live_event in live_events or []:
+        simulation.live_events.add_event(live_event)
+
+    log.warning("Starting branch %s at slot %s with %s live events.",
+                branch_name, snapshot.slot_number, len(live_events or []))
+    simulation.run(initial_slot=snapshot.slot_number)
+    return {
+        "name": branch_name,
+        "slot_number": snapshot.slot_number,
+        "live_events": len(live_events or []),
+        "run_time_s": perf_counter() - run_start_time,
+        "results_directory": (str(simulation.export.directory)
+                              if simulation.export_results_on_finish else None),
+    }
+
+
+def run_simulation_branches(snapshot_path: str, live_events_paths: Sequence[Optional[str]],
+                            export_path: Optional[str] = None,
+                            max_workers: Optional[int] = None,
+                            fast_forward: bool = False) -> List[Dict]:
+    """Run one branch per live events file from the same snapshot on a process pool.
+
+    Args:
+        snapshot_path: File that was written by a simulation with snapshot_slot / snapshot_path
+        live_events_paths: JSON files with the live events of each branch (None: no events)
+        export_path: Directory that contains the results directory of each branch
+        max_workers: Maximum number of branches that are executed in parallel
+            (default: number of CPUs)
+        fast_forward: Skip the ticks in which no strategy or market agent needs to act
+
+    Returns: List with the summary of each branch, sorted by the branch name
+    """
+    snapshot_path = os.path.abspath(snapshot_path)
+    branches = {get_branch_name(path, index): path
+                for index, path in enumerate(live_events_paths)}
+    log.info("Starting %s branches from snapshot %s.", len(branches), snapshot_path)
+
+    summary = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                run_simulation_branch, snapshot_path, branch_name,
+                read_live_events_file(path) if path is not None else None, export_path,
+                fast_forward=fast_forward): branch_name
+            for branch_name, path in branches.items()}
+        for future in as_completed(futures):
+            try:
+                summary.append(future.result())
+            except Exception:  # pylint: disable=broad-except
+                log.exception("Branch %s failed.", futures[future])
+                summary.append({"name": futures[future], "failed": True})
+
+    summary.sort(key=lambda row: row["name"])
+    return summary
@@ -0,0 +1,150 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import inspect
+import pickle
+import random
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+import numpy
+from gsy_framework.constants_limits import ConstSettings, GlobalConfig
+
+from gsy_e.gsy_e_core.exceptions import SimulationException
+from gsy_e.gsy_e_core.global_objects_singleton import global_objects
+from gsy_e.gsy_e_core.myco_singleton import bid_offer_matcher
+
+if TYPE_CHECKING:
+    from gsy_e.gsy_e_core.sim_results.endpoint_buffer import SimulationEndpointBuffer
+    from gsy_e.gsy_e_core.sim_results.file_export_endpoints import FileExportEndpoints
+    from gsy_e.models.area import Area
+    from gsy_e.models.config import SimulationConfig
+    from gsy_e.models.myco_matcher.myco_matcher_interface import MycoMatcherInterface
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Members of the global_objects singleton that are part of the state of the simulation
+SNAPSHOT_GLOBAL_OBJECTS = (
+    "profiles_handler", "external_global_stats", "future_market_counter", "tick_scheduler")
+
+
+def get_settings_class_state(settings_class: type) -> Dict:
+    """Return the values of all (nested) settings of a settings class, e.g. ConstSettings."""
+    settings = {}
+    for name, value in vars(settings_class).items():
+        if (name.startswith("__") or inspect.isfunction(value) or
+                isinstance(value, (staticmethod, classmethod, property))):
+            continue
+        settings[name] = get_settings_class_state(value) if inspect.isclass(value) else value
+    return settings
+
+
+def restore_settings_class_state(settings_class: type, settings: Dict) -> None:
+    """Set the values of all (nested) settings of a settings class, e.g. ConstSettings."""
+    for name, value in settings.items():
+        nested_class = getattr(settings_class, name, None)
+        if inspect.isclass(nested_class) and isinstance(value, dict):
+            restore_settings_class_state(nested_class, value)
+        else:
+            setattr(settings_class, name, value)
+
+
+@dataclass
+class SimulationSnapshot:  # pylint: disable=too-many-instance-attributes
+    """
+    State of a simulation at the beginning of a market slot, before the markets of the slot are
+    cycled. The snapshot contains the whole area tree (markets, orders, trades and strategy
+    states), the results that were collected so far, the global settings and the state of the
+    random number generators, so that multiple branches of the simulation can be continued from
+    it without simulating the common prefix again.
+
+    All objects are pickled together in order to keep the references between them (e.g. the
+    markets that are shared by the area tree and the matcher).
+    """
+    setup_module_name: str
+    slot_number: int
+    seed: Optional[int]
+    simulation_config: "SimulationConfig"
+    area: "Area"
+    endpoint_buffer: "SimulationEndpointBuffer"
+    file_stats_endpoint: Optional["FileExportEndpoints"]
+    matcher: "MycoMatcherInterface"
+    global_objects: Dict[str, Any]
+    const_settings: Dict
+    global_config: Dict
+    numpy_random_state: tuple
+    random_state: tuple
+    format_version: int = SNAPSHOT_FORMAT_VERSION
+
+    @classmethod
+    def capture(cls, setup_module_name: str, slot_number: int, seed: Optional[int],
+                simulation_config: "SimulationConfig", area: "Area",
+                endpoint_buffer: "SimulationEndpointBuffer",
+                file_stats_endpoint: Optional["FileExportEndpoints"] = None
+                ) -> "SimulationSnapshot":
+        """Create a snapshot of the current simulation state, including the global state."""
+        # pylint: disable=too-many-arguments
+        return cls(
+            setup_module_name=setup_module_name,
+            slot_number=slot_number,
+            seed=seed,
+            simulation_config=simulation_config,
+            area=area,
+            endpoint_buffer=endpoint_buffer,
+            file_stats_endpoint=file_stats_endpoint,
+            matcher=bid_offer_matcher.matcher,
+            global_objects={name: getattr(global_objects, name)
+                            for name in SNAPSHOT_GLOBAL_OBJECTS},
+            const_settings=get_settings_class_state(ConstSettings),
+            global_config=get_settings_class_state(GlobalConfig),
+            numpy_random_state=numpy.random.get_state(),
+            random_state=random.getstate(),
+        )
+
+    def save(self, path: str) -> None:
+        """Write the snapshot to a file."""
+        with open(path, "wb") as snapshot_file:
+            pickle.dump(self, snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str) -> "SimulationSnapshot":
+        """Read a snapshot from a file that was written by SimulationSnapshot.save."""
+        with open(path, "rb") as snapshot_file:
+            snapshot = pickle.load(snapshot_file)
+        if not isinstance(snapshot, cls):
+            raise SimulationException(f"File {path} does not contain a simulation snapshot.")
+        if snapshot.format_version != SNAPSHOT_FORMAT_VERSION:
+            raise SimulationException(
+                f"Simulation snapshot {path} has format version {snapshot.format_version}, "
+                f"only version {SNAPSHOT_FORMAT_VERSION} is supported.")
+        return snapshot
+
+    def restore_settings(self) -> None:
+        """Restore the global settings that were used by the simulation of the snapshot.
+
+        Has to be called before the simulation of the branch is created.
+        """
+        restore_settings_class_state(ConstSettings, self.const_settings)
+        restore_settings_class_state(GlobalConfig, self.global_config)
+
+    def restore_global_state(self) -> None:
+        """Restore the global objects, the matcher and the random number generators."""
+        bid_offer_matcher.matcher = self.matcher
+        for name, global_object in self.global_objects.items():
+            setattr(global_objects, name, global_object)
+        numpy.random.set_state(self.numpy_random_state)
+        random.setstate(self.random_state)
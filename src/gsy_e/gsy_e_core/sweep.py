@@ -0,0 +1,229 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, fields
+from itertools import product
+from logging import getLogger
+from time import perf_counter
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+from gsy_framework.constants_limits import ConstSettings
+from gsy_framework.enums import SpotMarketTypeEnum
+
+from gsy_e.gsy_e_core.exceptions import SimulationException
+from gsy_e.gsy_e_core.util import update_advanced_settings
+from gsy_e.models.config import SimulationConfig
+
+if TYPE_CHECKING:
+    from gsy_e.models.area import Area
+
+log = getLogger(__name__)
+
+SWEEP_SUMMARY_FILE_NAME = "sweep_summary"
+
+
+@dataclass(frozen=True)
+class SweepRun:
+    """Combination of settings that is simulated by one run of a parameter sweep."""
+    index: int
+    seed: int
+    market_type: int
+    bid_offer_match_type: int
+    pricing_scheme: int
+    grid_fee_type: int
+    grid_fee_constant: Optional[float] = None
+    grid_fee_percentage: Optional[float] = None
+
+    @property
+    def name(self) -> str:
+        """Name of the run, also used as the name of its results directory."""
+        return f"run_{self.index:04d}"
+
+    @property
+    def is_valid(self) -> bool:
+        """Alternative pricing schemes can only be used in one-sided markets."""
+        return (self.pricing_scheme == 0 or
+                self.market_type == SpotMarketTypeEnum.ONE_SIDED.value)
+
+    def apply_settings(self) -> None:
+        """Configure the global settings according to the run."""
+        ConstSettings.MASettings.MARKET_TYPE = self.market_type
+        ConstSettings.MASettings.BID_OFFER_MATCH_TYPE = self.bid_offer_match_type
+        ConstSettings.MASettings.AlternativePricing.PRICING_SCHEME = self.pricing_scheme
+        ConstSettings.MASettings.GRID_FEE_TYPE = self.grid_fee_type
+
+    def apply_grid_fees(self, area: "Area") -> None:
+        """Override the grid fees of all markets of the area tree, if requested by the run."""
+        if self.grid_fee_constant is None and self.grid_fee_percentage is None:
+            return
+        if area.children:
+            area.area_reconfigure_event(grid_fee_constant=self.grid_fee_constant,
+                                        grid_fee_percentage=self.grid_fee_percentage)
+            for child in area.children:
+                self.apply_grid_fees(child)
+
+
+SWEEP_PARAMETERS = tuple(field.name for field in fields(SweepRun) if field.name != "index")
+
+
+def _get_default_sweep_parameters() -> Dict:
+    return {
+        "seed": 0,
+        "market_type": ConstSettings.MASettings.MARKET_TYPE,
+        "bid_offer_match_type": ConstSettings.MASettings.BID_OFFER_MATCH_TYPE,
+        "pricing_scheme": ConstSettings.MASettings.AlternativePricing.PRICING_SCHEME,
+        "grid_fee_type": ConstSettings.MASettings.GRID_FEE_TYPE,
+        "grid_fee_constant": None,
+        "grid_fee_percentage": None,
+    }
+
+
+def create_sweep_runs(parameter_grid: Dict[str, Sequence]) -> List[SweepRun]:
+    """Expand the parameter grid to the list of runs that cover all of its combinations.
+
+    Parameters that are not part of the grid keep the values of the current global settings.
+    Combinations that are not supported by the simulation are skipped.
+    """
+    unknown_parameters = set(parameter_grid) - set(SWEEP_PARAMETERS)
+    if unknown_parameters:
+        raise SimulationException(
+            f"Unknown sweep parameters {sorted(unknown_parameters)}, "
+            f"available parameters: {list(SWEEP_PARAMETERS)}.")
+    empty_parameters = [name for name, values in parameter_grid.items() if not values]
+    if empty_parameters:
+        raise SimulationException(f"No values were provided for sweep parameters "
+                                  f"{empty_parameters}.")
+
+    defaults = _get_default_sweep_parameters()
+    swept_parameters = [name for name in SWEEP_PARAMETERS if name in parameter_grid]
+    sweep_runs = []
+    for values in product(*(parameter_grid[name] for name in swept_parameters)):
+        sweep_run = SweepRun(index=len(sweep_runs),
+                             **{**defaults, **dict(zip(swept_parameters, values))})
+        if not sweep_run.is_valid:
+            log.warning("Skipping sweep combination %s: alternative pricing schemes are only "
+                        "usable with a one-sided market.", dict(zip(swept_parameters, values)))
+            continue
+        sweep_runs.append(sweep_run)
+    return sweep_runs
+
+
+def _get_kpis(area: "Area") -> Dict:
+    """Return the scalar KPIs of the area, as calculated at the end of the simulation."""
+    return {f"kpi_{name}": value for name, value in area.stats.kpi.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)}
+
+
+def _execute_sweep_run(sweep_run: SweepRun, setup_module_name: str, simulation_settings: Dict,
+                       advanced_settings: Optional[Dict], export_path: str) -> Dict:
+    """Run the simulation of one sweep run and return its summary.
+
+    Executed in one of the worker processes of the sweep, which are reused between runs in order
+    to avoid the interpreter startup and the import of the setup for every run. Therefore all
+    global settings that can be swept are set by every run. The simulation is only imported
+    here, since the command line interface imports the sweep parameters.
+    """
+    from gsy_e.gsy_e_core.simulation import Simulation  # pylint: disable=import-outside-toplevel
+
+    if advanced_settings:
+        update_advanced_settings(advanced_settings)
+    sweep_run.apply_settings()
+    simulation_config = SimulationConfig(
+        **simulation_settings, grid_fee_type=sweep_run.grid_fee_type,
+        external_connection_enabled=False)
+
+    run_start_time = perf_counter()
+    simulation = Simulation(setup_module_name, simulation_config, seed=sweep_run.seed,
+                            export_path=export_path, export_subdir=sweep_run.name)
+    sweep_run.apply_grid_fees(simulation.area)
+    simulation.run()
+    run_time_s = perf_counter() - run_start_time
+
+    return {
+        "name": sweep_run.name,
+        **{name: value for name, value in asdict(sweep_run).items() if name != "index"},
+        "run_time_s": run_time_s,
+        "results_directory": str(simulation.export.directory),
+        **_get_kpis(simulation.area),
+    }
+
+
+def _export_sweep_summary(summary: List[Dict], export_path: str) -> None:
+    with open(os.path.join(export_path, f"{SWEEP_SUMMARY_FILE_NAME}.json"), "w",
+              encoding="utf-8") as json_file:
+        json.dump(summary, json_file, indent=2)
+
+    columns = []
+    for row in summary:
+        columns.extend(column for column in row if column not in columns)
+    with open(os.path.join(export_path, f"{SWEEP_SUMMARY_FILE_NAME}.csv"), "w",
+              encoding="utf-8", newline="") as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(summary)
+
+
+# pylint: disable=too-many-arguments
+def run_sweep(setup_module_name: str, simulation_settings: Dict,
+              parameter_grid: Dict[str, Sequence], export_path: str,
+              max_workers: Optional[int] = None,
+              advanced_settings: Optional[Dict] = None) -> List[Dict]:
+    """Run the simulation for every combination of the parameter grid on a process pool.
+
+    Args:
+        setup_module_name: Setup module that is simulated by all runs
+        simulation_settings: Keyword arguments of the SimulationConfig of all runs
+        parameter_grid: Values of each swept parameter (see SWEEP_PARAMETERS)
+        export_path: Directory that contains the results directory of each run and the summary
+        max_workers: Maximum number of simulations that are executed in parallel
+            (default: number of CPUs)
+        advanced_settings: Advanced settings (as read from a settings file) of all runs
+
+    Returns: List with the summary of each run, sorted by the run index
+    """
+    sweep_runs = create_sweep_runs(parameter_grid)
+    export_path = os.path.abspath(export_path)
+    os.makedirs(export_path, exist_ok=True)
+    log.info("Starting sweep of %s runs.", len(sweep_runs))
+
+    summary = []
+    sweep_start_time = perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_execute_sweep_run, sweep_run, setup_module_name,
+                            simulation_settings, advanced_settings, export_path): sweep_run
+            for sweep_run in sweep_runs}
+        for future in as_completed(futures):
+            sweep_run = futures[future]
+            try:
+                summary.append(future.result())
+            except Exception:  # pylint: disable=broad-except
+                log.exception("Sweep run %s (%s) failed.", sweep_run.name, sweep_run)
+                summary.append({"name": sweep_run.name, "failed": True,
+                                **{name: value for name, value in asdict(sweep_run).items()
+                                   if name != "index"}})
+            log.warning("Sweep progress: %s of %s runs finished, %.1f s elapsed.",
+                        len(summary), len(sweep_runs), perf_counter() - sweep_start_time)
+
+    summary.sort(key=lambda row: row["name"])
+    _export_sweep_summary(summary, export_path)
+    log.info("Sweep summary was written to %s.", export_path)
+    return summary
@@ -0,0 +1,75 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from typing import Optional
+
+
+class TickScheduler:
+    """
+    Collect the ticks at which strategies and market agents need to receive the next tick event,
+    in order for the fast-forward mode of the simulation to skip the ticks in which nothing can
+    happen.
+
+    Every participant declares its next wake-up tick whenever it receives a tick or a market
+    cycle event. Any change in the order book of a market (new, deleted or traded orders) forces
+    the simulation to process the following tick as well, since other participants might react
+    to it.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.skipped_ticks = 0
+        self._next_wake_up_tick: Optional[int] = None
+        self._market_activity = False
+
+    def activate(self, enabled: bool) -> None:
+        """Enable or disable the scheduler and discard all pending wake-up requests."""
+        self.enabled = enabled
+        self.skipped_ticks = 0
+        self._next_wake_up_tick = None
+        self._market_activity = False
+
+    def request_wake_up(self, tick: Optional[int]) -> None:
+        """Request the tick event to be dispatched on the provided tick (None: no request)."""
+        if not self.enabled or tick is None:
+            return
+        if self._next_wake_up_tick is None or tick < self._next_wake_up_tick:
+            self._next_wake_up_tick = tick
+
+    def notify_market_activity(self) -> None:
+        """Notify the scheduler that the order book of a market has changed."""
+        self._market_activity = True
+
+    def pop_next_tick(self, next_tick: int, slot_end_tick: int) -> int:
+        """
+        Return the tick that the simulation should continue with, and reset the pending requests.
+        Args:
+            next_tick: The tick that follows the tick that was just processed
+            slot_end_tick: The first tick of the next market slot
+
+        Returns: Tick between next_tick and slot_end_tick
+        """
+        if not self.enabled or self._market_activity:
+            selected_tick = next_tick
+        elif self._next_wake_up_tick is None:
+            selected_tick = slot_end_tick
+        else:
+            selected_tick = min(max(self._next_wake_up_tick, next_tick), slot_end_tick)
+        self._next_wake_up_tick = None
+        self._market_activity = False
+        self.skipped_ticks += selected_tick - next_tick
+        return selected_tick
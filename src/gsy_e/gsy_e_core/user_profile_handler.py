@@ -15,218 +15,16 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
-import os
-import uuid
-from datetime import datetime
 from typing import Dict
 
-import pytz
 from gsy_framework.constants_limits import GlobalConfig
 from gsy_framework.read_user_profile import read_arbitrary_profile, InputProfileTypes
-from gsy_framework.utils import generate_market_slot_list
-from pendulum import DateTime, instance, duration
-from pony.orm import Database, Required, db_session, select
-from pony.orm.core import Query
+from pendulum import DateTime
 
 import gsy_e.constants
 from gsy_e.gsy_e_core.util import should_read_profile_from_db
 
 
-class ProfileDBConnectionHandler:
-    """
-    Handles connection and interaction with the user-profiles postgres DB via pony ORM
-    """
-    _db = Database()
-
-    class Profile_Database_ProfileTimeSeries(_db.Entity):
-        """Model for the profile timeseries data"""
-        profile_uuid = Required(uuid.UUID)
-        time = Required(datetime)
-        value = Required(float)
-
-    class Profile_Database_ConfigurationAreaProfileUuids(_db.Entity):
-        """Model for the information associated with each profile"""
-        configuration_uuid = Required(uuid.UUID)
-        area_uuid = Required(uuid.UUID)
-        profile_uuid = Required(uuid.UUID)
-        profile_type = Required(int)  # values of InputProfileTypes
-
-    def __init__(self):
-        self._user_profiles = {}
-        self._buffered_times = []
-        self._profile_uuids = None
-
-    @staticmethod
-    def _convert_pendulum_to_datetime(time_stamp):
-        return datetime.fromtimestamp(time_stamp.timestamp(), tz=pytz.UTC)
-
-    @staticmethod
-    def _strip_timezone_and_create_pendulum_instance_from_datetime(
-            time_stamp: datetime) -> DateTime:
-        return instance(time_stamp).in_timezone("UTC")
-
-    def connect(self):
-        """ Establishes a connection to the gsy_e-profiles DB
-        Requires a postgres DB server running
-
-        """
-        self._db.bind(provider="postgres",
-                      user=os.environ.get("PROFILE_DB_USER", "d3a_web"),
-                      password=os.environ.get("PROFILE_DB_PASSWORD", "d3a_web"),
-                      host=os.environ.get("PROFILE_DB_HOST", "localhost"),
-                      port=os.environ.get("PROFILE_DB_PORT", "5432"),
-                      database=os.environ.get("PROFILE_DB_NAME", "d3a_web"))
-
-        self._db.generate_mapping(check_tables=True)
-
-    @db_session
-    def get_first_week_from_profile(self, profile_uuid, current_timestamp) -> dict:
-        """ Performs query to database and get the first week from a profile with the specified
-            profile uuid. Current timestamp is used in order to rebase the start of the profile
-            to the requested time from the simulation (e.g. if a profile contains values from
-            before the simulation, the timestamps of these values will be moved to sync with
-            the current_timestamp)
-
-        Args:
-            profile_uuid (UUID): uuid of the profile that we request the weekly data
-            current_timestamp (datetime): timestamp that the profile timestamps will be moved to
-
-        Returns: A dict with the timestamps of the adapted weekly profile as keys, and the profile
-                 values as dict values.
-
-        """
-        if not isinstance(profile_uuid, uuid.UUID):
-            profile_uuid = uuid.UUID(profile_uuid)
-        first_datapoint_time = select(
-            datapoint for datapoint in self.Profile_Database_ProfileTimeSeries
-            if datapoint.profile_uuid == profile_uuid
-        ).order_by(lambda d: d.time).limit(1)[0].time
-
-        datapoints = select(
-            datapoint for datapoint in self.Profile_Database_ProfileTimeSeries
-            if datapoint.profile_uuid == profile_uuid
-            and datapoint.time >= first_datapoint_time
-            and datapoint.time <= first_datapoint_time + duration(days=7)
-        )
-
-        datapoint_dict = {
-            self._strip_timezone_and_create_pendulum_instance_from_datetime(datapoint.time).set(
-                year=current_timestamp.year,
-                month=current_timestamp.month,
-                day=current_timestamp.day
-            ): datapoint.value for datapoint in datapoints
-        }
-
-        self._buffered_times = list(datapoint_dict.keys())
-
-        return datapoint_dict
-
-    @db_session
-    def _get_profiles_from_db(self, start_time: datetime, end_time: datetime) -> Query:
-        """ Performs query to database and get chunks of profiles for all profiles that correspond
-        to this simulation (that are buffered in self._profile_uuid_type_mapping)
-
-        Args:
-            start_time (datetime): first timestamp of the queried profile chunks (TZ unaware)
-            end_time (datetime): last timestamp of the queried profile chunks (TZ unaware)
-
-        Returns: A pony orm selection of the queried data
-
-        """
-        selection = select(
-            datapoint for datapoint in self.Profile_Database_ProfileTimeSeries
-            if datapoint.profile_uuid in self._profile_uuids
-            and datapoint.time >= start_time and datapoint.time <= end_time
-        )
-        return selection
-
-    @db_session
-    def _buffer_profile_uuid_list(self):
-        """ Buffers list of the profile_uuids that correspond to this simulation into
-        self._profile_uuids"""
-        profile_selection = select(
-            datapoint.profile_uuid
-            for datapoint in self.Profile_Database_ConfigurationAreaProfileUuids
-            if datapoint.configuration_uuid == uuid.UUID(gsy_e.constants.CONFIGURATION_ID))
-
-        self._profile_uuids = list(profile_selection)
-
-    @db_session
-    def _buffer_all_profiles(self, current_timestamp: DateTime):
-        """ Loops over all profile uuids used in the setup and
-        reads a new chunk of data from the DB
-
-        Args:
-            current_timestamp (Datetime): Current pendulum time stamp
-        """
-        start_time, end_time = self._get_start_end_time(current_timestamp)
-        query_ret_val = self._get_profiles_from_db(self._convert_pendulum_to_datetime(start_time),
-                                                   self._convert_pendulum_to_datetime(end_time))
-
-        for profile_uuid in self._profile_uuids:
-            self._user_profiles[profile_uuid] = {
-                self._strip_timezone_and_create_pendulum_instance_from_datetime(
-                    data_point.time): data_point.value
-                for data_point in query_ret_val if data_point.profile_uuid == profile_uuid
-            }
-
-        for profile_uuid, profile_timeseries in self._user_profiles.items():
-            if not profile_timeseries:
-                self._user_profiles[profile_uuid] = self.get_first_week_from_profile(
-                    profile_uuid, current_timestamp)
-
-    def _buffer_time_slots(self):
-        """ Buffers a list of time_slots that are currently buffered in the user profiles.
-        These are user to decide whether to rotate the buffer
-
-        """
-        if len(self._profile_uuids) > 0:
-            time_stamps = self._user_profiles[self._profile_uuids[0]].keys()
-            self._buffered_times = list(time_stamps)
-        else:
-            self._buffered_times = []
-
-    @staticmethod
-    def _get_start_end_time(current_timestamp: DateTime) -> (DateTime, DateTime):
-        """ Gets the start and end time for the to be buffered profile.
-        It uses generate_market_slot_list that takes into account the PROFILE_EXPANSION_DAYS
-
-        Returns: tuple of timestamps
-
-        """
-        time_stamps = generate_market_slot_list(current_timestamp)
-        return min(time_stamps), max(time_stamps)
-
-    def _should_buffer_profiles(self, current_timestamp: DateTime):
-        return (self._profile_uuids is None or
-                (not self._buffered_times or (current_timestamp not in self._buffered_times)))
-
-    def buffer_profiles_from_db(self, current_timestamp: DateTime):
-        """ Public method for buffering profiles and all other information from DB into memory
-
-        Args:
-            current_timestamp (Datetime): Current pendulum time stamp
-                                          that is used to decide whether to buffer or not
-
-        """
-        if self._should_buffer_profiles(current_timestamp):
-            self._buffer_profile_uuid_list()
-            self._buffer_all_profiles(current_timestamp)
-            self._buffer_time_slots()
-
-    def get_profile_from_db_buffer(self, profile_uuid: str) -> Dict:
-        """ Wrapper for acquiring a user profile for a specific profile_uuid
-
-        Args:
-            profile_uuid (str):
-
-        Returns:
-            user profile for dictionary
-
-        """
-        return self._user_profiles[uuid.UUID(profile_uuid)]
-
-
 class ProfilesHandler:
     """
     Handles profiles rotation of all profiles (stored in DB and in memory)
@@ -244,6 +42,10 @@ class ProfilesHandler:
 
     def _connect_to_db(self):
         if gsy_e.constants.CONNECT_TO_PROFILES_DB:
+            # pony ORM is only imported if the profiles DB is used, due to its import time.
+            # pylint: disable=import-outside-toplevel
+            from gsy_e.gsy_e_core.profile_db_connection_handler import (
+                ProfileDBConnectionHandler)
             self.db = ProfileDBConnectionHandler()
             self.db.connect()
 
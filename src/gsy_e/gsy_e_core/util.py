@@ -15,6 +15,7 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
+import importlib
 import inspect
 import json
 import logging
@@ -95,6 +96,23 @@ class TaggedLogWrapper(LoggerAdapter):
         self.log(TRACE, msg, *args, **kwargs)
 
 
+class LazyModuleImport:
+    """
+    Import a module on the first access of one of its attributes. Used for heavy dependencies
+    that are only needed by optional features (e.g. plots), in order to keep the startup of
+    the simulation fast.
+    """
+
+    def __init__(self, module_name: str):
+        self._module_name = module_name
+        self._module = None
+
+    def __getattr__(self, name):
+        if self._module is None:
+            self._module = importlib.import_module(self._module_name)
+        return getattr(self._module, name)
+
+
 class DateType(ParamType):
     """DateType"""
     name = "date"
@@ -126,6 +126,13 @@ class Area:
         self.active = False
         self.log = TaggedLogWrapper(log, name)
         self.current_tick = 0
+        # Per-tick cached views of the clock, configuration and spot market of the area, only
+        # used for active areas and discarded by _invalidate_cached_views.
+        self._cached_now: Optional[DateTime] = None
+        self._cached_now_tick: Optional[int] = None
+        self._cached_config: Optional[Union[SimulationConfig, GlobalConfig]] = None
+        self._cached_spot_market: Optional["MarketBase"] = None
+        self._is_spot_market_cached = False
         self.__name = name
         self.throughput = throughput
         self.uuid = uuid if uuid is not None else str(uuid4())
@@ -181,9 +188,22 @@ class Area:
         })
         return state
 
+    def get_checkpoint_state(self):
+        """Get the current state of the area, keeping the time slots as DateTime keys."""
+        state = {}
+        if self.strategy is not None:
+            state = self.strategy.get_checkpoint_state()
+
+        state.update(**{
+            "current_tick": self.current_tick,
+            "area_stats": self.stats.get_checkpoint_state()
+        })
+        return state
+
     def restore_state(self, saved_state):
         """Restore a previously-saved state."""
         self.current_tick = saved_state["current_tick"]
+        self._invalidate_cached_views()
         self.stats.restore_state(saved_state["area_stats"])
         if self.strategy is not None:
             self.strategy.restore_state(saved_state)
@@ -341,6 +361,7 @@ class Area:
         `_trigger_event` is used internally to avoid multiple event chains during
         initial area activation.
         """
+        self._invalidate_cached_views()
 
         current_tick_in_slot = int(self.current_tick % self.config.ticks_per_slot)
         tick_at_the_slot_start = self.current_tick - current_tick_in_slot
@@ -383,6 +404,7 @@ class Area:
         # AreaMarkets class, in order to create all necessary markets with one call.
 
         changed = self._markets.create_new_spot_market(now_value, AvailableMarketTypes.SPOT, self)
+        self._invalidate_cached_views()
 
         # create new settlement market
         if (self.last_past_market and
@@ -465,16 +487,33 @@ class Area:
         updating the clock on markets with self.now member
         Returns: None
 
+        """
+        self.execute_own_actions_after_tick_event()
+        for child in self.children:
+            child.execute_actions_after_tick_event()
+
+    def execute_own_actions_after_tick_event(self) -> None:
+        """
+        Execute the actions of execute_actions_after_tick_event only for this area, without
+        propagating them to the children.
         """
         self.current_tick += 1
+        self._invalidate_cached_views()
         self._consume_commands_from_aggregator()
+        self._update_market_clocks()
+
+    def fast_forward_to_tick(self, tick: int) -> None:
+        """Move the area to the provided tick without dispatching the skipped tick events."""
+        self.current_tick = tick
+        self._invalidate_cached_views()
+        self._update_market_clocks()
+
+    def _update_market_clocks(self) -> None:
         if self.children:
             self.spot_market.update_clock(self.now)
 
             for market in self._markets.settlement_markets.values():
                 market.update_clock(self.now)
-        for child in self.children:
-            child.execute_actions_after_tick_event()
 
     def tick_and_dispatch(self):
         """Invoke tick handler and broadcast the event to children."""
@@ -505,14 +544,28 @@ class Area:
         """Return the number of the current tick in the current market slot."""
         return self.current_tick % self.config.ticks_per_slot
 
+    def _invalidate_cached_views(self) -> None:
+        """Discard the cached clock, configuration and spot market of the area."""
+        self._cached_now = None
+        self._cached_now_tick = None
+        self._cached_config = None
+        self._cached_spot_market = None
+        self._is_spot_market_cached = False
+
     @property
     def config(self) -> Union[SimulationConfig, GlobalConfig]:
         """Return the configuration used by the area."""
+        if self._cached_config is not None:
+            return self._cached_config
         if self._config:
-            return self._config
-        if self.parent:
-            return self.parent.config
-        return GlobalConfig
+            config = self._config
+        elif self.parent:
+            config = self.parent.config
+        else:
+            config = GlobalConfig
+        if self.active:
+            self._cached_config = config
+        return config
 
     @property
     def bc(self):
@@ -530,9 +583,14 @@ class Area:
         In this default implementation "current time" is defined by the number of ticks that
         have passed.
         """
-        return self.config.start_date.add(
-            seconds=self.config.tick_length.seconds * self.current_tick
-        )
+        if self._cached_now is not None and self._cached_now_tick == self.current_tick:
+            return self._cached_now
+        config = self.config
+        now_value = config.start_date.add(seconds=config.tick_length.seconds * self.current_tick)
+        if self.active:
+            self._cached_now = now_value
+            self._cached_now_tick = self.current_tick
+        return now_value
 
     @property
     def past_markets(self) -> List:
@@ -560,10 +618,16 @@ class Area:
     @property
     def spot_market(self):
         """Return the "current" market (i.e. the one currently "running")."""
+        if self._is_spot_market_cached:
+            return self._cached_spot_market
         try:
-            return self.all_markets[-1]
+            spot_market = self.all_markets[-1]
         except IndexError:
-            return None
+            spot_market = None
+        if self.active:
+            self._cached_spot_market = spot_market
+            self._is_spot_market_cached = True
+        return spot_market
 
     @property
     def current_market(self):
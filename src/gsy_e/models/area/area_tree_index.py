@@ -0,0 +1,121 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from typing import TYPE_CHECKING, List, Tuple
+
+from gsy_framework.constants_limits import ConstSettings
+from numpy.random import random
+
+import gsy_e.constants
+from gsy_e.events.event_structures import AreaEvent
+
+if TYPE_CHECKING:
+    from gsy_e.models.area import Area
+
+
+class AreaTreeIndex:
+    """
+    Flattened index of the area tree, that replaces the recursive traversal of the tree on every
+    tick (tick dispatching, current tick and market clock updates) with loops over arrays.
+
+    The areas are stored in depth-first pre-order, and each area references its children by
+    their position in the index. The order in which the areas and the strategies receive the
+    events, as well as the consumption of random numbers for the fairness shuffling, are the
+    same as in the recursive dispatching of AreaDispatcher, therefore the results of a seeded
+    simulation are not affected.
+
+    The index needs to be rebuilt whenever areas are added to or removed from the tree
+    (live events), which also resets the market event subscriptions of the dispatchers.
+    """
+
+    def __init__(self, root_area: "Area"):
+        self.root_area = root_area
+        self.areas: List["Area"] = []
+        self.children_indices: List[Tuple[int, ...]] = []
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Recreate the index from the current structure of the area tree."""
+        self.areas = []
+        self.children_indices = []
+        stack = [self.root_area]
+        while stack:
+            area = stack.pop()
+            self.areas.append(area)
+            area.dispatcher.reset_market_event_subscriptions()
+            # Children are pushed in reverse order in order to be visited in their list order.
+            stack.extend(reversed(area.children))
+
+        area_indices = {id(area): index for index, area in enumerate(self.areas)}
+        self.children_indices = [
+            tuple(area_indices[id(child)] for child in area.children) for area in self.areas]
+
+    def tick_and_dispatch(self) -> None:
+        """
+        Equivalent of Area.tick_and_dispatch for the root area, using the index instead of the
+        recursive broadcasting of the tick event.
+        """
+        if ConstSettings.GeneralSettings.EVENT_DISPATCHING_VIA_REDIS:
+            self.root_area.tick_and_dispatch()
+            return
+
+        bottom_to_top = gsy_e.constants.DISPATCH_EVENTS_BOTTOM_TO_TOP
+        # Each entry contains the position of the area in the index, and whether its children
+        # have already received the tick event.
+        stack = [(0, False)]
+        while stack:
+            index, children_dispatched = stack.pop()
+            area = self.areas[index]
+            if not children_dispatched:
+                if not bottom_to_top:
+                    area.tick()
+                stack.append((index, True))
+                if not area.events.is_enabled:
+                    continue
+                # Broadcast to children in random order to ensure fairness
+                for child_index in reversed(sorted(self.children_indices[index],
+                                                   key=lambda _: random())):
+                    child_events = self.areas[child_index].events
+                    if child_events.is_connected and child_events.is_enabled:
+                        stack.append((child_index, False))
+                continue
+
+            if area.events.is_enabled and self.children_indices[index]:
+                # Leaf areas do not own market agents, therefore there is nothing to broadcast.
+                area.dispatcher.broadcast_notification_to_agents(AreaEvent.TICK)
+            if bottom_to_top:
+                area.tick()
+            # The tick can disable the area (update_events), which is checked again as in
+            # AreaDispatcher.event_listener
+            if (index != 0 and area.strategy and
+                    area.events.is_connected and area.events.is_enabled):
+                area.strategy.event_listener(AreaEvent.TICK)
+
+    def execute_actions_after_tick_event(self) -> None:
+        """Equivalent of Area.execute_actions_after_tick_event for the root area."""
+        for area in self.areas:
+            area.execute_own_actions_after_tick_event()
+
+    def set_current_tick(self, current_tick: int) -> None:
+        """Set the current tick of all areas of the tree."""
+        for area in self.areas:
+            area.current_tick = current_tick
+
+    def fast_forward(self, tick: int) -> None:
+        """Move all areas of the tree to the provided tick, skipping the ticks in between."""
+        for area in self.areas:
+            area.fast_forward_to_tick(tick)
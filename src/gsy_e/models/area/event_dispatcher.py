@@ -16,15 +16,17 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 from logging import getLogger
-from typing import Union, Dict, TYPE_CHECKING, Optional
+from typing import Union, Dict, List, TYPE_CHECKING, Optional, Tuple
 
 from gsy_framework.constants_limits import ConstSettings
 from gsy_framework.enums import SpotMarketTypeEnum
-from numpy.random import random
 from pendulum import DateTime
 
+import gsy_e.constants
+from gsy_e.events import AGGREGATED_MARKET_EVENTS
 from gsy_e.events.event_structures import MarketEvent, AreaEvent
 from gsy_e.gsy_e_core.exceptions import WrongMarketTypeException
+from gsy_e.gsy_e_core.global_objects_singleton import global_objects
 from gsy_e.gsy_e_core.redis_connections.redis_area_market_communicator import RedisCommunicator
 from gsy_e.models.area.redis_dispatcher.area_event_dispatcher import RedisAreaEventDispatcher
 from gsy_e.models.area.redis_dispatcher.area_to_market_publisher import AreaToMarketEventPublisher
@@ -62,6 +64,11 @@ class AreaDispatcher:
         self._settlement_agents: Dict[DateTime, SettlementAgent] = {}
         self._future_agent: Optional[FutureAgent] = None
         self.area = area
+        # MarketEvent -> positions of the children whose strategies react to the event, and
+        # positions of the children that own market agents (see _update_market_event_subscribers)
+        self._market_event_subscribers: Optional[Dict[MarketEvent, List[int]]] = None
+        self._agent_children_positions: List[int] = []
+        self._market_event_subscribers_key: Optional[Tuple[int, int]] = None
 
     @property
     def spot_agents(self) -> Dict[DateTime, OneSidedAgent]:
@@ -111,12 +118,53 @@ class AreaDispatcher:
         """
         self.broadcast_notification(AreaEvent.BALANCING_MARKET_CYCLE, **kwargs)
 
+    def reset_market_event_subscriptions(self) -> None:
+        """
+        Collect the market event subscriptions of the strategies of the children again, before
+        the next market event is dispatched (e.g. after live events changed the strategies).
+        """
+        self._market_event_subscribers = None
+
+    def _update_market_event_subscribers(self) -> None:
+        """Collect the market event subscriptions of the strategies of the children."""
+        children = self.area.children
+        # The subscriptions are also collected again if the children have been replaced
+        children_key = (id(children), len(children))
+        if (self._market_event_subscribers is not None and
+                self._market_event_subscribers_key == children_key):
+            return
+        self._market_event_subscribers = {event: [] for event in MarketEvent}
+        self._agent_children_positions = []
+        for index, child in enumerate(children):
+            if child.children:
+                self._agent_children_positions.append(index)
+            if child.strategy is None:
+                continue
+            for event in child.strategy.get_market_event_subscriptions():
+                self._market_event_subscribers[event].append(index)
+        for aggregated_event, event in AGGREGATED_MARKET_EVENTS.items():
+            self._market_event_subscribers[aggregated_event] = (
+                self._market_event_subscribers[event])
+        self._market_event_subscribers_key = children_key
+
+    def _shuffle_children(self, children: List["Area"], positions: List[int]) -> List["Area"]:
+        """
+        Return the children at the positions in the order in which they would be visited when
+        shuffling all children in broadcast_notification (drawing the same random numbers).
+        """
+        fairness_keys = global_objects.fairness_ordering.get_fairness_keys(
+            self.area.uuid, len(children))
+        return [children[position]
+                for position in sorted(positions, key=fairness_keys.__getitem__)]
+
     def _broadcast_notification_to_single_agent(
             self, agent_area: "Area", market_type: AvailableMarketTypes,
             event_type: AreaEvent, **kwargs) -> None:
 
         if market_type == AvailableMarketTypes.FUTURE and agent_area.dispatcher.future_agent:
-            agent_area.dispatcher.future_agent.event_listener(event_type, **kwargs)
+            future_agent = agent_area.dispatcher.future_agent
+            if self._is_subscribed(future_agent, event_type):
+                future_agent.event_listener(event_type, **kwargs)
         elif market_type != AvailableMarketTypes.FUTURE:
             agent_dict = self._get_agents_for_market_type(agent_area.dispatcher, market_type)
             for time_slot, agent in agent_dict.items():
@@ -125,7 +173,15 @@ class AreaDispatcher:
                     # exclude past MAs
                     continue
 
-                agent.event_listener(event_type, **kwargs)
+                if self._is_subscribed(agent, event_type):
+                    agent.event_listener(event_type, **kwargs)
+
+    @staticmethod
+    def _is_subscribed(agent: OneSidedAgent, event_type: Union[MarketEvent, AreaEvent]) -> bool:
+        return (not gsy_e.constants.MARKET_EVENT_SUBSCRIPTIONS or
+                not isinstance(event_type, MarketEvent) or
+                AGGREGATED_MARKET_EVENTS.get(event_type, event_type) in
+                agent.get_market_event_subscriptions())
 
     def _broadcast_notification_to_area_and_child_agents(
             self, market_type: AvailableMarketTypes,
@@ -134,9 +190,16 @@ class AreaDispatcher:
         if not self.area.events.is_connected:
             return
 
-        for child in sorted(self.area.children, key=lambda _: random()):
-            if not child.children:
-                continue
+        if gsy_e.constants.MARKET_EVENT_SUBSCRIPTIONS:
+            self._update_market_event_subscribers()
+            agent_areas = self._shuffle_children(
+                self.area.children, self._agent_children_positions)
+        else:
+            agent_areas = [
+                child for child in global_objects.fairness_ordering.shuffle(
+                    self.area.uuid, self.area.children)
+                if child.children]
+        for child in agent_areas:
             self._broadcast_notification_to_single_agent(
                 child, market_type, event_type, **kwargs)
 
@@ -169,9 +232,32 @@ class AreaDispatcher:
             return
 
         # Broadcast to children in random order to ensure fairness
-        for child in sorted(self.area.children, key=lambda _: random()):
+        if isinstance(event_type, MarketEvent) and gsy_e.constants.MARKET_EVENT_SUBSCRIPTIONS:
+            # Market events only concern the strategies of the children, which subscribe to the
+            # market events they react to
+            self._update_market_event_subscribers()
+            children = self._shuffle_children(
+                self.area.children, self._market_event_subscribers[event_type])
+        else:
+            children = global_objects.fairness_ordering.shuffle(
+                self.area.uuid, self.area.children)
+        for child in children:
             child.dispatcher.event_listener(event_type, **kwargs)
 
+        self.broadcast_notification_to_agents(event_type, **kwargs)
+
+    def broadcast_notification_to_agents(
+            self, event_type: Union[MarketEvent, AreaEvent], **kwargs) -> None:
+        """
+        Broadcast the event to the Inter Area Agents of the children and this dispatcher's area,
+        for all market types that the event concerns.
+        Args:
+            event_type: Type of the event that will be broadcasted
+            **kwargs: Arguments associated with the event
+
+        Returns: None
+
+        """
         market_id = kwargs.get("market_id")
         if not market_id and isinstance(event_type, MarketEvent):
             assert False, "MarketEvent should always provide a market_id."
@@ -86,6 +86,7 @@ class DefaultMarketRotator(BaseRotator):
         for time_slot in market_slots_to_be_cycled:
             market = markets.pop(time_slot)
             market.readonly = True
+            market.compact_order_histories()
             past_markets[time_slot] = market
             log.debug("Moving %s to past.", past_markets[time_slot])
 
@@ -109,6 +110,7 @@ class DefaultMarketRotator(BaseRotator):
             market_buffer[time_slot].redis_api.stop()
         del market_buffer[time_slot].offers
         del market_buffer[time_slot].trades
+        del market_buffer[time_slot].trades_per_participant
         del market_buffer[time_slot].offer_history
         del market_buffer[time_slot].notification_listeners
         del market_buffer[time_slot].bids
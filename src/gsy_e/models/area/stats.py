@@ -64,6 +64,14 @@ class AreaStats:
             "imported_energy": convert_pendulum_to_str_in_dict(self.imported_traded_energy_kwh),
         }
 
+    def get_checkpoint_state(self) -> Dict:
+        """Get the current area state with DateTime keys, for the binary checkpoints."""
+        return {
+            "rate_stats_market": self.rate_stats_market,
+            "exported_energy": self.exported_traded_energy_kwh,
+            "imported_energy": self.imported_traded_energy_kwh,
+        }
+
     def restore_state(self, saved_state: Dict) -> None:
         """Restoration of simulation from its last known state"""
         self.rate_stats_market.update(
@@ -107,7 +115,9 @@ class AreaStats:
         """Extract the cheapest offer from the market"""
         cheapest_offers = []
         for market in self._markets.markets.values():
-            cheapest_offers.extend(market.sorted_offers[0:1])
+            cheapest_offer = market.offers.best_order()
+            if cheapest_offer is not None:
+                cheapest_offers.append(cheapest_offer)
         return cheapest_offers
 
     def _get_current_market_bills(self) -> Dict:
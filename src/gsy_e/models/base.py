@@ -97,6 +97,16 @@ class AreaBehaviorBase:
                 "Strategy does not have a state. "
                 "State is required to support save state functionality.") from ex
 
+    def get_checkpoint_state(self) -> Dict:
+        """Retrieve the current state of the strategy, keeping the time slots as DateTime keys
+        (used for the binary checkpoints of the simulation state)."""
+        try:
+            return self.state.get_checkpoint_state()
+        except AttributeError as ex:
+            raise GSyException(
+                "Strategy does not have a state. "
+                "State is required to support save state functionality.") from ex
+
     def restore_state(self, saved_state: Dict) -> None:
         """Restore the current state object of the strategy from dict format."""
         try:
@@ -21,22 +21,25 @@ from collections import namedtuple
 from functools import wraps
 from logging import getLogger
 from threading import RLock
-from typing import Dict, List, Union, Optional, Callable
+from typing import Dict, List, Union, Optional, Callable, Sequence
 
 from gsy_framework.constants_limits import ConstSettings, GlobalConfig
 from gsy_framework.data_classes import Offer, Trade, Bid
 from gsy_framework.enums import SpotMarketTypeEnum
-from numpy.random import random
 from pendulum import DateTime
 
+import gsy_e.constants
 from gsy_e.constants import FLOATING_POINT_TOLERANCE, DATE_TIME_FORMAT
 from gsy_e.gsy_e_core.device_registry import DeviceRegistry
+from gsy_e.gsy_e_core.global_objects_singleton import global_objects
 from gsy_e.gsy_e_core.util import add_or_create_key, subtract_or_create_key
 from gsy_e.models.market.grid_fees.base_model import GridFees
 from gsy_e.models.market.grid_fees.constant_grid_fees import ConstantGridFees
 from gsy_e.models.market.market_redis_connection import (
     MarketRedisEventSubscriber, MarketRedisEventPublisher,
     TwoSidedMarketRedisEventSubscriber)
+from gsy_e.models.market.order_book import OrderBook
+from gsy_e.models.market.order_history import CompactOrderHistory
 
 log = getLogger(__name__)
 
@@ -51,9 +54,10 @@ def lock_market_action(function):
 
     @wraps(function)
     def wrapper(self, *args, **kwargs):
-        # The market class needs to have an rlock member, that holds the recursive lock
+        # The market class needs to have an rlock member, that holds the recursive lock (or None
+        # if the market is only accessed by the simulation thread)
         lock_object = getattr(self, RLOCK_MEMBER_NAME)
-        if ConstSettings.GeneralSettings.EVENT_DISPATCHING_VIA_REDIS:
+        if lock_object is None or ConstSettings.GeneralSettings.EVENT_DISPATCHING_VIA_REDIS:
             return function(self, *args, **kwargs)
 
         with lock_object:
@@ -61,6 +65,18 @@ def lock_market_action(function):
     return wrapper
 
 
+def create_market_lock() -> Optional[RLock]:
+    """Return the lock for the actions of a new market, None in the single threaded mode."""
+    if gsy_e.constants.SINGLE_THREADED_MARKETS:
+        return None
+    return RLock()
+
+
+def serialize_market_order(order: Union[Offer, Bid]) -> Dict:
+    """Convert an order of the market to a dict."""
+    return order.serializable_dict()
+
+
 class MarketBase:  # pylint: disable=too-many-instance-attributes
     """
     Hold the common energy market models behaviors and states.
@@ -80,11 +96,11 @@ class MarketBase:  # pylint: disable=too-many-instance-attributes
         self.time_slot = time_slot
         self.readonly = readonly
         # offer-id -> Offer
-        self.offers: Dict[str, Offer] = {}
-        self.offer_history: List[Offer] = []
+        self.offers = OrderBook()
+        self.offer_history: Sequence[Offer] = []
         self.notification_listeners: List[Callable] = []
-        self.bids: Dict[str, Bid] = {}
-        self.bid_history: List[Bid] = []
+        self.bids = OrderBook()
+        self.bid_history: Sequence[Bid] = []
         self.trades: List[Trade] = []
         self.const_fee_rate: Optional[float] = None
         self.now: DateTime = time_slot
@@ -98,6 +114,7 @@ class MarketBase:  # pylint: disable=too-many-instance-attributes
         self.max_trade_price = None
         self.accumulated_trade_price = 0
         self.accumulated_trade_energy = 0
+        self._reset_participant_trade_stats()
         if ConstSettings.GeneralSettings.EVENT_DISPATCHING_VIA_REDIS:
             self.redis_publisher = MarketRedisEventPublisher(self.id)
         elif notification_listener:
@@ -109,7 +126,46 @@ class MarketBase:  # pylint: disable=too-many-instance-attributes
                 MarketRedisEventSubscriber(self)
                 if ConstSettings.MASettings.MARKET_TYPE == SpotMarketTypeEnum.ONE_SIDED.value
                 else TwoSidedMarketRedisEventSubscriber(self))
-        setattr(self, RLOCK_MEMBER_NAME, RLock())
+        setattr(self, RLOCK_MEMBER_NAME, create_market_lock())
+
+    def __getstate__(self) -> Dict:
+        # Locks can not be pickled (e.g. for simulation snapshots), a new lock is created when
+        # the market is unpickled (depending on the mode of the restored simulation).
+        state = self.__dict__.copy()
+        state.pop(RLOCK_MEMBER_NAME, None)
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        setattr(self, RLOCK_MEMBER_NAME, create_market_lock())
+
+    @property
+    def offers(self) -> OrderBook:
+        """Return the {offer_id: offer} mapping, sorted by energy rate."""
+        return self._offers
+
+    @offers.setter
+    def offers(self, orders: Dict[str, Offer]) -> None:
+        """Wrap the setter of _offers in order to build an OrderBook object."""
+        self._offers = OrderBook(orders)
+
+    @offers.deleter
+    def offers(self) -> None:
+        del self._offers
+
+    @property
+    def bids(self) -> OrderBook:
+        """Return the {bid_id: bid} mapping, sorted by energy rate."""
+        return self._bids
+
+    @bids.setter
+    def bids(self, orders: Dict[str, Bid]) -> None:
+        """Wrap the setter of _bids in order to build an OrderBook object."""
+        self._bids = OrderBook(orders)
+
+    @bids.deleter
+    def bids(self) -> None:
+        del self._bids
 
     @property
     def time_slot_str(self):
@@ -136,12 +192,30 @@ class MarketBase:  # pylint: disable=too-many-instance-attributes
         """Return True if this market adopts the constant grid fees model."""
         return isinstance(self.fee_class, ConstantGridFees)
 
-    def orders_per_slot(self) -> Dict[str, Dict]:
-        """Return all orders in the market per time slot."""
-        bids = [bid.serializable_dict() for bid in self.bids.values()]
-        offers = [offer.serializable_dict() for offer in self.offers.values()]
+    def orders_per_slot(
+            self, serialize_order: Optional[Callable[[Union[Offer, Bid]], Dict]] = None
+    ) -> Dict[str, Dict]:
+        """Return all orders in the market per time slot.
+
+        Args:
+            serialize_order: Function that converts an order to a dict, defaults to the
+                serializable_dict method of the order
+        """
+        serialize_order = serialize_order or serialize_market_order
+        bids = [serialize_order(bid) for bid in self.bids.values()]
+        offers = [serialize_order(offer) for offer in self.offers.values()]
         return {self.time_slot_str: {"bids": bids, "offers": offers}}
 
+    @lock_market_action
+    def get_offers_by_seller_id(self, seller_id: str) -> List[Offer]:
+        """Return the open offers of the seller with the passed seller_id."""
+        return self.offers.orders_by_owner_id(seller_id)
+
+    @lock_market_action
+    def get_bids_by_buyer_id(self, buyer_id: str) -> List[Bid]:
+        """Return the open bids of the buyer with the passed buyer_id."""
+        return self.bids.orders_by_owner_id(buyer_id)
+
     def add_listener(self, listener: Callable):
         """Append a callable function to the notification_listeners list."""
         self.notification_listeners.append(listener)
@@ -149,11 +223,13 @@ class MarketBase:  # pylint: disable=too-many-instance-attributes
     def _notify_listeners(self, event, **kwargs):
         """Invoke the notification_listeners to dispatch the passed event argument."""
 
+        global_objects.tick_scheduler.notify_market_activity()
         if ConstSettings.GeneralSettings.EVENT_DISPATCHING_VIA_REDIS:
             self.redis_publisher.publish_event(event, **kwargs)
         else:
             # Deliver notifications in random order to ensure fairness
-            for listener in sorted(self.notification_listeners, key=lambda l: random()):
+            for listener in global_objects.fairness_ordering.shuffle(
+                    self.id, self.notification_listeners):
                 listener(event, market_id=self.id, **kwargs)
 
     def _update_stats_after_trade(
@@ -162,6 +238,7 @@ class MarketBase:  # pylint: disable=too-many-instance-attributes
 
         if not already_tracked:
             self.trades.append(trade)
+            self._track_participant_trade(trade)
             self.market_fee += trade.fee_price
         self._update_accumulated_trade_price_energy(trade)
         self.traded_energy = add_or_create_key(
@@ -170,6 +247,27 @@ class MarketBase:  # pylint: disable=too-many-instance-attributes
             self.traded_energy, trade.buyer, order.energy)
         self._update_min_max_avg_trade_prices(order.energy_rate)
 
+    def _reset_participant_trade_stats(self) -> None:
+        """Recalculate the per-participant trade statistics from the trades of the market."""
+        # participant name -> aggregated energy / price of the trades of the participant
+        self._bought_energy: Dict[str, float] = {}
+        self._sold_energy: Dict[str, float] = {}
+        self._spent: Dict[str, float] = {}
+        self._earned: Dict[str, float] = {}
+        # participant name -> trades in which the participant is the seller or the buyer
+        self.trades_per_participant: Dict[str, List[Trade]] = {}
+        for trade in self.trades:
+            self._track_participant_trade(trade)
+
+    def _track_participant_trade(self, trade: Trade) -> None:
+        add_or_create_key(self._bought_energy, trade.buyer, trade.traded_energy)
+        add_or_create_key(self._sold_energy, trade.seller, trade.traded_energy)
+        add_or_create_key(self._spent, trade.buyer, trade.trade_price)
+        add_or_create_key(self._earned, trade.seller, trade.trade_price)
+        self.trades_per_participant.setdefault(trade.seller, []).append(trade)
+        if trade.buyer != trade.seller:
+            self.trades_per_participant.setdefault(trade.buyer, []).append(trade)
+
     def _update_accumulated_trade_price_energy(self, trade: Trade):
         self.accumulated_trade_price += trade.trade_price
         self.accumulated_trade_energy += trade.traded_energy
@@ -192,6 +290,8 @@ class MarketBase:  # pylint: disable=too-many-instance-attributes
     @staticmethod
     def sorting(offers_bids: Dict, reverse_order=False) -> List[Union[Bid, Offer]]:
         """Sort a list of bids or offers by their energy_rate attribute."""
+        if isinstance(offers_bids, OrderBook):
+            return list(offers_bids.sorted_orders(reverse=reverse_order))
         if reverse_order:
             # Sorted bids in descending order
             return list(reversed(sorted(
@@ -220,10 +320,7 @@ class MarketBase:  # pylint: disable=too-many-instance-attributes
     @property
     def most_affordable_offers(self):
         """Return the offers with the least energy_rate value."""
-        cheapest_offer = self.sorted_offers[0]
-        rate = cheapest_offer.energy_rate
-        return [o for o in self.sorted_offers if
-                abs(o.energy_rate - rate) < FLOATING_POINT_TOLERANCE]
+        return self.offers.orders_at_best_rate(FLOATING_POINT_TOLERANCE)
 
     def update_clock(self, now: DateTime) -> None:
         """
@@ -239,22 +336,38 @@ class MarketBase:  # pylint: disable=too-many-instance-attributes
     def bought_energy(self, buyer: str) -> float:
         """Return the aggregated bought energy value by the passed-in buyer."""
 
-        return sum(trade.traded_energy for trade in self.trades if trade.buyer == buyer)
+        return self._bought_energy.get(buyer, 0)
 
     def sold_energy(self, seller: str) -> float:
         """Return the aggregated sold energy value by the passed-in seller."""
 
-        return sum(trade.traded_energy for trade in self.trades if trade.seller == seller)
+        return self._sold_energy.get(seller, 0)
 
     def total_spent(self, buyer: str) -> float:
         """Return the aggregated money spent by the passed-in buyer."""
 
-        return sum(trade.trade_price for trade in self.trades if trade.buyer == buyer)
+        return self._spent.get(buyer, 0)
 
     def total_earned(self, seller: str) -> float:
         """Return the aggregated money earned by the passed-in seller."""
 
-        return sum(trade.trade_price for trade in self.trades if trade.seller == seller)
+        return self._earned.get(seller, 0)
+
+    def compact_order_histories(self) -> None:
+        """Replace the offer and bid histories by compact, read-only copies.
+
+        Should only be called once no orders can be added to the market anymore (e.g. when the
+        market is moved to the past markets).
+        """
+        if not isinstance(self.offer_history, CompactOrderHistory):
+            self.offer_history = CompactOrderHistory(self.offer_history)
+        if not isinstance(self.bid_history, CompactOrderHistory):
+            self.bid_history = CompactOrderHistory(self.bid_history)
+
+    def get_trades_by_participant(self, participant: str) -> List[Trade]:
+        """Return the trades in which the passed-in participant is the seller or the buyer."""
+
+        return self.trades_per_participant.get(participant, [])
 
     @property
     def info(self) -> Dict:
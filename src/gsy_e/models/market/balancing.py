@@ -53,7 +53,7 @@ class BalancingMarket(OneSidedMarket):
         super().__init__(time_slot, bc, notification_listener, readonly, grid_fee_type,
                          grid_fees, name, in_sim_duration=in_sim_duration)
 
-    def offer(  # pylint: disable=too-many-arguments
+    def _offer(  # pylint: disable=too-many-arguments
             self, price: float, energy: float, seller: str, seller_origin: str,
             offer_id: Optional[str] = None,
             original_price: Optional[float] = None,
@@ -16,19 +16,20 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 # pylint: disable=too-many-arguments, too-many-locals, no-member
-from collections import UserDict
+from collections import UserList
 from copy import deepcopy
 from logging import getLogger
-from typing import Dict, List, Optional, TYPE_CHECKING
+from typing import Callable, Dict, List, Optional, TYPE_CHECKING, Union
 
 from gsy_framework.constants_limits import ConstSettings, GlobalConfig, DATE_TIME_FORMAT
-from gsy_framework.data_classes import Bid, Offer
+from gsy_framework.data_classes import Bid, Offer, Trade
 from gsy_framework.utils import is_time_slot_in_simulation_duration
 from pendulum import DateTime, duration
 
 from gsy_e.gsy_e_core.blockchain_interface import NonBlockchainInterface
 from gsy_e.models.market import GridFee
-from gsy_e.models.market import lock_market_action
+from gsy_e.models.market import serialize_market_order
+from gsy_e.models.market.order_book import OrderBook
 from gsy_e.models.market.two_sided import TwoSidedMarket
 
 if TYPE_CHECKING:
@@ -42,14 +43,14 @@ class FutureMarketException(Exception):
     """Exception specific to the Future markets."""
 
 
-class FutureOrders(UserDict):
+class FutureOrders(OrderBook):
     """Special mapping object to keep track of a future market's orders."""
     def __init__(self, *args, **kwargs):
         self.slot_order_mapping = {}
         super().__init__(*args, **kwargs)
 
     def __setitem__(self, order_id, order):
-        self.data[order_id] = order
+        super().__setitem__(order_id, order)
         if order.time_slot not in self.slot_order_mapping:
             self.slot_order_mapping[order.time_slot] = []
         self.slot_order_mapping[order.time_slot].append(order)
@@ -58,7 +59,34 @@ class FutureOrders(UserDict):
         order = self.data.get(order_id, None)
         if order:
             self.slot_order_mapping[order.time_slot].remove(order)
-        del self.data[order_id]
+        super().__delitem__(order_id)
+
+    def clear(self):
+        super().clear()
+        for orders in self.slot_order_mapping.values():
+            orders.clear()
+
+
+class FutureTrades(UserList):
+    """Special list object to keep track of a future market's trades per time slot."""
+    def __init__(self, initlist=None):
+        self.slot_trade_mapping = {}
+        super().__init__()
+        self.extend(initlist or [])
+
+    def append(self, trade: Trade) -> None:
+        self.data.append(trade)
+        if trade.time_slot not in self.slot_trade_mapping:
+            self.slot_trade_mapping[trade.time_slot] = []
+        self.slot_trade_mapping[trade.time_slot].append(trade)
+
+    def extend(self, other) -> None:
+        for trade in other:
+            self.append(trade)
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
 
 
 class FutureMarkets(TwoSidedMarket):
@@ -97,6 +125,16 @@ class FutureMarkets(TwoSidedMarket):
         """Wrap the setter of _orders in order to build a FutureOrders object."""
         self._bids = FutureOrders(orders)
 
+    @property
+    def trades(self) -> FutureTrades:
+        """Return the list of trades."""
+        return self._trades
+
+    @trades.setter
+    def trades(self, trades) -> None:
+        """Wrap the setter of _trades in order to build a FutureTrades object."""
+        self._trades = FutureTrades(trades)
+
     @property
     def slot_bid_mapping(self):
         """Return the {time_slot: [bids_list]} mapping."""
@@ -110,10 +148,9 @@ class FutureMarkets(TwoSidedMarket):
     @property
     def slot_trade_mapping(self) -> Dict:
         """Return the {time_slot: [trades_list]} mapping."""
-        mapping = {time_slot: [] for time_slot in self.slot_bid_mapping.keys()}
-        for trade in self.trades:
-            mapping[trade.time_slot].append(trade)
-        return mapping
+        trades_mapping = self.trades.slot_trade_mapping
+        return {time_slot: trades_mapping.get(time_slot, [])
+                for time_slot in self.slot_bid_mapping.keys()}
 
     def __repr__(self):  # pragma: no cover
         return (f"<{self._class_name} bids:{self.slot_bid_mapping}"
@@ -128,20 +165,23 @@ class FutureMarkets(TwoSidedMarket):
         """Return list of all time slots of future markets."""
         return list(self.slot_bid_mapping.keys())
 
-    def orders_per_slot(self) -> Dict[str, Dict]:
+    def orders_per_slot(
+            self, serialize_order: Optional[Callable[[Union[Offer, Bid]], Dict]] = None
+    ) -> Dict[str, Dict]:
         """Return all orders in the market per time slot."""
+        serialize_order = serialize_order or serialize_market_order
         orders_dict = {}
         for time_slot, bids_list in self.slot_bid_mapping.items():
             time_slot = time_slot.format(DATE_TIME_FORMAT)
             if time_slot not in orders_dict:
                 orders_dict[time_slot] = {"bids": [], "offers": []}
-            orders_dict[time_slot]["bids"].extend([bid.serializable_dict() for bid in bids_list])
+            orders_dict[time_slot]["bids"].extend([serialize_order(bid) for bid in bids_list])
         for time_slot, offers_list in self.slot_offer_mapping.items():
             time_slot = time_slot.format(DATE_TIME_FORMAT)
             if time_slot not in orders_dict:
                 orders_dict[time_slot] = {"bids": [], "offers": []}
             orders_dict[time_slot]["offers"].extend(
-                [offer.serializable_dict() for offer in offers_list])
+                [serialize_order(offer) for offer in offers_list])
         return orders_dict
 
     @staticmethod
@@ -173,6 +213,7 @@ class FutureMarkets(TwoSidedMarket):
             self.bid_history, current_market_time_slot)
         self.trades = self._remove_old_orders_from_list(
             self.trades, current_market_time_slot)
+        self._reset_participant_trade_stats()
 
     def create_future_markets(self, current_market_time_slot: DateTime,
                               slot_length: duration,
@@ -190,48 +231,46 @@ class FutureMarkets(TwoSidedMarket):
                 self.offers.slot_order_mapping[future_time_slot] = []
             future_time_slot = future_time_slot.add(minutes=slot_length.total_minutes())
 
-    @lock_market_action
-    def bid(self, price: float, energy: float, buyer: str, buyer_origin: str,
-            bid_id: Optional[str] = None,
-            original_price: Optional[float] = None,
-            adapt_price_with_fees: bool = True,
-            add_to_history: bool = True,
-            buyer_origin_id: Optional[str] = None,
-            buyer_id: Optional[str] = None,
-            attributes: Optional[Dict] = None,
-            requirements: Optional[List[Dict]] = None,
-            time_slot: Optional[DateTime] = None) -> Bid:
+    def _bid(self, price: float, energy: float, buyer: str, buyer_origin: str,
+             bid_id: Optional[str] = None,
+             original_price: Optional[float] = None,
+             adapt_price_with_fees: bool = True,
+             add_to_history: bool = True,
+             buyer_origin_id: Optional[str] = None,
+             buyer_id: Optional[str] = None,
+             attributes: Optional[Dict] = None,
+             requirements: Optional[List[Dict]] = None,
+             time_slot: Optional[DateTime] = None) -> Bid:
         """Call superclass bid and buffer returned bid object."""
         if not time_slot:
             raise FutureMarketException("time_slot parameter was not provided for bid "
                                         "method in future markets.")
-        bid = super().bid(price=price, energy=energy, buyer=buyer, buyer_origin=buyer_origin,
-                          bid_id=bid_id, original_price=original_price,
-                          add_to_history=add_to_history,
-                          adapt_price_with_fees=adapt_price_with_fees,
-                          buyer_origin_id=buyer_origin_id, buyer_id=buyer_id,
-                          attributes=attributes, requirements=requirements, time_slot=time_slot)
+        bid = super()._bid(price=price, energy=energy, buyer=buyer, buyer_origin=buyer_origin,
+                           bid_id=bid_id, original_price=original_price,
+                           add_to_history=add_to_history,
+                           adapt_price_with_fees=adapt_price_with_fees,
+                           buyer_origin_id=buyer_origin_id, buyer_id=buyer_id,
+                           attributes=attributes, requirements=requirements, time_slot=time_slot)
         return bid
 
-    @lock_market_action
-    def offer(self, price: float, energy: float, seller: str, seller_origin: str,
-              offer_id: Optional[str] = None,
-              original_price: Optional[float] = None,
-              dispatch_event: bool = True,
-              adapt_price_with_fees: bool = True,
-              add_to_history: bool = True,
-              seller_origin_id: Optional[str] = None,
-              seller_id: Optional[str] = None,
-              attributes: Optional[Dict] = None,
-              requirements: Optional[List[Dict]] = None,
-              time_slot: Optional[DateTime] = None) -> Offer:
+    def _offer(self, price: float, energy: float, seller: str, seller_origin: str,
+               offer_id: Optional[str] = None,
+               original_price: Optional[float] = None,
+               dispatch_event: bool = True,
+               adapt_price_with_fees: bool = True,
+               add_to_history: bool = True,
+               seller_origin_id: Optional[str] = None,
+               seller_id: Optional[str] = None,
+               attributes: Optional[Dict] = None,
+               requirements: Optional[List[Dict]] = None,
+               time_slot: Optional[DateTime] = None) -> Offer:
         """Call superclass offer and buffer returned offer object."""
         if not time_slot:
             raise FutureMarketException("time_slot parameter was not provided for offer "
                                         "method in future markets.")
-        offer = super().offer(price, energy, seller, seller_origin, offer_id, original_price,
-                              dispatch_event, adapt_price_with_fees, add_to_history,
-                              seller_origin_id, seller_id, attributes, requirements, time_slot)
+        offer = super()._offer(price, energy, seller, seller_origin, offer_id, original_price,
+                               dispatch_event, adapt_price_with_fees, add_to_history,
+                               seller_origin_id, seller_id, attributes, requirements, time_slot)
         return offer
 
     @property
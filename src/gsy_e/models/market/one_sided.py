@@ -15,10 +15,9 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
-from copy import deepcopy
 from logging import getLogger
 from math import isclose
-from typing import Union, Dict, List, Optional, Callable, Tuple
+from typing import Union, Dict, List, Mapping, Optional, Callable, Tuple
 
 from gsy_framework.constants_limits import ConstSettings
 from gsy_framework.data_classes import Offer, Trade, TradeBidOfferInfo
@@ -27,6 +26,7 @@ from pendulum import DateTime
 
 from gsy_e.gsy_e_core.exceptions import (
     InvalidOffer, MarketReadOnlyException, OfferNotFoundException, InvalidTrade, MarketException)
+from gsy_e.gsy_e_core.global_objects_singleton import global_objects
 from gsy_e.gsy_e_core.util import short_offer_bid_log_str
 from gsy_e.events.event_structures import MarketEvent
 from gsy_e.models.market import MarketBase, lock_market_action, GridFee
@@ -81,19 +81,20 @@ class OneSidedMarket(MarketBase):
             price / energy, original_price / energy) * energy
 
     @lock_market_action
-    def get_offers(self) -> Dict:
+    def get_offers(self) -> Mapping[str, Offer]:
         """
-        Retrieves a copy of all open offers of the market. The copy of the offers guarantees
-        that the return dict will remain unaffected from any mutations of the market offer list
-        that might happen concurrently (more specifically can be used in for loops without raising
-        the 'dict changed size during iteration' exception)
-        Returns: dict with open offers, offer id as keys, and Offer objects as values
+        Retrieves a read-only snapshot of all open offers of the market. The snapshot guarantees
+        that the returned mapping will remain unaffected from any mutations of the market offer
+        list that might happen concurrently (more specifically can be used in for loops without
+        raising the 'dict changed size during iteration' exception). The Offer objects
+        are not copied, and the snapshot is shared between callers until the offers change.
+        Returns: mapping with open offers, offer id as keys, and Offer objects as values
 
         """
-        return deepcopy(self.offers)
+        return self.offers.snapshot()
 
     @lock_market_action
-    def offer(  # pylint: disable=too-many-arguments, too-many-locals
+    def offer(  # pylint: disable=too-many-arguments
             self, price: float, energy: float, seller: str, seller_origin: str,
             offer_id: Optional[str] = None,
             original_price: Optional[float] = None,
@@ -106,6 +107,23 @@ class OneSidedMarket(MarketBase):
             requirements: Optional[List[Dict]] = None,
             time_slot: Optional[DateTime] = None) -> Offer:
         """Post offer inside the market."""
+        return self._offer(price, energy, seller, seller_origin, offer_id, original_price,
+                           dispatch_event, adapt_price_with_fees, add_to_history,
+                           seller_origin_id, seller_id, attributes, requirements, time_slot)
+
+    def _offer(  # pylint: disable=too-many-arguments, too-many-locals
+            self, price: float, energy: float, seller: str, seller_origin: str,
+            offer_id: Optional[str] = None,
+            original_price: Optional[float] = None,
+            dispatch_event: bool = True,
+            adapt_price_with_fees: bool = True,
+            add_to_history: bool = True,
+            seller_origin_id: Optional[str] = None,
+            seller_id: Optional[str] = None,
+            attributes: Optional[Dict] = None,
+            requirements: Optional[List[Dict]] = None,
+            time_slot: Optional[DateTime] = None) -> Offer:
+        """Post offer inside the market, the caller has to hold the market lock."""
 
         if self.readonly:
             raise MarketReadOnlyException()
@@ -133,6 +151,7 @@ class OneSidedMarket(MarketBase):
         self.offers[offer.id] = offer
         if add_to_history is True:
             self.offer_history.append(offer)
+        global_objects.tick_scheduler.notify_market_activity()
 
         log.debug("%s[OFFER][NEW][%s][%s] %s",
                   self._debug_log_market_type_identifier, self.name, self.time_slot_str, offer)
@@ -145,6 +164,34 @@ class OneSidedMarket(MarketBase):
 
         self._notify_listeners(MarketEvent.OFFER, offer=offer)
 
+    @lock_market_action
+    def offers_bulk(self, offers_kwargs: List[Dict],
+                    dispatch_event: bool = True) -> List[Optional[Offer]]:
+        """
+        Post multiple offers inside the market while holding the market lock once.
+        Args:
+            offers_kwargs: Keyword arguments of the offer method for each of the offers
+            dispatch_event: Dispatch one OFFERS_BULK event for all posted offers
+
+        Returns: the posted offers, None for the offers that were rejected by the market because
+            of their price (MarketException), in the order of offers_kwargs
+        """
+        offers = []
+        for kwargs in offers_kwargs:
+            try:
+                offers.append(self._offer(**kwargs, dispatch_event=False))
+            except MarketException:
+                offers.append(None)
+        if dispatch_event is True:
+            self.dispatch_market_offers_event([offer for offer in offers if offer is not None])
+        return offers
+
+    def dispatch_market_offers_event(self, offers: List[Offer]) -> None:
+        """Dispatch one OFFERS_BULK event for all offers to the listeners."""
+
+        if offers:
+            self._notify_listeners(MarketEvent.OFFERS_BULK, offers=offers)
+
     @lock_market_action
     def delete_offer(self, offer_or_id: Union[str, Offer]) -> None:
         """Delete the offer from cache and notify listeners."""
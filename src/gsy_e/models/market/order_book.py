@@ -0,0 +1,237 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from abc import ABC, abstractmethod
+from collections import UserDict
+from itertools import groupby
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+from gsy_framework.data_classes import Bid, Offer
+from sortedcontainers import SortedList
+
+Order = Union[Offer, Bid]
+
+
+class OrderBook(UserDict):
+    """
+    Mapping of order ids to orders (offers or bids) of a market that additionally keeps the
+    orders sorted by their energy rate.
+
+    The price index is updated on every insertion and deletion (O(log n)), so the cheapest
+    offers / most expensive bids can be read without sorting all orders of the market. Orders
+    with the same energy rate keep the insertion order of the mapping, which is the same order
+    that sorting the values of a plain dict with a stable sort produces.
+    The energy rate (and owner / origin ids) of an order are read once when the order is added to
+    the book; orders whose price changes have to be added again in order to be re-indexed.
+
+    Readers that need a view of the orders that is not affected by later changes of the book use
+    snapshot(); the snapshot is shared by all readers until the book is modified.
+
+    The orders are also indexed by the id of their owner (seller_id of offers, buyer_id of bids)
+    and by the id of their origin (seller_origin_id / buyer_origin_id).
+
+    Listeners (see OrderBookListener) are notified about every added, replaced or removed order,
+    so that they can keep copies of the book up to date without reading the whole book.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._price_index = SortedList()
+        # order_id -> ((energy_rate, sequence_number, order_id), owner_id, origin_id), the keys
+        # under which the order has been indexed
+        self._index_entries = {}
+        self._sequence_number = 0
+        self._snapshot_data: Optional[Dict[str, Order]] = None
+        # owner_id / origin_id -> {order_id: order}
+        self._owner_index: Dict[Optional[str], Dict[str, Order]] = {}
+        self._origin_index: Dict[Optional[str], Dict[str, Order]] = {}
+        self._listeners: List["OrderBookListener"] = []
+        super().__init__(*args, **kwargs)
+
+    def add_listener(self, listener: "OrderBookListener") -> None:
+        """Notify the listener about all following changes of the order book."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: "OrderBookListener") -> None:
+        """Stop notifying the listener about changes of the order book."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    @staticmethod
+    def _get_owner_and_origin_ids(order: Order) -> Tuple[Optional[str], Optional[str]]:
+        if isinstance(order, Bid):
+            return order.buyer_id, order.buyer_origin_id
+        return order.seller_id, order.seller_origin_id
+
+    @staticmethod
+    def _remove_from_index(index: Dict, key: Optional[str], order_id: str) -> None:
+        orders = index[key]
+        del orders[order_id]
+        if not orders:
+            del index[key]
+
+    def __setitem__(self, order_id: str, order: Order) -> None:
+        owner_id, origin_id = self._get_owner_and_origin_ids(order)
+        index_entries = self._index_entries.get(order_id)
+        if index_entries is not None:
+            # Replacing an order keeps its position among orders with the same rate.
+            price_entry, old_owner_id, old_origin_id = index_entries
+            self._price_index.remove(price_entry)
+            if old_owner_id != owner_id:
+                self._remove_from_index(self._owner_index, old_owner_id, order_id)
+            if old_origin_id != origin_id:
+                self._remove_from_index(self._origin_index, old_origin_id, order_id)
+            sequence_number = price_entry[1]
+        else:
+            sequence_number = self._sequence_number
+            self._sequence_number += 1
+        price_entry = (order.energy_rate, sequence_number, order_id)
+        self._price_index.add(price_entry)
+        self._index_entries[order_id] = (price_entry, owner_id, origin_id)
+        self.data[order_id] = order
+        self._owner_index.setdefault(owner_id, {})[order_id] = order
+        self._origin_index.setdefault(origin_id, {})[order_id] = order
+        self._snapshot_data = None
+        for listener in self._listeners:
+            listener.order_added(order_id, order)
+
+    def __delitem__(self, order_id: str) -> None:
+        del self.data[order_id]
+        price_entry, owner_id, origin_id = self._index_entries.pop(order_id)
+        self._price_index.remove(price_entry)
+        self._remove_from_index(self._owner_index, owner_id, order_id)
+        self._remove_from_index(self._origin_index, origin_id, order_id)
+        self._snapshot_data = None
+        for listener in self._listeners:
+            listener.order_removed(order_id)
+
+    def pop(self, order_id: str, *default) -> Optional[Order]:
+        if order_id not in self.data:
+            if default:
+                return default[0]
+            raise KeyError(order_id)
+        order = self.data[order_id]
+        del self[order_id]
+        return order
+
+    def get(self, order_id: str, default=None) -> Optional[Order]:
+        return self.data.get(order_id, default)
+
+    def keys(self):
+        return self.data.keys()
+
+    def values(self):
+        return self.data.values()
+
+    def items(self):
+        return self.data.items()
+
+    def clear(self) -> None:
+        self.data.clear()
+        self._price_index.clear()
+        self._index_entries.clear()
+        self._owner_index.clear()
+        self._origin_index.clear()
+        self._snapshot_data = None
+        for listener in self._listeners:
+            listener.orders_cleared()
+
+    def copy(self) -> "OrderBook":
+        # The copy starts without listeners, they only follow the changes of this book.
+        return self.__class__(self.data)
+
+    __copy__ = copy
+
+    def snapshot(self) -> Mapping[str, Order]:
+        """
+        Return a read-only {order_id: order} view of the current orders of the book.
+        The view does not change when orders are added to or removed from the book afterwards
+        (the order objects themselves are not copied).
+        """
+        if self._snapshot_data is None:
+            self._snapshot_data = self.data.copy()
+        return MappingProxyType(self._snapshot_data)
+
+    def insertion_position(self, order_id: str) -> int:
+        """
+        Return a number that orders the orders of the book in the order in which they were
+        added to the book (the iteration order of the mapping).
+        """
+        return self._index_entries[order_id][0][1]
+
+    def orders_by_owner_id(self, owner_id: Optional[str]) -> List[Order]:
+        """Return the orders of the seller (offers) / buyer (bids) with the given id."""
+        return list(self._owner_index.get(owner_id, {}).values())
+
+    def first_order_by_origin_id(self, origin_id: Optional[str]) -> Optional[Order]:
+        """Return the first order that has been added to the book by the given origin id."""
+        orders = self._origin_index.get(origin_id)
+        return next(iter(orders.values())) if orders else None
+
+    def sorted_orders(self, reverse: bool = False) -> Iterator[Order]:
+        """Iterate over the orders in ascending (descending if reverse) order of energy rate."""
+        index = reversed(self._price_index) if reverse else self._price_index
+        data = self.data
+        return (data[index_entry[2]] for index_entry in index)
+
+    def best_order(self, reverse: bool = False) -> Optional[Order]:
+        """Return the order with the lowest (highest if reverse) energy rate."""
+        if not self._price_index:
+            return None
+        return self.data[self._price_index[-1 if reverse else 0][2]]
+
+    def best_energy_rate(self, reverse: bool = False) -> Optional[float]:
+        """Return the lowest (highest if reverse) energy rate of the orders."""
+        if not self._price_index:
+            return None
+        return self._price_index[-1 if reverse else 0][0]
+
+    def orders_at_best_rate(self, tolerance: float, reverse: bool = False) -> List[Order]:
+        """Return the orders whose energy rate is within tolerance of the best energy rate."""
+        best_rate = self.best_energy_rate(reverse)
+        if best_rate is None:
+            return []
+        orders = []
+        index = reversed(self._price_index) if reverse else self._price_index
+        for energy_rate, _, order_id in index:
+            if abs(energy_rate - best_rate) >= tolerance:
+                break
+            orders.append(self.data[order_id])
+        return orders
+
+    def price_levels(self, reverse: bool = False) -> Iterator[Tuple[float, List[Order]]]:
+        """Iterate over the (energy_rate, orders) price levels of the order book."""
+        index = reversed(self._price_index) if reverse else self._price_index
+        for energy_rate, index_entries in groupby(index, key=lambda entry: entry[0]):
+            yield energy_rate, [self.data[index_entry[2]] for index_entry in index_entries]
+
+
+class OrderBookListener(ABC):
+    """Interface for objects that follow the changes (deltas) of order books."""
+
+    @abstractmethod
+    def order_added(self, order_id: str, order: Order) -> None:
+        """Handle an order that has been added to (or replaced in) the order book."""
+
+    @abstractmethod
+    def order_removed(self, order_id: str) -> None:
+        """Handle an order that has been removed from the order book."""
+
+    @abstractmethod
+    def orders_cleared(self) -> None:
+        """Handle the removal of all orders of the order book."""
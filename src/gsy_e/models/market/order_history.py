@@ -0,0 +1,97 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+from gsy_framework.data_classes import Bid, Offer
+
+Order = Union[Offer, Bid]
+
+
+class CompactOrderHistory(Sequence):
+    """
+    Read-only, columnar copy of the order history (offer_history / bid_history) of a market.
+
+    The attributes of the orders are stored per attribute (one column per attribute name and order
+    class) instead of one object (with its own attribute dict) per order. Strings (e.g. the names
+    of sellers and buyers) are interned and float-only columns are stored as arrays of doubles.
+    Reading the history creates new order objects with the same attributes, so that the history
+    can still be read like a list of orders (e.g. by the export and the stats); these objects are
+    not the orders that were posted to the market and changing them does not change the history.
+    """
+
+    __slots__ = ("_schemas", "_columns", "_row_schemas", "_row_positions")
+
+    def __init__(self, orders: Iterable[Order] = ()):
+        # (order class, attribute names) for every order layout that is part of the history
+        self._schemas: List[Tuple[type, Tuple[str, ...]]] = []
+        # columns of the attribute values per schema
+        self._columns: List[List[Union[List[Any], array]]] = []
+        self._row_schemas = array("H")
+        self._row_positions = array("L")
+
+        schema_indices: Dict[Tuple[type, Tuple[str, ...]], int] = {}
+        row_counts: List[int] = []
+        for order in orders:
+            attributes = vars(order)
+            schema = (type(order), tuple(attributes))
+            schema_index = schema_indices.get(schema)
+            if schema_index is None:
+                schema_index = schema_indices[schema] = len(self._schemas)
+                self._schemas.append(schema)
+                self._columns.append([[] for _ in attributes])
+                row_counts.append(0)
+            for column, value in zip(self._columns[schema_index], attributes.values()):
+                column.append(sys.intern(value) if type(value) is str else value)
+            self._row_schemas.append(schema_index)
+            self._row_positions.append(row_counts[schema_index])
+            row_counts[schema_index] += 1
+
+        for columns in self._columns:
+            for column_index, column in enumerate(columns):
+                if all(type(value) is float for value in column):
+                    columns[column_index] = array("d", column)
+
+    def _create_order(self, schema_index: int, position: int) -> Order:
+        order_class, attribute_names = self._schemas[schema_index]
+        order = order_class.__new__(order_class)
+        order.__dict__.update(zip(attribute_names,
+                                  (column[position] for column in self._columns[schema_index])))
+        return order
+
+    def __len__(self) -> int:
+        return len(self._row_schemas)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Order, List[Order]]:
+        if isinstance(index, slice):
+            return [self[row] for row in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("order history index out of range")
+        return self._create_order(self._row_schemas[index], self._row_positions[index])
+
+    def __iter__(self) -> Iterator[Order]:
+        for schema_index, position in zip(self._row_schemas, self._row_positions):
+            yield self._create_order(schema_index, position)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)})"
@@ -16,10 +16,9 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 import uuid
-from copy import deepcopy
 from logging import getLogger
 from math import isclose
-from typing import Dict, List, Union, Tuple, Optional
+from typing import Dict, List, Mapping, Union, Tuple, Optional
 
 from gsy_framework.constants_limits import ConstSettings
 from gsy_framework.data_classes import Bid, Offer, Trade, TradeBidOfferInfo, BidOfferMatch
@@ -30,6 +29,7 @@ from pendulum import DateTime
 from gsy_e.constants import FLOATING_POINT_TOLERANCE
 from gsy_e.gsy_e_core.exceptions import (
     BidNotFoundException, InvalidBid, InvalidBidOfferPairException, InvalidTrade, MarketException)
+from gsy_e.gsy_e_core.global_objects_singleton import global_objects
 from gsy_e.gsy_e_core.util import short_offer_bid_log_str, is_external_matching_enabled
 from gsy_e.events.event_structures import MarketEvent
 from gsy_e.models.market import lock_market_action
@@ -68,16 +68,17 @@ class TwoSidedMarket(OneSidedMarket):
                 f", V: {self.accumulated_trade_price})>")
 
     @lock_market_action
-    def get_bids(self) -> Dict:
+    def get_bids(self) -> Mapping[str, Bid]:
         """
-        Retrieves a copy of all open bids of the market. The copy of the bids guarantees
-        that the return dict will remain unaffected from any mutations of the market bid list
-        that might happen concurrently (more specifically can be used in for loops without raising
-        the 'dict changed size during iteration' exception)
-        Returns: dict with open bids, bid id as keys, and Bid objects as values
+        Retrieves a read-only snapshot of all open bids of the market. The snapshot guarantees
+        that the returned mapping will remain unaffected from any mutations of the market bid
+        list that might happen concurrently (more specifically can be used in for loops without
+        raising the 'dict changed size during iteration' exception). The Bid objects
+        are not copied, and the snapshot is shared between callers until the bids change.
+        Returns: mapping with open bids, bid id as keys, and Bid objects as values
 
         """
-        return deepcopy(self.bids)
+        return self.bids.snapshot()
 
     def _update_requirements_prices(self, bid):
         requirements = []
@@ -104,6 +105,25 @@ class TwoSidedMarket(OneSidedMarket):
             attributes: Optional[Dict] = None,
             requirements: Optional[List[Dict]] = None,
             time_slot: Optional[DateTime] = None) -> Bid:
+        """Post bid inside the market."""
+        return self._bid(price=price, energy=energy, buyer=buyer, buyer_origin=buyer_origin,
+                         bid_id=bid_id, original_price=original_price,
+                         adapt_price_with_fees=adapt_price_with_fees,
+                         add_to_history=add_to_history, buyer_origin_id=buyer_origin_id,
+                         buyer_id=buyer_id, attributes=attributes, requirements=requirements,
+                         time_slot=time_slot)
+
+    def _bid(self, price: float, energy: float, buyer: str, buyer_origin: str,
+             bid_id: Optional[str] = None,
+             original_price: Optional[float] = None,
+             adapt_price_with_fees: bool = True,
+             add_to_history: bool = True,
+             buyer_origin_id: Optional[str] = None,
+             buyer_id: Optional[str] = None,
+             attributes: Optional[Dict] = None,
+             requirements: Optional[List[Dict]] = None,
+             time_slot: Optional[DateTime] = None) -> Bid:
+        """Post bid inside the market, the caller has to hold the market lock."""
         if energy <= 0:
             raise InvalidBid()
 
@@ -129,10 +149,30 @@ class TwoSidedMarket(OneSidedMarket):
         self.bids[bid.id] = bid
         if add_to_history is True:
             self.bid_history.append(bid)
+        global_objects.tick_scheduler.notify_market_activity()
         log.debug("%s[BID][NEW][%s] %s", self._debug_log_market_type_identifier,
                   self.time_slot_str, bid)
         return bid
 
+    @lock_market_action
+    def bids_bulk(self, bids_kwargs: List[Dict]) -> List[Optional[Bid]]:
+        """
+        Post multiple bids inside the market while holding the market lock once. The market does
+        not dispatch events for new bids, hence there is no bulk event either.
+        Args:
+            bids_kwargs: Keyword arguments of the bid method for each of the bids
+
+        Returns: the posted bids, None for the bids that were rejected by the market because of
+            their price (MarketException), in the order of bids_kwargs
+        """
+        bids = []
+        for kwargs in bids_kwargs:
+            try:
+                bids.append(self._bid(**kwargs))
+            except MarketException:
+                bids.append(None)
+        return bids
+
     @lock_market_action
     def delete_bid(self, bid_or_id: Union[str, Bid]):
         if isinstance(bid_or_id, Bid):
@@ -299,22 +339,23 @@ class TwoSidedMarket(OneSidedMarket):
 
     def _get_offer_from_seller_origin_id(self, seller_origin_id):
         """Get the first offer that has the same seller_origin_id."""
-        return next(iter(
-            [offer for offer in self.offers.values()
-             if offer.seller_origin_id == seller_origin_id]), None)
+        return self.offers.first_order_by_origin_id(seller_origin_id)
 
     def _get_bid_from_buyer_origin_id(self, buyer_origin_id):
-        return next(iter(
-            [bid for bid in self.bids.values()
-             if bid.buyer_origin_id == buyer_origin_id]), None)
+        return self.bids.first_order_by_origin_id(buyer_origin_id)
 
     def match_recommendations(
             self, recommendations: List[BidOfferMatch.serializable_dict]) -> bool:
         """Match a list of bid/offer pairs, create trades and residual offers/bids.
         Returns True if trades were actually performed, False otherwise."""
         were_trades_performed = False
-        while recommendations:
-            recommended_pair = BidOfferMatch.from_dict(recommendations.pop(0))
+        # order id -> serialized residual order that replaced the order after a partial trade
+        residual_offers: Dict[str, Dict] = {}
+        residual_bids: Dict[str, Dict] = {}
+        for recommendation in recommendations:
+            recommended_pair = BidOfferMatch.from_dict(
+                self._replace_offers_bids_with_residuals(
+                    recommendation, residual_offers, residual_bids))
             market_offer = self.offers.get(recommended_pair.offer["id"])
             market_bid = self.bids.get(recommended_pair.bid["id"])
 
@@ -362,10 +403,11 @@ class TwoSidedMarket(OneSidedMarket):
                 trade_bid_info, min(recommended_pair.selected_energy,
                                     market_offer.energy, market_bid.energy))
             were_trades_performed = True
-            recommendations = (
-                self._replace_offers_bids_with_residual_in_recommendations_list(
-                    recommendations, offer_trade, bid_trade)
-            )
+            if offer_trade.residual is not None:
+                residual_offers[offer_trade.offer_bid.id] = (
+                    offer_trade.residual.serializable_dict())
+            if bid_trade.residual is not None:
+                residual_bids[bid_trade.offer_bid.id] = bid_trade.residual.serializable_dict()
         return were_trades_performed
 
     @staticmethod
@@ -426,30 +468,26 @@ class TwoSidedMarket(OneSidedMarket):
 
         self._validate_requirements_satisfied(recommendation)
 
-    @classmethod
-    def _replace_offers_bids_with_residual_in_recommendations_list(
-            cls, recommendations: List[Dict], offer_trade: Trade, bid_trade: Trade
-    ) -> List[BidOfferMatch.serializable_dict]:
+    @staticmethod
+    def _replace_offers_bids_with_residuals(
+            recommendation: BidOfferMatch.serializable_dict,
+            residual_offers: Dict[str, Dict], residual_bids: Dict[str, Dict]
+    ) -> BidOfferMatch.serializable_dict:
         """
-        If a trade resulted in a residual offer/bid, upcoming matching list with same offer/bid
-        needs to be replaced with residual offer/bid.
-        :param recommendations: Recommended list of offer/bid matches
-        :param offer_trade: Trade info of the successful offer
-        :param bid_trade: Trade info of the successful bid
-        :return: The updated matching offer/bid pair list with existing offer/bid
-        replaced with corresponding residual offer/bid
+        If previous trades resulted in residual offers/bids, replace the offer/bid of the
+        recommendation with its (latest) residual offer/bid.
+        :param recommendation: Recommended offer/bid match
+        :param residual_offers: Mapping of traded offer ids to their serialized residual offer
+        :param residual_bids: Mapping of traded bid ids to their serialized residual bid
+        :return: The recommendation with the existing offer/bid replaced with the corresponding
+        residual offer/bid
         """
-
-        def replace_recommendations_with_residuals(recommendation: Dict):
-            if (recommendation["offer"]["id"] == offer_trade.offer_bid.id and
-                    offer_trade.residual is not None):
-                recommendation["offer"] = offer_trade.residual.serializable_dict()
-            if (recommendation["bid"]["id"] == bid_trade.offer_bid.id and
-                    bid_trade.residual is not None):
-                recommendation["bid"] = bid_trade.residual.serializable_dict()
+        offer = recommendation["offer"]
+        while offer["id"] in residual_offers:
+            offer = residual_offers[offer["id"]]
+        bid = recommendation["bid"]
+        while bid["id"] in residual_bids:
+            bid = residual_bids[bid["id"]]
+        if offer is recommendation["offer"] and bid is recommendation["bid"]:
             return recommendation
-
-        if offer_trade.residual or bid_trade.residual:
-            recommendations = [replace_recommendations_with_residuals(recommendation)
-                               for recommendation in recommendations]
-        return recommendations
+        return {**recommendation, "offer": offer, "bid": bid}
@@ -0,0 +1,78 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from typing import Dict, Tuple, TYPE_CHECKING, Union
+
+from gsy_framework.data_classes import Bid, Offer
+
+from gsy_e.models.market.order_book import OrderBookListener
+
+if TYPE_CHECKING:
+    from gsy_e.models.market import MarketBase
+
+
+class MarketOrdersMirror(OrderBookListener):
+    """
+    Serialized copy of the offers and bids of a market, kept by the matcher.
+
+    The mirror follows the deltas of the market's order books, so an order is only serialized
+    again after it was added or replaced; unchanged orders are served from the copy.
+    """
+
+    def __init__(self, market: "MarketBase"):
+        self._order_books = (market.offers, market.bids)
+        # order_id -> (order, price, energy, serialized order)
+        self._serialized_orders: Dict[str, Tuple[Union[Offer, Bid], float, float, Dict]] = {}
+        # Incremented on every change of the order books of the market
+        self.version = 0
+        for order_book in self._order_books:
+            order_book.add_listener(self)
+
+    def is_mirroring(self, market: "MarketBase") -> bool:
+        """Return True if the mirror follows the current order books of the market."""
+        return self._order_books[0] is market.offers and self._order_books[1] is market.bids
+
+    def detach(self) -> None:
+        """Stop following the order books of the market."""
+        for order_book in self._order_books:
+            order_book.remove_listener(self)
+        self._serialized_orders.clear()
+
+    def serialize_order(self, order: Union[Offer, Bid]) -> Dict:
+        """Return the serialized order, serializing it only if it changed since the last call."""
+        cached_order = self._serialized_orders.get(order.id)
+        # Orders can also be changed in place (e.g. by update_price), without notifying the
+        # order book, therefore the price and energy are compared as well.
+        if (cached_order is None or cached_order[0] is not order or
+                cached_order[1] != order.price or cached_order[2] != order.energy):
+            cached_order = (order, order.price, order.energy, order.serializable_dict())
+            self._serialized_orders[order.id] = cached_order
+        # The matching algorithms receive a copy, in order to keep the mirror unmodified.
+        return dict(cached_order[3])
+
+    def order_added(self, order_id: str, order: Union[Offer, Bid]) -> None:
+        self.version += 1
+        self._serialized_orders.pop(order_id, None)
+
+    def order_removed(self, order_id: str) -> None:
+        self.version += 1
+        self._serialized_orders.pop(order_id, None)
+
+    def orders_cleared(self) -> None:
+        self.version += 1
+        self._serialized_orders.clear()
@@ -16,14 +16,20 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
 from gsy_framework.enums import BidOfferMatchAlgoEnum
 from gsy_framework.constants_limits import ConstSettings
 from gsy_framework.matching_algorithms import (
     PayAsBidMatchingAlgorithm, PayAsClearMatchingAlgorithm, BestPayAsBidMatchingAlgorithm, 
     BestPayAsClearMatchingAlgorithm, BestClusterPayAsClearMatchingAlgorithm)
+from gsy_e import constants
 from gsy_e.gsy_e_core.exceptions import WrongMarketTypeException
 from gsy_e.gsy_e_core.global_objects_singleton import global_objects
+from gsy_e.models.myco_matcher.market_orders_mirror import MarketOrdersMirror
 from gsy_e.models.myco_matcher.myco_matcher_interface import MycoMatcherInterface
+from gsy_e.models.myco_matcher.vectorized_matching import VectorizedMatchingEngine
 
 
 class MycoInternalMatcher(MycoMatcherInterface):
@@ -32,14 +38,89 @@ class MycoInternalMatcher(MycoMatcherInterface):
     def __init__(self):
         super().__init__()
         self.match_algorithm = None
+        self.vectorized_matching_engine: Optional[VectorizedMatchingEngine] = None
+        # market_id -> serialized copy of the orders of the market
+        self._market_orders_mirrors: Dict[str, MarketOrdersMirror] = {}
+        self._matched_market_ids: Set[str] = set()
+        self._matching_executor: Optional[ThreadPoolExecutor] = None
 
     def activate(self):
         self.match_algorithm = self.get_matching_algorithm()
+        self.vectorized_matching_engine = self.get_vectorized_matching_engine()
+        if constants.MATCHING_WORKER_THREADS > 0 and self._matching_executor is None:
+            self._matching_executor = ThreadPoolExecutor(
+                max_workers=constants.MATCHING_WORKER_THREADS)
+
+    def __getstate__(self) -> Dict:
+        # Thread pools can not be pickled (e.g. for simulation snapshots), a new one is created
+        # when the matcher is activated again.
+        state = self.__dict__.copy()
+        state["_matching_executor"] = None
+        return state
 
     def _get_matches_recommendations(self, data):
         """Wrapper for matching algorithm's matches recommendations."""
         return self.match_algorithm.get_matches_recommendations(data)
 
+    @staticmethod
+    def _get_matching_data(area_uuid: str, current_time, orders: Dict) -> Dict:
+        # Format should be: {area_uuid: {time_slot: {"bids": [], "offers": [], ...}}}
+        return {
+            area_uuid: {
+                time_slot: {**orders_data, "current_time": current_time}
+                for time_slot, orders_data in orders.items()}}
+
+    def _get_vectorized_matches_recommendations(
+            self, area_uuid: str, current_time, market, mirror: MarketOrdersMirror) -> List[Dict]:
+        """Match the orders of the market with the NumPy matching engine.
+
+        Time slots with orders that have requirements or attributes are matched by the
+        matching algorithm of gsy-framework instead.
+        """
+        recommendations = []
+        unsupported_orders = {}
+        for time_slot, orders in market.orders_per_slot(lambda order: order).items():
+            if not self.vectorized_matching_engine.can_match(orders["bids"], orders["offers"]):
+                unsupported_orders[time_slot] = {
+                    order_type: [mirror.serialize_order(order) for order in order_list]
+                    for order_type, order_list in orders.items()}
+                continue
+            recommendations.extend(self.vectorized_matching_engine.get_matches_recommendations(
+                area_uuid, time_slot, orders["bids"], orders["offers"], mirror.serialize_order))
+        if unsupported_orders:
+            recommendations.extend(self._get_matches_recommendations(
+                self._get_matching_data(area_uuid, current_time, unsupported_orders)))
+        return recommendations
+
+    def _get_market_orders_mirror(self, market) -> MarketOrdersMirror:
+        mirror = self._market_orders_mirrors.get(market.id)
+        if mirror is None or not mirror.is_mirroring(market):
+            if mirror is not None:
+                mirror.detach()
+            mirror = MarketOrdersMirror(market)
+            self._market_orders_mirrors[market.id] = mirror
+        self._matched_market_ids.add(market.id)
+        return mirror
+
+    def _detach_unused_market_orders_mirrors(self) -> None:
+        """Stop mirroring the markets that were not matched since the last market cycle."""
+        for market_id in set(self._market_orders_mirrors) - self._matched_market_ids:
+            self._market_orders_mirrors.pop(market_id).detach()
+        self._matched_market_ids = set()
+
+    @staticmethod
+    def get_vectorized_matching_engine() -> Optional[VectorizedMatchingEngine]:
+        """Return the NumPy matching engine if it is enabled for the BidOffer match type."""
+        if not constants.VECTORIZED_MATCHING_ENGINE:
+            return None
+        if (ConstSettings.MASettings.BID_OFFER_MATCH_TYPE ==
+                BidOfferMatchAlgoEnum.PAY_AS_BID.value):
+            return VectorizedMatchingEngine(pay_as_clear=False)
+        if (ConstSettings.MASettings.BID_OFFER_MATCH_TYPE ==
+                BidOfferMatchAlgoEnum.PAY_AS_CLEAR.value):
+            return VectorizedMatchingEngine(pay_as_clear=True)
+        return None
+
     @staticmethod
     def get_matching_algorithm():
         """Return a matching algorithm instance based on the global BidOffer match type.
@@ -65,39 +146,78 @@ class MycoInternalMatcher(MycoMatcherInterface):
         raise WrongMarketTypeException("Wrong market type setting flag "
                                        f"{ConstSettings.MASettings.MARKET_TYPE}")
 
-    def match_recommendations(self, **kwargs):
-        """Request trade recommendations and match them in the relevant market."""
+    def _get_markets_to_match(self) -> Iterator[Tuple]:
+        """Yield (area_uuid, current_time, market) for all markets that should be matched."""
         for area_uuid, area_data in self.area_uuid_markets_mapping.items():
             markets = [*area_data["markets"], *area_data["settlement_markets"]]
             if global_objects.future_market_counter.is_time_for_clearing(
                     area_data["current_time"]):
                 markets.append(area_data["future_markets"])
             for market in markets:
-                if not market:
-                    continue
-                while True:
-                    # Perform matching until all recommendations and their residuals are handled.
-                    orders = market.orders_per_slot()
-
-                    # Format should be: {area_uuid: {time_slot: {"bids": [], "offers": [], ...}}}
-                    data = {
-                        area_uuid: {
-                            time_slot: {**orders_data, "current_time": area_data["current_time"]}
-                            for time_slot, orders_data in orders.items()}}
-                    bid_offer_pairs = self._get_matches_recommendations(data)
-                    if not bid_offer_pairs:
-                        break
-                    trades_occurred = market.match_recommendations(bid_offer_pairs)
-                    if not trades_occurred:
-                        break
+                if market:
+                    yield area_uuid, area_data["current_time"], market
+
+    def _get_market_recommendations(
+            self, area_uuid: str, current_time, market, mirror: MarketOrdersMirror) -> List[Dict]:
+        """Return the recommendations for the current orders of the market.
+
+        Only reads the market, so that it can be called concurrently for different markets.
+        Only the orders that changed since the last call are serialized.
+        """
+        if self.vectorized_matching_engine:
+            return self._get_vectorized_matches_recommendations(
+                area_uuid, current_time, market, mirror)
+        orders = market.orders_per_slot(mirror.serialize_order)
+        return self._get_matches_recommendations(
+            self._get_matching_data(area_uuid, current_time, orders))
+
+    def match_recommendations(self, **kwargs):
+        """Request trade recommendations and match them in the relevant market."""
+        markets_to_match = [
+            (area_uuid, current_time, market, self._get_market_orders_mirror(market))
+            for area_uuid, current_time, market in self._get_markets_to_match()]
+        if self._matching_executor:
+            self._match_recommendations_concurrently(markets_to_match)
+        else:
+            for market_to_match in markets_to_match:
+                self._match_market(market_to_match)
 
         self.area_uuid_markets_mapping = {}
 
+    def _match_market(self, market_to_match: Tuple, bid_offer_pairs: List[Dict] = None) -> None:
+        """Perform matching until all recommendations and their residuals are handled."""
+        if bid_offer_pairs is None:
+            bid_offer_pairs = self._get_market_recommendations(*market_to_match)
+        while bid_offer_pairs and market_to_match[2].match_recommendations(bid_offer_pairs):
+            bid_offer_pairs = self._get_market_recommendations(*market_to_match)
+
+    def _match_recommendations_concurrently(self, markets_to_match: List[Tuple]) -> None:
+        """Match the markets one after the other, with the same trades as without threads.
+
+        The first recommendations of all markets are calculated concurrently by the worker
+        threads, before any of them is applied. The trades of a market can change the orders of
+        the markets that are matched after it (via the offers and bids that the market agents
+        forward), therefore the recommendations of a market are calculated again if its orders
+        changed in the meantime. The residuals are matched one market after the other.
+        """
+        futures = [
+            (market_to_match[3].version,
+             self._matching_executor.submit(self._get_market_recommendations, *market_to_match))
+            for market_to_match in markets_to_match]
+        recommendations = [(version, future.result()) for version, future in futures]
+        for market_to_match, (version, bid_offer_pairs) in zip(
+                markets_to_match, recommendations):
+            if market_to_match[3].version != version:
+                bid_offer_pairs = None
+            self._match_market(market_to_match, bid_offer_pairs)
+
     def event_tick(self, **kwargs) -> None:
         pass
 
     def event_market_cycle(self, **kwargs) -> None:
-        pass
+        self._detach_unused_market_orders_mirrors()
 
     def event_finish(self, **kwargs) -> None:
-        pass
+        if self._matching_executor:
+            self._matching_executor.shutdown()
+            self._matching_executor = None
@@ -0,0 +1,259 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from gsy_framework.data_classes import Bid, BidOfferMatch, Offer
+
+from gsy_e.constants import FLOATING_POINT_TOLERANCE
+
+# Arrays of the (bid positions, offer positions, energies) of the matches, the positions refer to
+# the bids and offers sorted by energy rate
+Matches = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+class VectorizedMatchingEngine:
+    """
+    Pay as bid / pay as clear matching on NumPy arrays of the energy rates and energies of the
+    orders of a market, built directly from the order objects. Returns the same recommendations
+    as the PayAsBidMatchingAlgorithm and PayAsClearMatchingAlgorithm of gsy-framework.
+
+    Bids are sorted in descending and offers in ascending order of their energy rate (orders with
+    the same rate keep their order in the market).
+
+    Pay as bid matches the n-th cheapest offer with the n-th most expensive bid, for all n until
+    the rate of the bid is lower than the rate of the offer, at the rate of the bid. Every order is
+    matched at most once, its residual is matched by the next call.
+
+    Pay as clear calculates the clearing point from the cumulative demand and supply curves, and
+    matches the bids above and the offers below the clearing rate by intersecting their cumulative
+    energies, at the clearing rate.
+
+    Offers and bids of the same participant must not be matched, only if a participant has both
+    among the matchable orders, these are matched in a loop. Only the matched orders are
+    serialized. Orders with attributes or requirements are not supported (see can_match), those
+    markets have to be matched by the matching algorithms of gsy-framework.
+    """
+
+    def __init__(self, pay_as_clear: bool = False):
+        self.pay_as_clear = pay_as_clear
+
+    @staticmethod
+    def can_match(bids: Sequence[Bid], offers: Sequence[Offer]) -> bool:
+        """Return True if the orders can be matched without evaluating requirements."""
+        return not any(order.requirements or order.attributes
+                       for orders in (bids, offers) for order in orders)
+
+    @staticmethod
+    def _get_sorted_order_arrays(
+            orders: Sequence[Union[Bid, Offer]], descending: bool
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the (order indices, energy rates, energies) arrays sorted by energy rate."""
+        rates = np.fromiter((order.energy_rate for order in orders), dtype=float,
+                            count=len(orders))
+        energies = np.fromiter((order.energy for order in orders), dtype=float,
+                               count=len(orders))
+        indices = np.argsort(-rates if descending else rates, kind="stable")
+        return indices, rates[indices], energies[indices]
+
+    @staticmethod
+    def _get_cumulative_energy_per_rate(
+            rates: np.ndarray, energies: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the distinct sorted rates and the cumulative energy up to each of them."""
+        cumulative_energies = np.cumsum(energies)
+        is_last_of_rate = np.append(rates[1:] != rates[:-1], True)
+        return rates[is_last_of_rate], cumulative_energies[is_last_of_rate]
+
+    def _get_clearing_point(
+            self, bid_rates: np.ndarray, bid_energies: np.ndarray, offer_rates: np.ndarray,
+            offer_energies: np.ndarray) -> Optional[Tuple[float, float]]:
+        """Return the (clearing rate, clearing energy) of the sorted orders.
+
+        The clearing rate is the lowest bid rate at which the supply covers the demand, the
+        clearing energy is the demand at this rate. If the supply does not cover the demand at
+        any bid rate, the lowest bid rate with supply and the supply at this rate are returned.
+        """
+        if not len(bid_rates) or not len(offer_rates):
+            return None
+        demand_rates, demand = self._get_cumulative_energy_per_rate(bid_rates, bid_energies)
+        supply_rates, supply = self._get_cumulative_energy_per_rate(offer_rates, offer_energies)
+        supply_positions = np.searchsorted(
+            supply_rates, demand_rates + FLOATING_POINT_TOLERANCE, side="right") - 1
+        has_supply = supply_positions >= 0
+        if not has_supply.any():
+            return None
+        supply_at_demand_rates = supply[np.maximum(supply_positions, 0)]
+        is_demand_covered = has_supply & (supply_at_demand_rates >= demand)
+        if is_demand_covered.any():
+            position = np.flatnonzero(is_demand_covered)[-1]
+            return float(demand_rates[position]), float(demand[position])
+        position = np.flatnonzero(has_supply)[-1]
+        return float(demand_rates[position]), float(supply_at_demand_rates[position])
+
+    def get_clearing_point(
+            self, bids: Sequence[Bid], offers: Sequence[Offer]) -> Tuple[float, float]:
+        """Return the (clearing rate, clearing energy) of the orders, (0, 0) if none match."""
+        _, bid_rates, bid_energies = self._get_sorted_order_arrays(bids, True)
+        _, offer_rates, offer_energies = self._get_sorted_order_arrays(offers, False)
+        clearing = self._get_clearing_point(bid_rates, bid_energies, offer_rates, offer_energies)
+        return clearing if clearing is not None else (0., 0.)
+
+    @staticmethod
+    def _match_pay_as_bid(bid_rates: np.ndarray, bid_energies: np.ndarray,
+                          offer_rates: np.ndarray, offer_energies: np.ndarray) -> Matches:
+        count = min(len(bid_rates), len(offer_rates))
+        is_crossing = offer_rates[:count] - bid_rates[:count] <= FLOATING_POINT_TOLERANCE
+        # The condition can only turn false once, since bid rates decrease and offer rates grow
+        matched_count = count if is_crossing.all() else int(np.argmin(is_crossing))
+        positions = np.arange(matched_count)
+        return positions, positions, np.minimum(
+            bid_energies[:matched_count], offer_energies[:matched_count])
+
+    @staticmethod
+    def _match_pay_as_bid_of_participants(
+            bid_rates: np.ndarray, bid_energies: np.ndarray, offer_rates: np.ndarray,
+            offer_energies: np.ndarray, buyers: List[str], sellers: List[str]) -> Matches:
+        """Match every offer with the most expensive free bid of another participant."""
+        matches = []
+        is_bid_matched = [False] * len(bid_rates)
+        for offer_position, offer_rate in enumerate(offer_rates.tolist()):
+            for bid_position, bid_rate in enumerate(bid_rates.tolist()):
+                if is_bid_matched[bid_position] or sellers[offer_position] == buyers[bid_position]:
+                    continue
+                if offer_rate - bid_rate <= FLOATING_POINT_TOLERANCE:
+                    is_bid_matched[bid_position] = True
+                    matches.append((bid_position, offer_position, min(
+                        bid_energies[bid_position], offer_energies[offer_position])))
+                    break
+        return tuple(np.array(values, dtype=dtype) for values, dtype in zip(
+            zip(*matches) if matches else ((), (), ()), (int, int, float)))
+
+    @staticmethod
+    def _match_pay_as_clear(bid_energies: np.ndarray, offer_energies: np.ndarray,
+                            clearing_energy: float) -> Matches:
+        """Intersect the cumulative energies of the bids and offers up to the clearing energy."""
+        bid_cumulative_energies = np.cumsum(bid_energies)
+        offer_cumulative_energies = np.cumsum(offer_energies)
+        matched_energy = min(clearing_energy, bid_cumulative_energies[-1],
+                             offer_cumulative_energies[-1])
+        boundaries = np.unique(np.concatenate((bid_cumulative_energies,
+                                               offer_cumulative_energies)))
+        boundaries = np.append(
+            boundaries[boundaries < matched_energy - FLOATING_POINT_TOLERANCE], matched_energy)
+        starts = np.concatenate(([0.], boundaries[:-1]))
+        energies = boundaries - starts
+        # Every segment between two boundaries belongs to exactly one bid and one offer
+        middles = (starts + boundaries) / 2
+        is_matched = energies > FLOATING_POINT_TOLERANCE
+        return (np.searchsorted(bid_cumulative_energies, middles[is_matched]),
+                np.searchsorted(offer_cumulative_energies, middles[is_matched]),
+                energies[is_matched])
+
+    @staticmethod
+    def _match_pay_as_clear_of_participants(
+            bid_energies: np.ndarray, offer_energies: np.ndarray, clearing_energy: float,
+            buyers: List[str], sellers: List[str]) -> Matches:
+        """Match every offer with the remaining energy of the bids of other participants."""
+        matches = []
+        bid_energies = bid_energies.tolist()
+        matched_energy = 0.
+        for offer_position, offer_energy in enumerate(offer_energies.tolist()):
+            for bid_position, bid_energy in enumerate(bid_energies):
+                energy = min(bid_energy, offer_energy, clearing_energy - matched_energy)
+                if (energy <= FLOATING_POINT_TOLERANCE or
+                        sellers[offer_position] == buyers[bid_position]):
+                    continue
+                matches.append((bid_position, offer_position, energy))
+                bid_energies[bid_position] -= energy
+                offer_energy -= energy
+                matched_energy += energy
+        return tuple(np.array(values, dtype=dtype) for values, dtype in zip(
+            zip(*matches) if matches else ((), (), ()), (int, int, float)))
+
+    def _match(self, bids: Sequence[Bid],
+               offers: Sequence[Offer]) -> List[Tuple[int, int, float, float]]:
+        """Return the matches as (bid index, offer index, trade rate, energy) tuples."""
+        if not bids or not offers:
+            return []
+        bid_indices, bid_rates, bid_energies = self._get_sorted_order_arrays(bids, True)
+        offer_indices, offer_rates, offer_energies = self._get_sorted_order_arrays(offers, False)
+
+        if self.pay_as_clear:
+            clearing = self._get_clearing_point(
+                bid_rates, bid_energies, offer_rates, offer_energies)
+            if clearing is None or clearing[1] <= 0:
+                return []
+            clearing_rate, clearing_energy = clearing
+            bid_count = int(np.searchsorted(
+                -bid_rates, -(clearing_rate - FLOATING_POINT_TOLERANCE), side="right"))
+            offer_count = int(np.searchsorted(
+                offer_rates, clearing_rate + FLOATING_POINT_TOLERANCE, side="right"))
+        else:
+            # Only the orders up to the crossing point of the supply and demand curves can match
+            bid_count = int(np.searchsorted(
+                -bid_rates, -(offer_rates[0] - FLOATING_POINT_TOLERANCE), side="right"))
+            offer_count = int(np.searchsorted(
+                offer_rates, bid_rates[0] + FLOATING_POINT_TOLERANCE, side="right"))
+            if not bid_count or not offer_count:
+                return []
+
+        buyers = [bids[index].buyer for index in bid_indices[:bid_count]]
+        sellers = [offers[index].seller for index in offer_indices[:offer_count]]
+        has_common_participants = not set(buyers).isdisjoint(sellers)
+        bid_rates, bid_energies = bid_rates[:bid_count], bid_energies[:bid_count]
+        offer_rates, offer_energies = offer_rates[:offer_count], offer_energies[:offer_count]
+
+        if self.pay_as_clear and has_common_participants:
+            bid_positions, offer_positions, energies = self._match_pay_as_clear_of_participants(
+                bid_energies, offer_energies, clearing_energy, buyers, sellers)
+        elif self.pay_as_clear:
+            bid_positions, offer_positions, energies = self._match_pay_as_clear(
+                bid_energies, offer_energies, clearing_energy)
+        elif has_common_participants:
+            bid_positions, offer_positions, energies = self._match_pay_as_bid_of_participants(
+                bid_rates, bid_energies, offer_rates, offer_energies, buyers, sellers)
+        else:
+            bid_positions, offer_positions, energies = self._match_pay_as_bid(
+                bid_rates, bid_energies, offer_rates, offer_energies)
+
+        trade_rates = (np.full(len(energies), clearing_rate) if self.pay_as_clear
+                       else bid_rates[bid_positions])
+        return list(zip(bid_indices[bid_positions].tolist(),
+                        offer_indices[offer_positions].tolist(),
+                        trade_rates.tolist(), energies.tolist()))
+
+    def get_matches_recommendations(
+            self, market_id: str, time_slot: str, bids: Sequence[Bid], offers: Sequence[Offer],
+            serialize_order: Callable[[Union[Bid, Offer]], Dict]
+    ) -> List[Dict]:
+        """Match the orders of one market time slot and return the serialized recommendations."""
+        matches = self._match(bids, offers)
+        serialized_orders = {}
+
+        def serialize(order):
+            if order.id not in serialized_orders:
+                serialized_orders[order.id] = serialize_order(order)
+            return serialized_orders[order.id]
+
+        return [
+            BidOfferMatch(
+                market_id=market_id, time_slot=time_slot,
+                bid=serialize(bids[bid_index]), offer=serialize(offers[offer_index]),
+                selected_energy=energy, trade_rate=trade_rate).serializable_dict()
+            for bid_index, offer_index, trade_rate, energy in matches]
@@ -55,6 +55,11 @@ class StateInterface(ABC):
         """Return the current state of the device."""
         return {}
 
+    def get_checkpoint_state(self) -> Dict:
+        """Return the current state of the device, keeping the time slots as DateTime keys
+        instead of converting them to strings (used for the binary checkpoints)."""
+        return {}
+
     @abstractmethod
     def restore_state(self, state_dict: Dict):
         """Update the state of the device using the provided dictionary."""
@@ -224,6 +229,14 @@ class ConsumptionState(ProsumptionInterface):
         state.update(consumption_state)
         return state
 
+    def get_checkpoint_state(self) -> Dict:
+        """Return the state of the device for the binary checkpoints."""
+        state = super().get_checkpoint_state()
+        state.update({
+            "desired_energy_Wh": self._desired_energy_Wh,
+            "total_energy_demanded_Wh": self._total_energy_demanded_Wh})
+        return state
+
     def restore_state(self, state_dict: Dict):
         super().restore_state(state_dict)
 
@@ -306,6 +319,14 @@ class ProductionState(ProsumptionInterface):
         state.update(production_state)
         return state
 
+    def get_checkpoint_state(self) -> Dict:
+        """Return the state of the device for the binary checkpoints."""
+        state = super().get_checkpoint_state()
+        state.update({
+            "available_energy_kWh": self._available_energy_kWh,
+            "energy_production_forecast_kWh": self._energy_production_forecast_kWh})
+        return state
+
     def restore_state(self, state_dict: Dict):
         """Update the state of the device using the provided dictionary."""
         super().restore_state(state_dict)
@@ -513,6 +534,22 @@ class StorageState(StateInterface):
             "battery_energy_per_slot": self._battery_energy_per_slot,
         }
 
+    def get_checkpoint_state(self) -> Dict:
+        return {
+            "pledged_sell_kWh": self.pledged_sell_kWh,
+            "offered_sell_kWh": self.offered_sell_kWh,
+            "pledged_buy_kWh": self.pledged_buy_kWh,
+            "offered_buy_kWh": self.offered_buy_kWh,
+            "charge_history": self.charge_history,
+            "charge_history_kWh": self.charge_history_kWh,
+            "offered_history": self.offered_history,
+            "used_history": self.used_history,
+            "energy_to_buy_dict": self.energy_to_buy_dict,
+            "energy_to_sell_dict": self.energy_to_sell_dict,
+            "used_storage": self._used_storage,
+            "battery_energy_per_slot": self._battery_energy_per_slot,
+        }
+
     def restore_state(self, state_dict: Dict):
         self.pledged_sell_kWh.update(
             convert_str_to_pendulum_in_dict(state_dict["pledged_sell_kWh"]))
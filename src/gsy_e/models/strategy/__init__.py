@@ -21,10 +21,11 @@ import sys
 from abc import ABC
 from dataclasses import dataclass
 from logging import getLogger
-from typing import List, Dict, Union, Optional, Generator, Callable, TYPE_CHECKING
+from typing import (
+    List, Dict, FrozenSet, Union, Optional, Generator, Callable, TYPE_CHECKING)
 from uuid import uuid4
 
-from gsy_framework.constants_limits import ConstSettings
+from gsy_framework.constants_limits import ConstSettings, GlobalConfig
 from gsy_framework.data_classes import (Offer, Bid, Trade)
 from gsy_framework.enums import SpotMarketTypeEnum
 from gsy_framework.utils import limit_float_precision
@@ -37,6 +38,7 @@ from gsy_e.events import EventMixin
 from gsy_e.events.event_structures import AreaEvent, MarketEvent
 from gsy_e.gsy_e_core.device_registry import DeviceRegistry
 from gsy_e.gsy_e_core.exceptions import D3ARedisException, SimulationException, MarketException
+from gsy_e.gsy_e_core.global_objects_singleton import global_objects
 from gsy_e.gsy_e_core.redis_connections.redis_area_market_communicator import BlockingCommunicator
 from gsy_e.gsy_e_core.util import append_or_create_key
 from gsy_e.models.base import AreaBehaviorBase
@@ -52,6 +54,7 @@ if TYPE_CHECKING:
     from gsy_framework.data_classes import TradeBidOfferInfo
     from gsy_e.models.market.one_sided import OneSidedMarket
     from gsy_e.models.market.two_sided import TwoSidedMarket
+    from gsy_e.models.strategy.update_frequency import TemplateStrategyUpdaterInterface
 
 INF_ENERGY = int(sys.maxsize)
 
@@ -102,10 +105,7 @@ class _TradeLookerUpper:
         self.owner_name = owner_name
 
     def __getitem__(self, market: MarketBase) -> Generator[Trade, None, None]:
-        for trade in market.trades:
-            owner_name = self.owner_name
-            if owner_name in (trade.seller, trade.buyer):
-                yield trade
+        yield from market.get_trades_by_participant(self.owner_name)
 
 
 def market_strategy_connection_adapter_factory() -> Union["MarketStrategyConnectionAdapter",
@@ -508,6 +508,34 @@ class BaseStrategy(EventMixin, AreaBehaviorBase, ABC):
             # Remove all existing offers that are still open in the market
             self.offers.remove_offer_from_cache_and_market(market)
 
+        self._add_default_offer_arguments(market, offer_kwargs)
+        offer = self._market_adapter.offer(market, **offer_kwargs)
+        self.offers.post(offer, market.id)
+
+        return offer
+
+    def post_offers(self, market: "OneSidedMarket",
+                    offers_kwargs: List[Dict]) -> List[Optional[Offer]]:
+        """Post multiple offers on the specified market at once (see OneSidedMarket.offers_bulk).
+
+        The offers are posted directly on the market (not via the market adapter) and without
+        dispatching the OFFERS_BULK event.
+
+        Args:
+            market: The market in which the offers must be placed.
+            offers_kwargs: the parameters that will be used to create each of the Offer objects.
+
+        Returns: the posted offers, None for the offers that were rejected by the market.
+        """
+        for offer_kwargs in offers_kwargs:
+            self._add_default_offer_arguments(market, offer_kwargs)
+        offers = market.offers_bulk(offers_kwargs, dispatch_event=False)
+        for offer in offers:
+            if offer is not None:
+                self.offers.post(offer, market.id)
+        return offers
+
+    def _add_default_offer_arguments(self, market: "OneSidedMarket", offer_kwargs: Dict) -> None:
         if not offer_kwargs.get("seller"):
             offer_kwargs["seller"] = self.owner.name
         if not offer_kwargs.get("seller_origin"):
@@ -519,16 +547,11 @@ class BaseStrategy(EventMixin, AreaBehaviorBase, ABC):
         if not offer_kwargs.get("time_slot"):
             offer_kwargs["time_slot"] = market.time_slot
 
-        offer = self._market_adapter.offer(market, **offer_kwargs)
-        self.offers.post(offer, market.id)
-
-        return offer
-
     def post_first_offer(self, market: "OneSidedMarket", energy_kWh: float,
                          initial_energy_rate: float) -> Optional[Offer]:
         """Post first and only offer for the strategy. Will fail if another offer already
          exists."""
-        if any(offer.seller_id == self.owner.uuid for offer in market.get_offers().values()):
+        if any(market.get_offers_by_seller_id(self.owner.uuid)):
             self.owner.log.debug("There is already another offer posted on the market, therefore"
                                  " do not repost another first offer.")
             return None
@@ -614,6 +637,29 @@ class BaseStrategy(EventMixin, AreaBehaviorBase, ABC):
         """Dispatches the events received by the strategy to the respective methods."""
         if self.enabled or event_type in self._allowed_disable_events:
             super().event_listener(event_type, **kwargs)
+            if (global_objects.tick_scheduler.enabled and
+                    event_type in (AreaEvent.TICK, AreaEvent.MARKET_CYCLE)):
+                global_objects.tick_scheduler.request_wake_up(self.get_next_wake_up_tick())
+
+    def get_next_wake_up_tick(self) -> Optional[int]:
+        """
+        Return the next tick on which the strategy needs to receive the tick event, or None if the
+        strategy does not need any tick event until the next market cycle. Used by the fast-forward
+        mode of the simulation; by default the strategy is woken up on every tick.
+        """
+        return self.owner.current_tick + 1
+
+    def _get_next_wake_up_tick_from_updaters(
+            self, updaters: List["TemplateStrategyUpdaterInterface"]) -> Optional[int]:
+        """Return the earliest tick on which one of the updaters needs to update its prices."""
+        if (ConstSettings.SettlementMarketSettings.ENABLE_SETTLEMENT_MARKETS or
+                GlobalConfig.FUTURE_MARKET_DURATION_HOURS):
+            # Settlement and future market strategies update their orders on every tick.
+            return self.owner.current_tick + 1
+        next_ticks = [tick for tick in (updater.get_next_update_tick(self)
+                                        for updater in updaters)
+                      if tick is not None]
+        return min(next_ticks) if next_ticks else None
 
     def event_offer_traded(self, *, market_id: str, trade: Trade) -> None:
         """
@@ -718,6 +764,14 @@ class BidEnabledStrategy(BaseStrategy):
         self._bids = {}
         self._traded_bids = {}
 
+    def get_market_event_subscriptions(self) -> FrozenSet[MarketEvent]:
+        subscriptions = super().get_market_event_subscriptions()
+        if ConstSettings.MASettings.MARKET_TYPE != SpotMarketTypeEnum.ONE_SIDED.value:
+            # In two-sided markets the strategy buys energy by posting bids, offers are only
+            # accepted directly (event_offer) in one-sided markets.
+            return subscriptions - {MarketEvent.OFFER}
+        return subscriptions
+
     def energy_traded(self, market_id: str, time_slot: Optional[DateTime] = None) -> float:
         # pylint: disable=fixme
         # TODO: Potential bug when used for the storage strategy. Does not really make sense to
@@ -913,7 +967,7 @@ class BidEnabledStrategy(BaseStrategy):
         # should be only bid from a device to a market at all times, which will be replaced if
         # it needs to be updated. If this check is not there, the market cycle event will post
         # one bid twice, which actually happens on the very first market slot cycle.
-        if any(bid.buyer == self.owner.name for bid in market.get_bids().values()):
+        if any(market.get_bids_by_buyer_id(self.owner.uuid)):
             self.owner.log.debug("There is already another bid posted on the market, therefore"
                                  " do not repost another first bid.")
             return None
@@ -116,6 +116,9 @@ class CommercialStrategy(BaseStrategy):
     def get_state(self):
         return {"energy_rate": convert_pendulum_to_str_in_dict(self.energy_rate)}
 
+    def get_checkpoint_state(self):
+        return {"energy_rate": self.energy_rate}
+
     def restore_state(self, saved_state):
         self.energy_rate.update(convert_str_to_pendulum_in_dict(saved_state["energy_rate"]))
 
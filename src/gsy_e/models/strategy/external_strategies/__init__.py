@@ -26,7 +26,6 @@ from gsy_framework.data_classes import Trade
 from gsy_framework.enums import SpotMarketTypeEnum
 from gsy_framework.utils import str_to_pendulum_datetime
 from pendulum import DateTime
-from redis import RedisError
 
 import gsy_e.constants
 from gsy_e.gsy_e_core.exceptions import MarketException, GSyException
@@ -93,6 +92,7 @@ class ExternalStrategyConnectionManager:
         if is_connected:
             return True
         register_response_channel = f"{channel_prefix}/response/register_participant"
+        from redis import RedisError  # pylint: disable=import-outside-toplevel
         try:
             redis.publish_json(
                 register_response_channel,
@@ -116,6 +116,7 @@ class ExternalStrategyConnectionManager:
         if not ExternalStrategyConnectionManager.check_for_connected_and_reply(
                 redis, unregister_response_channel, is_connected):
             return False
+        from redis import RedisError  # pylint: disable=import-outside-toplevel
         try:
             redis.publish_json(
                 unregister_response_channel,
@@ -175,6 +176,15 @@ class ExternalMixin:
         })
         return strategy_state
 
+    def get_checkpoint_state(self) -> Dict:
+        """Get the state of the asset/market for the binary checkpoints."""
+        strategy_state = super().get_checkpoint_state()
+        strategy_state.update({
+            "connected": self.connected,
+            "use_template_strategy": self._use_template_strategy
+        })
+        return strategy_state
+
     def restore_state(self, state_dict: Dict) -> None:
         """Restore the state, this is needed when resuming a paused or interrupted simulation."""
         super().restore_state(state_dict)
@@ -58,6 +58,12 @@ class FinitePowerPlant(CommercialStrategy):
                 self.max_available_power_kW)
         }
 
+    def get_checkpoint_state(self):
+        return {
+            "energy_rate": self.energy_rate,
+            "max_available_power_kW": self.max_available_power_kW
+        }
+
     def restore_state(self, saved_state):
         self.energy_rate.update(convert_str_to_pendulum_in_dict(saved_state["energy_rate"]))
         self.max_available_power_kW.update(convert_str_to_pendulum_in_dict(
@@ -179,6 +179,12 @@ class InfiniteBusStrategy(CommercialStrategy, BidEnabledStrategy):
             "energy_buy_rate": convert_pendulum_to_str_in_dict(self.energy_buy_rate),
         }
 
+    def get_checkpoint_state(self):
+        return {
+            "energy_rate": self.energy_rate,
+            "energy_buy_rate": self.energy_buy_rate,
+        }
+
     def restore_state(self, saved_state):
         self.energy_buy_rate.update(convert_str_to_pendulum_in_dict(
             saved_state["energy_buy_rate"]))
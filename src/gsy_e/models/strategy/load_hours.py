@@ -351,6 +351,9 @@ class LoadHoursStrategy(BidEnabledStrategy):
         self._settlement_market_strategy.event_tick(self)
         self._future_market_strategy.event_tick(self)
 
+    def get_next_wake_up_tick(self):
+        return self._get_next_wake_up_tick_from_updaters([self.bid_update])
+
     def event_offer(self, *, market_id, offer):
         """Automatically react to offers in single-sided markets.
 
@@ -51,6 +51,10 @@ class BalancingAgent(OneSidedAgent):
             self._trigger_balancing_trades(self.lower_market.unmatched_energy_upward,
                                            self.lower_market.unmatched_energy_downward)
 
+    def get_next_wake_up_tick(self):
+        # Balancing trades are evaluated on every tick.
+        return self.owner.current_tick + 1
+
     def event_offer_traded(self, *, market_id, trade):
         market = self.get_market_from_market_id(market_id)
         if market is None:
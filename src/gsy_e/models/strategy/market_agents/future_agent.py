@@ -15,7 +15,7 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
-from typing import TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
 
 from gsy_framework.constants_limits import ConstSettings
 
@@ -24,6 +24,7 @@ from gsy_e.models.strategy.market_agents.two_sided_agent import TwoSidedAgent
 
 if TYPE_CHECKING:
     from gsy_e.models.area import Area
+    from gsy_e.models.market import MarketBase
     from gsy_e.models.market.future import FutureMarkets
 
 
@@ -56,3 +57,7 @@ class FutureAgent(TwoSidedAgent):
             return
         for engine in self.engines:
             engine.clean_up_order_buffers(self.owner.current_market.time_slot)
+
+    def get_markets_above_higher_market(self) -> Optional[List["MarketBase"]]:
+        # The future markets of the ancestor areas are not looked up.
+        return None
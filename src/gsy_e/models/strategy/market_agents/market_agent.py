@@ -15,7 +15,7 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
-from typing import Optional
+from typing import List, Optional, TYPE_CHECKING
 
 from gsy_framework.constants_limits import ConstSettings
 from numpy.random import random
@@ -23,6 +23,9 @@ from numpy.random import random
 from gsy_e.constants import TIME_FORMAT
 from gsy_e.models.strategy import BaseStrategy, _TradeLookerUpper
 
+if TYPE_CHECKING:
+    from gsy_e.models.market import MarketBase
+
 
 class MarketAgent(BaseStrategy):
     """Base class for inter area agents implementations."""
@@ -55,6 +58,13 @@ class MarketAgent(BaseStrategy):
         return (self.higher_market.time_slot.format(TIME_FORMAT)
                 if self.higher_market.time_slot else None)
 
+    def get_markets_above_higher_market(self) -> Optional[List["MarketBase"]]:
+        """
+        Return the markets of the ancestor areas above the higher market (parent first) that the
+        orders of the agent are forwarded to, or None if the agent can not look them up.
+        """
+        return None
+
     @staticmethod
     def _validate_constructor_arguments(min_offer_age):
         assert 0 <= min_offer_age <= 360
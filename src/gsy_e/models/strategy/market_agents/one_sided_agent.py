@@ -57,6 +57,12 @@ class OneSidedAgent(MarketAgent):
         for engine in sorted(self.engines, key=lambda _: random()):
             engine.tick(area=area)
 
+    def get_next_wake_up_tick(self) -> Optional[int]:
+        next_ticks = [tick for tick in (engine.get_next_wake_up_tick(self.owner.current_tick)
+                                        for engine in self.engines)
+                      if tick is not None]
+        return min(next_ticks) if next_ticks else None
+
     # pylint: disable=unused-argument
     def event_offer_traded(self, *, market_id, trade):
         for engine in sorted(self.engines, key=lambda _: random()):
@@ -77,6 +83,7 @@ class OneSidedAgent(MarketAgent):
     def delete_engines(self) -> None:
         """Deletes all engine buffers, theirs contents and the engines themselves."""
         for engine in self.engines:
+            engine.detach()
             del engine.forwarded_offers
             del engine.offer_age
             del engine.trade_residual
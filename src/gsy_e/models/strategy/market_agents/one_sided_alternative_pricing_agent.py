@@ -70,6 +70,10 @@ class OneSidedAlternativePricingAgent(OneSidedAgent):
                 ConstSettings.MASettings.AlternativePricing.PRICING_SCHEME != 0:
             self._buy_energy_alternative_pricing_schemes(area)
 
+    def get_next_wake_up_tick(self):
+        # Offers are bought based on the alternative pricing scheme on every tick.
+        return self.owner.current_tick + 1
+
     def event_market_cycle(self):
         if ConstSettings.MASettings.AlternativePricing.PRICING_SCHEME != 0:
             energy_per_slot = INF_ENERGY
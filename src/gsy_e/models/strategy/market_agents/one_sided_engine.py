@@ -16,15 +16,17 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 from collections import namedtuple
-from typing import Dict, Optional  # noqa
+from typing import Dict, List, Optional  # noqa
 
 from gsy_framework.constants_limits import ConstSettings
 from gsy_framework.data_classes import Offer
 from gsy_framework.enums import SpotMarketTypeEnum
 
+import gsy_e.constants
 from gsy_e.constants import FLOATING_POINT_TOLERANCE
 from gsy_e.gsy_e_core.exceptions import MarketException, OfferNotFoundException
 from gsy_e.gsy_e_core.util import short_offer_bid_log_str
+from gsy_e.models.strategy.market_agents.pending_orders import PendingOrders
 
 OfferInfo = namedtuple("OfferInfo", ("source_offer", "target_offer"))
 Markets = namedtuple("Markets", ("source", "target"))
@@ -41,7 +43,9 @@ class MAEngine:
         self.min_offer_age = min_offer_age
         self.owner = owner
 
-        self.offer_age: Dict[str, int] = {}
+        # Ages of the offers of the source market, and offers that wait to be forwarded
+        self._pending_offers = PendingOrders()
+        self.offer_age: Dict[str, int] = self._pending_offers.ages
         # Offer.id -> OfferInfo
         self.forwarded_offers: Dict[str, OfferInfo] = {}
         self.trade_residual: Dict[str, Offer] = {}
@@ -65,16 +69,15 @@ class MAEngine:
             requirements.append(updated_requirement)
         return requirements
 
-    def _offer_in_market(self, offer):
+    def _get_forwarded_offer_arguments(self, offer: Offer) -> Dict:
         updated_price = self.markets.target.fee_class.update_forwarded_offer_with_fee(
             offer.energy_rate, offer.original_price / offer.energy) * offer.energy
 
-        kwargs = {
+        return {
             "price": updated_price,
             "energy": offer.energy,
             "seller": self.owner.name,
             "original_price": offer.original_price,
-            "dispatch_event": False,
             "seller_origin": offer.seller_origin,
             "seller_origin_id": offer.seller_origin_id,
             "seller_id": self.owner.uuid,
@@ -83,13 +86,21 @@ class MAEngine:
             "requirements": self._update_offer_requirements_prices(offer)
         }
 
-        return self.owner.post_offer(market=self.markets.target, replace_existing=False, **kwargs)
+    def _offer_in_market(self, offer):
+        kwargs = self._get_forwarded_offer_arguments(offer)
+        return self.owner.post_offer(market=self.markets.target, replace_existing=False,
+                                     dispatch_event=False, **kwargs)
 
-    def _forward_offer(self, offer: Offer) -> Optional[Offer]:
+    def _has_forwardable_price(self, offer: Offer) -> bool:
         # TODO: This is an ugly solution. After the december release this check needs to
         #  implemented after grid fee being incorporated while forwarding in target market
         if offer.price < 0.0:
             self.owner.log.debug("Offer is not forwarded because price < 0")
+            return False
+        return True
+
+    def _forward_offer(self, offer: Offer) -> Optional[Offer]:
+        if not self._has_forwardable_price(offer):
             return None
         try:
             forwarded_offer = self._offer_in_market(offer)
@@ -105,30 +116,72 @@ class MAEngine:
         self.markets.target.dispatch_market_offer_event(forwarded_offer)
         return forwarded_offer
 
+    def _forward_offers(self, offers: List[Offer]) -> Dict[str, Offer]:
+        """
+        Forward the offers to the target market at once, with one OFFERS_BULK event for all
+        forwarded offers.
+        Returns: mapping of the ids of the forwarded offers to the offers of the target market
+        """
+        offers = [offer for offer in offers if self._has_forwardable_price(offer)]
+        posted_offers = self.owner.post_offers(
+            self.markets.target, [self._get_forwarded_offer_arguments(offer) for offer in offers])
+        forwarded_offers = {}
+        for offer, forwarded_offer in zip(offers, posted_offers):
+            if forwarded_offer is None:
+                self.owner.log.debug("Offer is not forwarded because grid fees of the target "
+                                     "market lead to a negative offer price.")
+                continue
+            self._add_to_forward_offers(offer, forwarded_offer)
+            self.owner.log.trace(f"Forwarding offer {offer} to {forwarded_offer}")
+            forwarded_offers[offer.id] = forwarded_offer
+        self.markets.target.dispatch_market_offers_event(list(forwarded_offers.values()))
+        return forwarded_offers
+
+    @staticmethod
+    def _is_bulk_forwarding_enabled() -> bool:
+        return (gsy_e.constants.BULK_ORDER_FORWARDING and
+                not ConstSettings.GeneralSettings.EVENT_DISPATCHING_VIA_REDIS)
+
     def _delete_forwarded_offer_entries(self, offer):
         offer_info = self.forwarded_offers.pop(offer.id, None)
         if not offer_info:
             return
         self.forwarded_offers.pop(offer_info.target_offer.id, None)
         self.forwarded_offers.pop(offer_info.source_offer.id, None)
-        self.offer_age.pop(offer_info.target_offer.id, None)
-        self.offer_age.pop(offer_info.source_offer.id, None)
+        self._pending_offers.discard(offer_info.target_offer.id)
+        self._pending_offers.discard(offer_info.source_offer.id)
+        # The offers are not forwarded by the agent any more, thus they become usable
+        for engine in self.owner.engines:
+            engine.release_offer(offer_info.target_offer.id)
+            engine.release_offer(offer_info.source_offer.id)
+
+    def release_offer(self, offer_id: str) -> None:
+        """Check again whether the offer of the source market can be forwarded."""
+        self._pending_offers.release(offer_id)
+
+    def detach(self) -> None:
+        """Stop following the orders of the source market."""
+        self._pending_offers.detach()
 
     def tick(self, *, area):
         """Perform actions that need to be done when TICK event is triggered."""
         self._propagate_offer(area.current_tick)
 
+    def get_next_wake_up_tick(self, current_tick: int) -> Optional[int]:
+        """Return the next tick on which an offer will become old enough to be forwarded."""
+        return self._pending_offers.get_next_due_tick(
+            current_tick, self.min_offer_age, self.forwarded_offers)
+
     def _propagate_offer(self, current_tick):
-        # Store age of offer
-        for offer in self.markets.source.offers.values():
-            if offer.id not in self.offer_age:
-                self.offer_age[offer.id] = current_tick
+        # Store age of the offers that were posted since the last tick
+        self._pending_offers.age_new_orders(self.markets.source.offers, current_tick)
 
-        # Use `list()` to avoid in place modification errors
-        for offer_id, age in list(self.offer_age.items()):
+        # In the bulk mode the due offers are collected and forwarded together
+        bulk_forwarding = self._is_bulk_forwarding_enabled()
+        due_offers = []
+        for offer_id in self._pending_offers.pop_due_order_ids(current_tick, self.min_offer_age):
             if offer_id in self.forwarded_offers:
-                continue
-            if current_tick - age < self.min_offer_age:
+                self._pending_offers.park(offer_id)
                 continue
             offer = self.markets.source.offers.get(offer_id)
             if not offer:
@@ -137,24 +190,35 @@ class MAEngine:
                 # be modified, thus causing a removal from the offer_age dict. In such a case, even
                 # if the offer is no longer in the offer_age dict, the execution should continue
                 # normally.
-                self.offer_age.pop(offer_id, None)
+                self._pending_offers.discard(offer_id)
                 continue
             if not self.owner.usable_offer(offer):
-                # Forbidden offer (i.e. our counterpart's)
-                self.offer_age.pop(offer_id, None)
+                # Forbidden offer (i.e. our counterpart's), until the counterpart releases it
+                self._pending_offers.park(offer_id)
                 continue
 
             # Should never reach this point.
             # This means that the MA is forwarding offers with the same seller and buyer name.
             # If we ever again reach a situation like this, we should never forward the offer.
             if self.owner.name == offer.seller:
-                self.offer_age.pop(offer_id, None)
+                self._pending_offers.park(offer_id)
                 continue
 
+            if bulk_forwarding:
+                due_offers.append(offer)
+                continue
             forwarded_offer = self._forward_offer(offer)
             if forwarded_offer:
-                self.owner.log.debug(f"Forwarded offer to {self.markets.source.name} "
-                                     f"{self.owner.name}, {self.name} {forwarded_offer}")
+                self._park_forwarded_offer(offer_id, forwarded_offer)
+
+        if due_offers:
+            for offer_id, forwarded_offer in self._forward_offers(due_offers).items():
+                self._park_forwarded_offer(offer_id, forwarded_offer)
+
+    def _park_forwarded_offer(self, offer_id: str, forwarded_offer: Offer) -> None:
+        self._pending_offers.park(offer_id)
+        self.owner.log.debug(f"Forwarded offer to {self.markets.source.name} "
+                             f"{self.owner.name}, {self.name} {forwarded_offer}")
 
     def event_offer_traded(self, *, trade):
         """Perform actions that need to be done when OFFER_TRADED event is triggered."""
@@ -200,7 +264,7 @@ class MAEngine:
                 f"[{self.markets.source.time_slot_str}] Offer accepted {trade_source}")
 
             self._delete_forwarded_offer_entries(offer_info.source_offer)
-            self.offer_age.pop(offer_info.source_offer.id, None)
+            self._pending_offers.discard(offer_info.source_offer.id)
 
         elif trade.offer_bid.id == offer_info.source_offer.id:
             # Offer was bought in source market by another party
@@ -212,7 +276,7 @@ class MAEngine:
                 self.owner.log.exception("Error deleting MarketAgent offer:")
 
             self._delete_forwarded_offer_entries(offer_info.source_offer)
-            self.offer_age.pop(offer_info.source_offer.id, None)
+            self._pending_offers.discard(offer_info.source_offer.id)
 
             # Forward the residual offer since the original offer was also forwarded
             if trade.residual:
@@ -225,9 +289,8 @@ class MAEngine:
 
     def event_offer_deleted(self, *, offer):
         """Perform actions that need to be done when OFFER_DELETED event is triggered."""
-        if offer.id in self.offer_age:
-            # Offer we're watching in source market was deleted - remove
-            del self.offer_age[offer.id]
+        # Offer we're watching in source market was deleted - remove
+        self._pending_offers.discard(offer.id)
 
         offer_info = self.forwarded_offers.get(offer.id)
         if not offer_info:
@@ -287,7 +350,7 @@ class MAEngine:
             return
 
         if original_offer.id in self.offer_age:
-            self.offer_age[residual_offer.id] = self.offer_age.pop(original_offer.id)
+            self._pending_offers.rename(original_offer.id, residual_offer.id)
 
         self.owner.log.debug(f"Offer {short_offer_bid_log_str(local_offer)} was split into "
                              f"{short_offer_bid_log_str(local_split_offer)} and "
@@ -312,3 +375,12 @@ class BalancingEngine(MAEngine):
         self._add_to_forward_offers(offer, forwarded_balancing_offer)
         self.owner.log.trace(f"Forwarding balancing offer {offer} to {forwarded_balancing_offer}")
         return forwarded_balancing_offer
+
+    def _forward_offers(self, offers):
+        # Balancing offers are always forwarded one by one
+        forwarded_offers = {}
+        for offer in offers:
+            forwarded_offer = self._forward_offer(offer)
+            if forwarded_offer:
+                forwarded_offers[offer.id] = forwarded_offer
+        return forwarded_offers
@@ -0,0 +1,254 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from heapq import heappop, heappush
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from gsy_e.constants import FLOATING_POINT_TOLERANCE
+from gsy_e.models.market.order_book import Order, OrderBook, OrderBookListener
+
+
+class PendingOrders(OrderBookListener):
+    """
+    Ages of the orders of the source market of a market agent engine (the tick on which the
+    engine saw the order for the first time), and queue of the orders that are waiting to be
+    forwarded.
+
+    The queue follows the deltas of the order book of the source market, so that on every tick
+    only the orders that were added since the previous tick are aged, and only the orders whose
+    minimum age has elapsed are visited. Young orders are kept in a heap ordered by their age,
+    due orders stay in the queue until the engine forwards them, parks them (orders that can not
+    be forwarded, until they are released or added to the market again) or discards them.
+    Order books that do not report their deltas are scanned on every tick instead.
+    """
+
+    def __init__(self):
+        self.ages: Dict[str, int] = {}
+        self._order_book: Optional[OrderBook] = None
+        # Orders that were added to the order book (or discarded) since the last tick
+        self._unaged_order_ids: Dict[str, None] = {}
+        # Heap of (age, sequence_number, order_id) entries of the orders that are not due yet
+        self._young_orders: List[Tuple[int, int, str]] = []
+        self._young_order_ids: Set[str] = set()
+        # order_id -> sequence_number of the due orders
+        self._due_order_ids: Dict[str, int] = {}
+        self._parked_order_ids: Set[str] = set()
+        # The sequence numbers order the orders in the order in which they were aged
+        self._sequence_numbers: Dict[str, int] = {}
+        self._next_sequence_number = 0
+
+    def order_added(self, order_id: str, order: Order) -> None:
+        self._unaged_order_ids[order_id] = None
+
+    def order_removed(self, order_id: str) -> None:
+        # Removed orders are dropped from the queue once they are due.
+        pass
+
+    def orders_cleared(self) -> None:
+        pass
+
+    def detach(self) -> None:
+        """Stop following the order book of the source market."""
+        if self._order_book is not None:
+            self._order_book.remove_listener(self)
+            self._order_book = None
+
+    def _enqueue(self, order_id: str) -> None:
+        if order_id in self._young_order_ids or order_id in self._due_order_ids:
+            return
+        self._parked_order_ids.discard(order_id)
+        heappush(self._young_orders,
+                 (self.ages[order_id], self._sequence_numbers[order_id], order_id))
+        self._young_order_ids.add(order_id)
+
+    def _add(self, order_id: str, age: int) -> None:
+        self.ages[order_id] = age
+        self._sequence_numbers[order_id] = self._next_sequence_number
+        self._next_sequence_number += 1
+        self._enqueue(order_id)
+
+    def _remove(self, order_id: str) -> Optional[int]:
+        self._sequence_numbers.pop(order_id, None)
+        self._young_order_ids.discard(order_id)
+        self._due_order_ids.pop(order_id, None)
+        self._parked_order_ids.discard(order_id)
+        return self.ages.pop(order_id, None)
+
+    def age_new_orders(self, orders: Mapping[str, Order], current_tick: int) -> None:
+        """Age the orders of the source market that have not been seen before."""
+        if self._order_book is not None and self._order_book is orders:
+            order_ids = sorted((order_id for order_id in self._unaged_order_ids
+                                if order_id in orders),
+                               key=orders.insertion_position)
+        else:
+            self.detach()
+            if isinstance(orders, OrderBook):
+                orders.add_listener(self)
+                self._order_book = orders
+            order_ids = list(orders.keys())
+        self._unaged_order_ids = {}
+
+        for order_id in order_ids:
+            if order_id in self.ages:
+                # Orders that were added to the market again are visited again (if not queued)
+                if order_id in self._sequence_numbers:
+                    self._enqueue(order_id)
+            else:
+                self._add(order_id, current_tick)
+
+    def pop_due_order_ids(self, current_tick: int, min_age: int,
+                          market_orders: Optional[Mapping[str, Order]] = None) -> List[str]:
+        """
+        Return the ids of the orders that are old enough to be forwarded, in the order in which
+        they were aged, or in the order of market_orders (the orders of the source market).
+        """
+        young_orders = self._young_orders
+        while young_orders and young_orders[0][0] + min_age <= current_tick:
+            _, sequence_number, order_id = heappop(young_orders)
+            if (order_id in self._young_order_ids and
+                    self._sequence_numbers.get(order_id) == sequence_number):
+                self._young_order_ids.remove(order_id)
+                self._due_order_ids[order_id] = sequence_number
+
+        if market_orders is not None:
+            if market_orders is self._order_book:
+                get_position = market_orders.insertion_position
+            else:
+                get_position = {order_id: position
+                                for position, order_id in enumerate(market_orders)}.__getitem__
+            # Orders that are not in the market any more are returned first
+            due_order_ids = sorted(
+                self._due_order_ids,
+                key=lambda order_id: (get_position(order_id)
+                                      if order_id in market_orders else -1))
+        else:
+            due_order_ids = sorted(self._due_order_ids, key=self._due_order_ids.__getitem__)
+        # The minimum age could have been increased since the orders became due
+        return [order_id for order_id in due_order_ids
+                if current_tick - self.ages[order_id] >= min_age]
+
+    def park(self, order_id: str) -> None:
+        """
+        Stop visiting the order (e.g. because it has been forwarded or can not be forwarded),
+        until it is released or added to the market again. The age of the order is kept.
+        """
+        if order_id in self._due_order_ids:
+            del self._due_order_ids[order_id]
+            self._parked_order_ids.add(order_id)
+
+    def release(self, order_id: str) -> None:
+        """Visit the parked order again on the next tick."""
+        if order_id in self._parked_order_ids:
+            self._enqueue(order_id)
+
+    def discard(self, order_id: str) -> None:
+        """Forget the age of the order; it is aged again if it is still in the market."""
+        if self._remove(order_id) is not None:
+            self._unaged_order_ids[order_id] = None
+
+    def rename(self, order_id: str, new_order_id: str) -> None:
+        """Transfer the age of the order to the new order (e.g. the residual of a split)."""
+        age = self.ages[order_id]
+        self.discard(order_id)
+        self._remove(new_order_id)
+        self._add(new_order_id, age)
+
+    def get_next_due_tick(self, current_tick: int, min_age: int,
+                          forwarded_order_ids: Mapping) -> Optional[int]:
+        """Return the next tick on which an order that has not been forwarded becomes due."""
+        next_ticks = [
+            age + min_age for age, sequence_number, order_id in self._young_orders
+            if order_id in self._young_order_ids and order_id not in forwarded_order_ids and
+            self._sequence_numbers.get(order_id) == sequence_number and
+            age + min_age > current_tick]
+        next_ticks.extend(
+            self.ages[order_id] + min_age for order_id in self._due_order_ids
+            if order_id not in forwarded_order_ids and
+            self.ages[order_id] + min_age > current_tick)
+        return min(next_ticks) if next_ticks else None
+
+
+class HeldBackBids(OrderBookListener):
+    """
+    Bids of the source market of a market agent engine that are not forwarded, because no offer
+    of the markets above can match them (see MATCHABLE_BID_FORWARDING).
+
+    The engine parks these bids in its pending orders, and releases them once an offer was added
+    to one of the markets above, whose energy rate is not higher than the rate of the bid. For
+    that the offer order books of these markets are followed. Order books that do not report
+    their deltas lead to the release of all bids on every tick instead.
+    """
+
+    def __init__(self):
+        # bid_id -> energy_rate of the held back bids
+        self._bid_rates: Dict[str, float] = {}
+        self._order_books: List[Mapping[str, Order]] = []
+        self._lowest_added_offer_rate: Optional[float] = None
+
+    def hold_back(self, bid: Order, offer_order_books: Iterable[Mapping[str, Order]]) -> None:
+        """Hold the bid back until a matching offer is added to one of the order books."""
+        self._bid_rates[bid.id] = bid.energy_rate
+        offer_order_books = list(offer_order_books)
+        if (len(offer_order_books) != len(self._order_books) or
+                any(order_book is not followed_order_book for order_book, followed_order_book
+                    in zip(offer_order_books, self._order_books))):
+            self.detach()
+            for order_book in offer_order_books:
+                if isinstance(order_book, OrderBook):
+                    order_book.add_listener(self)
+            self._order_books = offer_order_books
+
+    def discard(self, bid_id: str) -> None:
+        """Stop holding back the bid (e.g. because it was deleted from the source market)."""
+        self._bid_rates.pop(bid_id, None)
+
+    def pop_releasable_bid_ids(self) -> List[str]:
+        """Return the bids that can be matched by the offers that were added since the last call.
+
+        The grid fees lower the rate of the bid in the markets above, therefore the engine has
+        to check the released bids again.
+        """
+        if not all(isinstance(order_book, OrderBook) for order_book in self._order_books):
+            bid_ids = list(self._bid_rates)
+        elif self._lowest_added_offer_rate is None:
+            return []
+        else:
+            bid_ids = [
+                bid_id for bid_id, energy_rate in self._bid_rates.items()
+                if energy_rate + FLOATING_POINT_TOLERANCE >= self._lowest_added_offer_rate]
+        self._lowest_added_offer_rate = None
+        for bid_id in bid_ids:
+            del self._bid_rates[bid_id]
+        return bid_ids
+
+    def order_added(self, order_id: str, order: Order) -> None:
+        if self._bid_rates and (self._lowest_added_offer_rate is None or
+                                order.energy_rate < self._lowest_added_offer_rate):
+            self._lowest_added_offer_rate = order.energy_rate
+
+    def order_removed(self, order_id: str) -> None:
+        pass
+
+    def orders_cleared(self) -> None:
+        pass
+
+    def detach(self) -> None:
+        """Stop following the offer order books."""
+        for order_book in self._order_books:
+            if isinstance(order_book, OrderBook):
+                order_book.remove_listener(self)
+        self._order_books = []
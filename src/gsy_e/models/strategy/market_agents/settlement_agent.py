@@ -15,11 +15,16 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
+from typing import List, Optional, TYPE_CHECKING
+
 from gsy_framework.constants_limits import ConstSettings
 
 from gsy_e.models.strategy.market_agents.two_sided_agent import TwoSidedAgent
 from gsy_e.models.strategy.market_agents.two_sided_engine import TwoSidedEngine
 
+if TYPE_CHECKING:
+    from gsy_e.models.market import MarketBase
+
 
 class SettlementAgent(TwoSidedAgent):
     """
@@ -44,3 +49,7 @@ class SettlementAgent(TwoSidedAgent):
             TwoSidedEngine('Low -> High', self.lower_market, self.higher_market,
                            self.min_offer_age, self.min_bid_age, self),
         ]
+
+    def get_markets_above_higher_market(self) -> Optional[List["MarketBase"]]:
+        # The settlement markets of the ancestor areas are not looked up.
+        return None
@@ -15,12 +15,17 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
+from typing import List, Optional, TYPE_CHECKING
+
 from gsy_framework.constants_limits import ConstSettings
 from numpy.random import random
 
 from gsy_e.models.strategy.market_agents.one_sided_agent import OneSidedAgent
 from gsy_e.models.strategy.market_agents.two_sided_engine import TwoSidedEngine
 
+if TYPE_CHECKING:
+    from gsy_e.models.market import MarketBase
+
 
 class TwoSidedAgent(OneSidedAgent):
     """Handles order forwarding between two sided markets."""
@@ -45,6 +50,17 @@ class TwoSidedAgent(OneSidedAgent):
                            self.min_bid_age, self),
         ]
 
+    def get_markets_above_higher_market(self) -> Optional[List["MarketBase"]]:
+        markets = []
+        area = self.owner.parent.parent if self.owner.parent else None
+        while area is not None:
+            market = area.get_market(self.higher_market.time_slot)
+            if market is None:
+                break
+            markets.append(market)
+            area = area.parent
+        return markets
+
     def usable_bid(self, bid):
         """Prevent MAEngines from trading their counterpart's bids."""
         return all(bid.id not in engine.forwarded_bids.keys() for engine in self.engines)
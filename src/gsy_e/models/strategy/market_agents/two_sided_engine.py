@@ -16,16 +16,19 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 from collections import namedtuple
-from typing import Dict, TYPE_CHECKING
+from typing import Dict, List, Optional, TYPE_CHECKING
 
 from gsy_framework.data_classes import Bid
 
+import gsy_e.constants
 from gsy_e.constants import FLOATING_POINT_TOLERANCE
 from gsy_e.gsy_e_core.exceptions import BidNotFoundException, MarketException
 from gsy_e.gsy_e_core.util import short_offer_bid_log_str
 from gsy_e.models.strategy.market_agents.one_sided_engine import MAEngine
+from gsy_e.models.strategy.market_agents.pending_orders import HeldBackBids, PendingOrders
 
 if TYPE_CHECKING:
+    from gsy_e.models.market import MarketBase
     from gsy_e.models.strategy.market_agents.market_agent import MarketAgent
 
 BidInfo = namedtuple("BidInfo", ("source_bid", "target_bid"))
@@ -41,7 +44,11 @@ class TwoSidedEngine(MAEngine):
         self.forwarded_bids: Dict[str, BidInfo] = {}
         self.bid_trade_residual: Dict[str, Bid] = {}
         self.min_bid_age = min_bid_age
-        self.bid_age: Dict[str, int] = {}
+        # Ages of the bids of the source market, and bids that wait to be forwarded
+        self._pending_bids = PendingOrders()
+        self.bid_age: Dict[str, int] = self._pending_bids.ages
+        # Bids that no offer of the markets above can match yet
+        self._held_back_bids = HeldBackBids()
 
     def __repr__(self):
         return "<TwoSidedPayAsBidEngine [{s.owner.name}] {s.name} " \
@@ -61,27 +68,35 @@ class TwoSidedEngine(MAEngine):
             requirements.append(updated_requirement)
         return requirements
 
-    def _forward_bid(self, bid):
+    def _get_forwarded_bid_arguments(self, bid: Bid) -> Dict:
+        return {
+            "price": (self.markets.source.fee_class.update_forwarded_bid_with_fee(
+                bid.energy_rate, bid.original_price / bid.energy)) * bid.energy,
+            "energy": bid.energy,
+            "buyer": self.owner.name,
+            "original_price": bid.original_price,
+            "buyer_origin": bid.buyer_origin,
+            "buyer_origin_id": bid.buyer_origin_id,
+            "buyer_id": self.owner.uuid,
+            "time_slot": bid.time_slot,
+            "requirements": self._update_requirements_prices(bid),
+            "attributes": bid.attributes
+        }
+
+    def _can_post_bid(self, bid: Bid) -> bool:
         if bid.buyer == self.markets.target.name:
-            return None
+            return False
 
         if bid.price < 0.0:
             self.owner.log.debug("Bid is not forwarded because price < 0")
+            return False
+        return True
+
+    def _forward_bid(self, bid):
+        if not self._can_post_bid(bid):
             return None
         try:
-            forwarded_bid = self.markets.target.bid(
-                price=(self.markets.source.fee_class.update_forwarded_bid_with_fee(
-                    bid.energy_rate, bid.original_price / bid.energy)) * bid.energy,
-                energy=bid.energy,
-                buyer=self.owner.name,
-                original_price=bid.original_price,
-                buyer_origin=bid.buyer_origin,
-                buyer_origin_id=bid.buyer_origin_id,
-                buyer_id=self.owner.uuid,
-                time_slot=bid.time_slot,
-                requirements=self._update_requirements_prices(bid),
-                attributes=bid.attributes
-            )
+            forwarded_bid = self.markets.target.bid(**self._get_forwarded_bid_arguments(bid))
         except MarketException:
             self.owner.log.debug("Bid is not forwarded because grid fees of the target market "
                                  "lead to a negative bid price.")
@@ -91,14 +106,46 @@ class TwoSidedEngine(MAEngine):
         self.owner.log.trace(f"Forwarding bid {bid} to {forwarded_bid}")
         return forwarded_bid
 
+    def _forward_bids(self, bids: List[Bid]) -> Dict[str, Bid]:
+        """
+        Forward the bids to the target market at once.
+        Returns: mapping of the ids of the forwarded bids to the bids of the target market
+        """
+        bids = [bid for bid in bids if self._can_post_bid(bid)]
+        posted_bids = self.markets.target.bids_bulk(
+            [self._get_forwarded_bid_arguments(bid) for bid in bids])
+        forwarded_bids = {}
+        for bid, forwarded_bid in zip(bids, posted_bids):
+            if forwarded_bid is None:
+                self.owner.log.debug("Bid is not forwarded because grid fees of the target "
+                                     "market lead to a negative bid price.")
+                continue
+            self._add_to_forward_bids(bid, forwarded_bid)
+            self.owner.log.trace(f"Forwarding bid {bid} to {forwarded_bid}")
+            forwarded_bids[bid.id] = forwarded_bid
+        return forwarded_bids
+
     def _delete_forwarded_bid_entries(self, bid):
         bid_info = self.forwarded_bids.pop(bid.id, None)
         if not bid_info:
             return
         self.forwarded_bids.pop(bid_info.target_bid.id, None)
         self.forwarded_bids.pop(bid_info.source_bid.id, None)
-        self.bid_age.pop(bid_info.source_bid.id, None)
-        self.bid_age.pop(bid_info.target_bid.id, None)
+        self._pending_bids.discard(bid_info.source_bid.id)
+        self._pending_bids.discard(bid_info.target_bid.id)
+        # The bids are not forwarded by the agent any more, thus they become usable
+        for engine in self.owner.engines:
+            engine.release_bid(bid_info.target_bid.id)
+            engine.release_bid(bid_info.source_bid.id)
+
+    def release_bid(self, bid_id: str) -> None:
+        """Check again whether the bid of the source market can be forwarded."""
+        self._pending_bids.release(bid_id)
+
+    def detach(self) -> None:
+        super().detach()
+        self._pending_bids.detach()
+        self._held_back_bids.detach()
 
     def _should_forward_bid(self, bid, current_tick):
 
@@ -116,16 +163,87 @@ class TwoSidedEngine(MAEngine):
 
         return True
 
+    def _get_bid_matching_markets(self) -> Optional[List["MarketBase"]]:
+        """
+        Return the target market and the markets above it, in which the forwarded bids can be
+        matched (see MATCHABLE_BID_FORWARDING), None if all bids are forwarded.
+        """
+        if (not gsy_e.constants.MATCHABLE_BID_FORWARDING or
+                self.markets.target is not self.owner.higher_market):
+            return None
+        markets_above = self.owner.get_markets_above_higher_market()
+        if markets_above is None:
+            return None
+        return [self.markets.target, *markets_above]
+
+    def _can_bid_be_matched_above(
+            self, bid: Bid, matching_markets: Optional[List["MarketBase"]]) -> bool:
+        """
+        Return whether the bid can be matched with an offer of the matching markets. The rate of
+        the bid is reduced by the grid fees of all markets that it would pass until it reaches
+        each of the markets.
+        """
+        if matching_markets is None or bid.requirements:
+            return True
+
+        original_energy_rate = bid.original_price / bid.energy
+        energy_rate = bid.energy_rate
+        fee_market = self.markets.source
+        for market in matching_markets:
+            energy_rate = fee_market.fee_class.update_forwarded_bid_with_fee(
+                energy_rate, original_energy_rate)
+            best_offer_rate = market.offers.best_energy_rate()
+            if (best_offer_rate is not None and
+                    best_offer_rate <= energy_rate + FLOATING_POINT_TOLERANCE):
+                return True
+            fee_market = market
+        return False
+
     # pylint: disable=unused-argument
     def tick(self, *, area):
         super().tick(area=area)
 
-        for bid in self.markets.source.get_bids().values():
-            if bid.id not in self.bid_age:
-                self.bid_age[bid.id] = area.current_tick
-
-            if self._should_forward_bid(bid, area.current_tick):
-                self._forward_bid(bid)
+        source_bids = self.markets.source.bids
+        self._pending_bids.age_new_orders(source_bids, area.current_tick)
+        for bid_id in self._held_back_bids.pop_releasable_bid_ids():
+            self._pending_bids.release(bid_id)
+        # In the bulk mode the due bids are collected and forwarded together
+        bulk_forwarding = self._is_bulk_forwarding_enabled()
+        due_bids = []
+        # The due bids are visited in the order of the source market
+        due_bid_ids = self._pending_bids.pop_due_order_ids(
+            area.current_tick, self.min_bid_age, source_bids)
+        matching_markets = self._get_bid_matching_markets() if due_bid_ids else None
+        for bid_id in due_bid_ids:
+            bid = source_bids.get(bid_id)
+            if bid is None or not self._should_forward_bid(bid, area.current_tick):
+                # Bids that can not be forwarded are visited again once they are released by
+                # the counterpart engine or posted to the market again
+                self._pending_bids.park(bid_id)
+            elif not self._can_bid_be_matched_above(bid, matching_markets):
+                # Visited again once a matching offer is posted to one of the markets
+                self._pending_bids.park(bid_id)
+                self._held_back_bids.hold_back(
+                    bid, (market.offers for market in matching_markets))
+            elif bulk_forwarding:
+                due_bids.append(bid)
+            elif self._forward_bid(bid):
+                self._pending_bids.park(bid_id)
+
+        if due_bids:
+            for bid_id in self._forward_bids(due_bids):
+                self._pending_bids.park(bid_id)
+
+    def get_next_wake_up_tick(self, current_tick: int) -> Optional[int]:
+        """Return the next tick on which an offer or a bid will become old enough to be
+        forwarded."""
+        next_bid_tick = self._pending_bids.get_next_due_tick(
+            current_tick, self.min_bid_age, self.forwarded_bids)
+        next_ticks = [next_bid_tick] if next_bid_tick is not None else []
+        next_offer_tick = super().get_next_wake_up_tick(current_tick)
+        if next_offer_tick is not None:
+            next_ticks.append(next_offer_tick)
+        return min(next_ticks) if next_ticks else None
 
     def _delete_forwarded_bids(self, bid_info):
         try:
@@ -180,13 +298,13 @@ class TwoSidedEngine(MAEngine):
                 seller_id=self.owner.uuid
             )
             self._delete_forwarded_bids(bid_info)
-            self.bid_age.pop(bid_info.source_bid.id, None)
+            self._pending_bids.discard(bid_info.source_bid.id)
 
         elif bid_trade.offer_bid.id == bid_info.source_bid.id:
             # Bid was traded in the source market by someone else
 
             self._delete_forwarded_bids(bid_info)
-            self.bid_age.pop(bid_info.source_bid.id, None)
+            self._pending_bids.discard(bid_info.source_bid.id)
 
             # Forward the residual bid since the original offer was also forwarded
             if bid_trade.residual:
@@ -201,7 +319,10 @@ class TwoSidedEngine(MAEngine):
         bid_info = self.forwarded_bids.get(bid_id)
 
         if not bid_info:
-            # Deletion doesn't concern us
+            # Bids of the source market that were not forwarded (e.g. held back) are forgotten,
+            # strategies post their updated bids with new ids
+            self._held_back_bids.discard(bid_id)
+            self._pending_bids.discard(bid_id)
             return
 
         if bid_info.source_bid.id == bid_id:
@@ -212,7 +333,7 @@ class TwoSidedEngine(MAEngine):
             except MarketException:
                 self.owner.log.exception("Error deleting MarketAgent bid")
         self._delete_forwarded_bid_entries(bid_info.source_bid)
-        self.bid_age.pop(bid_info.source_bid.id, None)
+        self._pending_bids.discard(bid_info.source_bid.id)
 
     def event_bid_split(self, *, market_id: str, original_bid: Bid,
                         accepted_bid: Bid, residual_bid: Bid) -> None:
@@ -236,7 +357,7 @@ class TwoSidedEngine(MAEngine):
             self._add_to_forward_bids(local_residual_bid, residual_bid)
             self._add_to_forward_bids(local_split_bid, accepted_bid)
 
-            self.bid_age[local_residual_bid.id] = self.bid_age.pop(local_bid.id)
+            self._pending_bids.rename(local_bid.id, local_residual_bid.id)
 
         elif market == self.markets.source and accepted_bid.id in self.forwarded_bids:
             # bid in the source market was split, also split the corresponding forwarded bid
@@ -256,7 +377,7 @@ class TwoSidedEngine(MAEngine):
             self._add_to_forward_bids(residual_bid, local_residual_bid)
             self._add_to_forward_bids(accepted_bid, local_split_bid)
 
-            self.bid_age[residual_bid.id] = self.bid_age.pop(original_bid.id)
+            self._pending_bids.rename(original_bid.id, residual_bid.id)
 
         else:
             return
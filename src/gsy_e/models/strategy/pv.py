@@ -222,6 +222,9 @@ class PVStrategy(BidEnabledStrategy):
         self._settlement_market_strategy.event_tick(self)
         self._future_market_strategy.event_tick(self)
 
+    def get_next_wake_up_tick(self):
+        return self._get_next_wake_up_tick_from_updaters([self.offer_update])
+
     def set_produced_energy_forecast_in_state(self, reconfigure=True):
         # This forecast is based on the real PV system data provided by enphase
         # They can be found in the tools folder
@@ -363,6 +363,9 @@ class StorageStrategy(BidEnabledStrategy):
 
         self._future_market_strategy.event_tick(self)
 
+    def get_next_wake_up_tick(self):
+        return self._get_next_wake_up_tick_from_updaters([self.bid_update, self.offer_update])
+
     def event_offer_traded(self, *, market_id, trade):
 
         super().event_offer_traded(market_id=market_id, trade=trade)
@@ -16,7 +16,8 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 import logging
-from typing import TYPE_CHECKING, Callable, List
+from math import ceil
+from typing import TYPE_CHECKING, Callable, List, Optional
 
 from gsy_framework.constants_limits import ConstSettings, GlobalConfig
 from gsy_framework.read_user_profile import InputProfileTypes
@@ -56,6 +57,10 @@ class TemplateStrategyUpdaterInterface:
     def update(self, market: "OneSidedMarket", strategy: "BaseStrategy") -> None:
         """Update the price of existing orders to reflect the new rates."""
 
+    def get_next_update_tick(self, strategy: "BaseStrategy") -> Optional[int]:
+        """Return the next tick on which the prices will be updated (None: no update planned)."""
+        return None
+
 
 class TemplateStrategyUpdaterBase(TemplateStrategyUpdaterInterface):
     """Manage template strategy bid / offer posting. Updates periodically the energy rate
@@ -238,6 +243,25 @@ class TemplateStrategyUpdaterBase(TemplateStrategyUpdaterInterface):
         return self._elapsed_seconds(strategy) >= (
             self.update_interval.seconds * self.update_counter[time_slot])
 
+    def get_next_update_tick(self, strategy: "BaseStrategy") -> Optional[int]:
+        """Return the first tick on which time_for_price_update will be true for any of the
+        available time slots, or None if no more updates are due in the current slot."""
+        tick_length_seconds = strategy.area.config.tick_length.seconds
+        ticks_per_slot = int(self._time_slot_duration_in_seconds / tick_length_seconds)
+        if ticks_per_slot <= 0:
+            return None
+        slot_start_tick = strategy.area.current_tick - strategy.area.current_tick % ticks_per_slot
+        next_ticks = []
+        for time_slot in self._get_all_time_slots(strategy.area):
+            if time_slot not in self.update_counter:
+                continue
+            elapsed_ticks = ceil(
+                self.update_interval.seconds * self.update_counter[time_slot] /
+                tick_length_seconds)
+            if elapsed_ticks < ticks_per_slot:
+                next_ticks.append(slot_start_tick + elapsed_ticks)
+        return min(next_ticks) if next_ticks else None
+
     def set_parameters(self, *, initial_rate: float = None, final_rate: float = None,
                        energy_rate_change_per_update: float = None, fit_to_limit: bool = None,
                        update_interval: int = None) -> None:
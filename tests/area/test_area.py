@@ -308,6 +308,30 @@ class TestEventDispatcher:
         area.dispatcher.event_listener(AreaEvent.MARKET_CYCLE)
         assert area.strategy.event_on_disabled_area.call_count == 1
 
+    @staticmethod
+    def test_now_config_and_spot_market_are_cached_until_the_next_tick(config):
+        area = Area(name="Street", children=[Area(name="House")], config=config)
+        area.activate()
+        spot_market = area.spot_market
+        now_value = area.now
+        assert area.config is config
+        # A Mock does not support indexing, therefore a recalculation would raise an error.
+        with patch.object(Area, "all_markets", new_callable=Mock):
+            assert area.spot_market is spot_market
+            assert area.now is now_value
+
+        area.execute_own_actions_after_tick_event()
+        assert area.now == now_value + config.tick_length
+        assert area.spot_market is spot_market
+
+    @staticmethod
+    def test_now_is_not_cached_for_inactive_areas(config):
+        area = Area(name="Street", children=[Area(name="House")], config=config)
+        now_value = area.now
+        area.current_tick = 2
+        assert area.now == now_value + 2 * config.tick_length
+        assert area._cached_now is None
+
     @staticmethod
     def test_duplicate_area_in_the_same_parent_append():
         area = Area(name="Street", children=[Area(name="House")], )
@@ -0,0 +1,108 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from typing import List
+from unittest.mock import MagicMock
+
+import pytest
+
+from gsy_e.events.event_structures import AreaEvent
+from gsy_e.models.area.area_tree_index import AreaTreeIndex
+
+
+def _create_area(name: str, calls: List, children: List = None, has_strategy: bool = False):
+    area = MagicMock(name=name)
+    area.name = name
+    area.children = children or []
+    area.events.is_enabled = True
+    area.events.is_connected = True
+    area.tick.side_effect = lambda: calls.append(("tick", name))
+    area.dispatcher.broadcast_notification_to_agents.side_effect = (
+        lambda *args, **kwargs: calls.append(("agents", name)))
+    area.strategy = MagicMock() if has_strategy else None
+    if has_strategy:
+        area.strategy.event_listener.side_effect = (
+            lambda *args, **kwargs: calls.append(("strategy", name)))
+    return area
+
+
+@pytest.fixture(name="area_tree")
+def area_tree_fixture():
+    """Return a grid with two houses and the list that the event calls are recorded to."""
+    calls = []
+    house1 = _create_area("House 1", calls, [_create_area("Load 1", calls, has_strategy=True)])
+    house2 = _create_area("House 2", calls, [_create_area("PV 2", calls, has_strategy=True)])
+    grid = _create_area("Grid", calls, [house1, house2])
+    return grid, calls
+
+
+class TestAreaTreeIndex:
+
+    @staticmethod
+    def test_rebuild_indexes_areas_in_pre_order(area_tree):
+        grid, _ = area_tree
+        index = AreaTreeIndex(grid)
+        assert [area.name for area in index.areas] == [
+            "Grid", "House 1", "Load 1", "House 2", "PV 2"]
+        assert index.children_indices == [(1, 3), (2,), (), (4,), ()]
+
+        grid.children[1].children = []
+        index.rebuild()
+        assert [area.name for area in index.areas] == ["Grid", "House 1", "Load 1", "House 2"]
+
+    @staticmethod
+    def test_tick_and_dispatch_dispatches_children_before_parents(area_tree):
+        grid, calls = area_tree
+        AreaTreeIndex(grid).tick_and_dispatch()
+        assert calls.index(("strategy", "Load 1")) < calls.index(("agents", "House 1"))
+        assert calls.index(("tick", "House 1")) < calls.index(("agents", "Grid"))
+        assert calls.index(("tick", "House 2")) < calls.index(("agents", "Grid"))
+        assert calls[-2:] == [("agents", "Grid"), ("tick", "Grid")]
+        assert len(calls) == 10
+        grid.children[0].children[0].strategy.event_listener.assert_called_once_with(
+            AreaEvent.TICK)
+
+    @staticmethod
+    def test_tick_and_dispatch_skips_disabled_areas(area_tree):
+        grid, calls = area_tree
+        grid.children[1].events.is_enabled = False
+        AreaTreeIndex(grid).tick_and_dispatch()
+        assert not [call for call in calls if call[1] in ["House 2", "PV 2"]]
+
+    @staticmethod
+    def test_tick_and_dispatch_skips_strategies_of_areas_disabled_by_the_tick(area_tree):
+        grid, calls = area_tree
+        load = grid.children[0].children[0]
+
+        def disable_load():
+            calls.append(("tick", "Load 1"))
+            load.events.is_enabled = False
+        load.tick.side_effect = disable_load
+
+        AreaTreeIndex(grid).tick_and_dispatch()
+        assert ("tick", "Load 1") in calls
+        load.strategy.event_listener.assert_not_called()
+
+    @staticmethod
+    def test_execute_actions_after_tick_event_and_set_current_tick_visit_all_areas(area_tree):
+        grid, _ = area_tree
+        index = AreaTreeIndex(grid)
+        index.execute_actions_after_tick_event()
+        index.set_current_tick(42)
+        for area in index.areas:
+            area.execute_own_actions_after_tick_event.assert_called_once()
+            assert area.current_tick == 42
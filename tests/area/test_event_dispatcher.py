@@ -17,14 +17,16 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from typing import Dict, Union
-from unittest.mock import MagicMock, Mock, call
+from unittest.mock import MagicMock, Mock, call, patch
 
 import pytest
 from gsy_framework.constants_limits import ConstSettings, GlobalConfig
 from gsy_framework.enums import SpotMarketTypeEnum
+from numpy import random
 from pendulum import DateTime, datetime
 from pendulum import duration
 
+from gsy_e.events import get_overridden_market_event_handlers
 from gsy_e.events.event_structures import MarketEvent, AreaEvent
 from gsy_e.models.area import Area
 from gsy_e.models.area.event_dispatcher import AreaDispatcher
@@ -254,3 +256,58 @@ class TestAreaDispatcher:
         else:
             (area_dispatcher._broadcast_notification_to_area_and_child_agents.
                 assert_called_once_with(expected_market_type, event_type, **kwargs))
+
+    @staticmethod
+    @patch("gsy_e.constants.MARKET_EVENT_SUBSCRIPTIONS", True)
+    def test_broadcast_notification_only_dispatches_market_events_to_subscribers(
+            area_dispatcher):
+        children = area_dispatcher.area.children
+        children[0].strategy = MagicMock()
+        children[0].strategy.get_market_event_subscriptions.return_value = frozenset(
+            {MarketEvent.OFFER})
+        for child in children:
+            child.dispatcher.event_listener = Mock()
+        area_dispatcher._broadcast_notification_to_area_and_child_agents = Mock()
+        kwargs = {"market_id": area_dispatcher.area.spot_market.id}
+
+        random.seed(0)
+        area_dispatcher.broadcast_notification(MarketEvent.OFFER, **kwargs)
+        area_dispatcher.broadcast_notification(MarketEvent.BID_TRADED, **kwargs)
+        # The same random numbers are drawn as for the shuffling of all children.
+        next_random_number = random.random()
+        random.seed(0)
+        random.random(2 * len(children))
+        assert next_random_number == random.random()
+
+        children[0].dispatcher.event_listener.assert_called_once_with(MarketEvent.OFFER, **kwargs)
+        children[1].dispatcher.event_listener.assert_not_called()
+
+        area_dispatcher.broadcast_notification(AreaEvent.TICK)
+        children[1].dispatcher.event_listener.assert_called_once_with(AreaEvent.TICK)
+
+    @staticmethod
+    @patch("gsy_e.constants.MARKET_EVENT_SUBSCRIPTIONS", True)
+    def test_broadcast_notification_dispatches_offers_bulk_to_offer_subscribers(
+            area_dispatcher):
+        children = area_dispatcher.area.children
+        children[0].strategy = MagicMock()
+        children[0].strategy.get_market_event_subscriptions.return_value = frozenset(
+            {MarketEvent.OFFER})
+        for child in children:
+            child.dispatcher.event_listener = Mock()
+        area_dispatcher._broadcast_notification_to_area_and_child_agents = Mock()
+        kwargs = {"market_id": area_dispatcher.area.spot_market.id, "offers": []}
+
+        area_dispatcher.broadcast_notification(MarketEvent.OFFERS_BULK, **kwargs)
+
+        children[0].dispatcher.event_listener.assert_called_once_with(
+            MarketEvent.OFFERS_BULK, **kwargs)
+        children[1].dispatcher.event_listener.assert_not_called()
+
+    @staticmethod
+    def test_market_agents_subscribe_to_the_events_they_handle():
+        assert get_overridden_market_event_handlers(OneSidedAgent) == {
+            MarketEvent.OFFER_TRADED, MarketEvent.OFFER_DELETED, MarketEvent.OFFER_SPLIT}
+        assert get_overridden_market_event_handlers(TwoSidedAgent) == {
+            MarketEvent.OFFER_TRADED, MarketEvent.OFFER_DELETED, MarketEvent.OFFER_SPLIT,
+            MarketEvent.BID_TRADED, MarketEvent.BID_DELETED, MarketEvent.BID_SPLIT}
@@ -25,7 +25,8 @@ from pendulum import datetime, duration, now
 
 from gsy_e.models.area import Area
 from gsy_e.models.market import GridFee
-from gsy_e.models.market.future import FutureMarkets, FutureMarketException, FutureOrders
+from gsy_e.models.market.future import (
+    FutureMarkets, FutureMarketException, FutureOrders, FutureTrades)
 
 DEFAULT_CURRENT_MARKET_SLOT = datetime(2021, 10, 19, 0, 0)
 DEFAULT_SLOT_LENGTH = duration(minutes=15)
@@ -334,3 +335,20 @@ class TestFutureOrders:
         del offers[str(offer.id)]
         assert str(offer.id) not in offers
         assert offer not in offers.slot_order_mapping[offer.time_slot]
+
+
+class TestFutureTrades:
+    """Tester class for the future trades list."""
+
+    @staticmethod
+    def test_future_trades_are_mapped_to_their_time_slot(offer):
+        """Check whether appending and reassigning trades keeps the slot_trade_mapping."""
+        time_slot = offer.time_slot
+        trades = FutureTrades([Trade("tid1", time_slot, offer, "seller", "buyer",
+                                     time_slot=time_slot, traded_energy=1, trade_price=1)])
+        trade = Trade("tid2", time_slot, offer, "seller", "buyer",
+                      time_slot=time_slot, traded_energy=1, trade_price=1)
+        trades.append(trade)
+        assert len(trades) == 2
+        assert [t.id for t in trades.slot_trade_mapping[time_slot]] == ["tid1", "tid2"]
+        assert trades[-1:].slot_trade_mapping == {time_slot: [trade]}
@@ -17,7 +17,7 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 import string
 from copy import deepcopy
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from uuid import uuid4
 
 import pytest
@@ -37,6 +37,7 @@ from gsy_e.gsy_e_core.exceptions import (DeviceNotInRegistryError, InvalidBalanc
                                          OfferNotFoundException)
 from gsy_e.gsy_e_core.util import add_or_create_key, subtract_or_create_key
 from gsy_e.events.event_structures import MarketEvent
+from gsy_e.models.market import RLOCK_MEMBER_NAME
 from gsy_e.models.market.balancing import BalancingMarket
 from gsy_e.models.market.one_sided import OneSidedMarket
 from gsy_e.models.market.settlement import SettlementMarket
@@ -335,6 +336,21 @@ def test_market_acct_multiple(market=OneSidedMarket(bc=NonBlockchainInterface(st
     assert market.bought_energy("C") == offer2.energy == 10
 
 
+def test_market_participant_trade_stats(market=OneSidedMarket(
+        bc=NonBlockchainInterface(str(uuid4())), time_slot=now())):
+    offer1 = market.offer(10, 20, "A", "A")
+    offer2 = market.offer(10, 10, "A", "A")
+    trade1 = market.accept_offer(offer1, "B")
+    trade2 = market.accept_offer(offer2, "C")
+
+    assert market.total_earned("A") == sum(trade.trade_price for trade in market.trades)
+    assert market.total_spent("B") == trade1.trade_price
+    assert market.total_spent("A") == market.total_earned("B") == 0
+    assert market.get_trades_by_participant("A") == [trade1, trade2]
+    assert market.get_trades_by_participant("C") == [trade2]
+    assert market.get_trades_by_participant("D") == []
+
+
 @pytest.mark.parametrize("market, offer", [
     (OneSidedMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()), "offer"),
     (BalancingMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()), "balancing_offer"),
@@ -493,6 +509,55 @@ def test_market_accept_offer_yields_partial_trade(market, offer, accept_offer):
             and trade.residual.energy == 3)
 
 
+def test_market_single_threaded_mode_creates_markets_without_lock():
+    with patch("gsy_e.constants.SINGLE_THREADED_MARKETS", True):
+        market = TwoSidedMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now())
+    assert getattr(market, RLOCK_MEMBER_NAME) is None
+    offer = market.offer(2.0, 4, "seller", "seller")
+    market.delete_offer(offer)
+    assert not market.offers
+    assert getattr(TwoSidedMarket(time_slot=now()), RLOCK_MEMBER_NAME) is not None
+
+
+def test_market_offers_bulk_dispatches_one_event_for_posted_offers(called):
+    market = OneSidedMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now(),
+                            notification_listener=called)
+    offers = market.offers_bulk([
+        {"price": 10, "energy": 20, "seller": "A", "seller_origin": "A"},
+        {"price": -1, "energy": 20, "seller": "A", "seller_origin": "A"},
+        {"price": 5, "energy": 2, "seller": "B", "seller_origin": "B"}])
+    assert offers[1] is None
+    assert list(market.offers.values()) == [offers[0], offers[2]]
+    assert market.offer_history == [offers[0], offers[2]]
+    assert len(called.calls) == 1
+    assert called.calls[0][0] == (repr(MarketEvent.OFFERS_BULK),)
+    assert called.calls[0][1] == {"offers": repr([offers[0], offers[2]]),
+                                  "market_id": repr(market.id)}
+
+
+def test_market_bids_bulk_posts_bids():
+    market = TwoSidedMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now())
+    bids = market.bids_bulk([
+        {"price": 10, "energy": 20, "buyer": "A", "buyer_origin": "A"},
+        {"price": -1, "energy": 20, "buyer": "A", "buyer_origin": "A"}])
+    assert bids[1] is None
+    assert list(market.bids.values()) == [bids[0]]
+    assert market.bid_history == [bids[0]]
+
+
+@pytest.mark.parametrize("bulk_method, orders_kwargs", [
+    ("offers_bulk", [{"price": 10, "energy": 2, "seller": "A", "seller_origin": "A"},
+                     {"price": 5, "energy": 2, "seller": "B", "seller_origin": "B"}]),
+    ("bids_bulk", [{"price": 10, "energy": 2, "buyer": "A", "buyer_origin": "A"},
+                   {"price": 5, "energy": 2, "buyer": "B", "buyer_origin": "B"}])])
+def test_market_bulk_methods_take_the_market_lock_once(bulk_method, orders_kwargs):
+    market = TwoSidedMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now())
+    setattr(market, RLOCK_MEMBER_NAME, MagicMock())
+    orders = getattr(market, bulk_method)(orders_kwargs)
+    assert None not in orders
+    getattr(market, RLOCK_MEMBER_NAME).__enter__.assert_called_once()
+
+
 class MarketStateMachine(RuleBasedStateMachine):
     offers = Bundle("Offers")
     actors = Bundle("Actors")
@@ -0,0 +1,89 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+from gsy_framework.data_classes import Bid, Offer
+from pendulum import now
+
+from gsy_e.models.market.order_book import OrderBook
+from gsy_e.models.myco_matcher.market_orders_mirror import MarketOrdersMirror
+
+
+@pytest.fixture(name="market")
+def market_fixture():
+    market = MagicMock()
+    market.offers = OrderBook({"offer1": Offer("offer1", now(), 10, 1, "seller")})
+    market.bids = OrderBook({"bid1": Bid("bid1", now(), 10, 1, "buyer")})
+    return market
+
+
+class TestMarketOrdersMirror:
+
+    @staticmethod
+    def test_unchanged_orders_are_serialized_once(market):
+        mirror = MarketOrdersMirror(market)
+        offer = market.offers["offer1"]
+        with patch.object(Offer, "serializable_dict", autospec=True,
+                          side_effect=lambda order: {"id": order.id}) as serializable_dict_mock:
+            assert mirror.serialize_order(offer) == {"id": "offer1"}
+            assert mirror.serialize_order(offer) == {"id": "offer1"}
+            assert serializable_dict_mock.call_count == 1
+
+            # Deltas of the order book invalidate the serialized copy of the order.
+            market.offers["offer1"] = offer
+            mirror.serialize_order(offer)
+            assert serializable_dict_mock.call_count == 2
+            market.offers.pop("offer1")
+            market.offers["offer1"] = offer
+            mirror.serialize_order(offer)
+            assert serializable_dict_mock.call_count == 3
+
+    @staticmethod
+    def test_orders_changed_in_place_are_serialized_again(market):
+        mirror = MarketOrdersMirror(market)
+        offer = market.offers["offer1"]
+        assert mirror.serialize_order(offer)["price"] == 10
+        offer.update_price(20)
+        assert mirror.serialize_order(offer) == offer.serializable_dict()
+        offer.energy = 2
+        assert mirror.serialize_order(offer) == offer.serializable_dict()
+
+    @staticmethod
+    def test_serialized_orders_are_copies(market):
+        mirror = MarketOrdersMirror(market)
+        bid = market.bids["bid1"]
+        mirror.serialize_order(bid)["energy"] = 100
+        assert mirror.serialize_order(bid) == bid.serializable_dict()
+
+    @staticmethod
+    def test_detach_stops_following_the_order_books(market):
+        mirror = MarketOrdersMirror(market)
+        assert mirror.is_mirroring(market)
+        mirror.detach()
+        assert not market.offers._listeners and not market.bids._listeners
+        market.offers = OrderBook()
+        assert not mirror.is_mirroring(market)
+
+    @staticmethod
+    def test_order_book_changes_increment_the_version(market):
+        mirror = MarketOrdersMirror(market)
+        market.offers["offer2"] = Offer("offer2", now(), 10, 1, "seller")
+        market.bids.pop("bid1")
+        market.offers.clear()
+        assert mirror.version == 3
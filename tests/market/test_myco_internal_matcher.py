@@ -0,0 +1,88 @@
+# pylint: disable=protected-access
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from gsy_e.models.myco_matcher import MycoInternalMatcher
+
+
+def _create_market(name, trades_occurred, applied_markets):
+    market = MagicMock(name=name)
+    trades_occurred = iter(trades_occurred)
+    market.match_recommendations.side_effect = (
+        lambda _: applied_markets.append(name) or next(trades_occurred))
+    return market
+
+
+@pytest.fixture(name="internal_matcher")
+def internal_matcher_fixture():
+    with patch("gsy_e.constants.MATCHING_WORKER_THREADS", 2):
+        matcher = MycoInternalMatcher()
+        matcher.activate()
+    yield matcher
+    matcher.event_finish()
+
+
+class TestMycoInternalMatcher:
+
+    @staticmethod
+    def test_match_recommendations_applies_concurrent_recommendations_in_order(
+            internal_matcher):
+        applied_markets = []
+        markets = {
+            name: _create_market(name, trades_occurred, applied_markets)
+            for name, trades_occurred in (("market1", [True, True, False]),
+                                          ("market2", [True, False]),
+                                          ("market3", [False]))}
+        internal_matcher.area_uuid_markets_mapping = {
+            "area1": {"markets": [markets["market1"]], "settlement_markets": [],
+                      "future_markets": None, "current_time": None},
+            "area2": {"markets": [markets["market2"], markets["market3"]],
+                      "settlement_markets": [], "future_markets": None, "current_time": None}}
+
+        with patch.object(internal_matcher, "_get_market_orders_mirror",
+                          side_effect=lambda _: SimpleNamespace(version=0)), \
+                patch.object(internal_matcher, "_get_market_recommendations",
+                             side_effect=lambda _, __, market, ___: [{"market": market}]), \
+                patch("gsy_e.models.myco_matcher.myco_internal_matcher.global_objects"):
+            internal_matcher.match_recommendations()
+
+        # Same order as without threads, every market is matched until no trades occur.
+        assert applied_markets == [
+            "market1", "market1", "market1", "market2", "market2", "market3"]
+        assert internal_matcher.area_uuid_markets_mapping == {}
+
+    @staticmethod
+    def test_match_recommendations_recalculates_recommendations_of_changed_markets(
+            internal_matcher):
+        market1 = MagicMock(name="market1")
+        market2 = MagicMock(name="market2")
+        mirrors = {market1: SimpleNamespace(version=0), market2: SimpleNamespace(version=0)}
+
+        def match_market1(_):
+            # The trades of market1 forward orders to market2.
+            mirrors[market2].version += 1
+            return market1.match_recommendations.call_count == 1
+
+        market1.match_recommendations.side_effect = match_market1
+        market2.match_recommendations.return_value = False
+        internal_matcher.area_uuid_markets_mapping = {
+            "area1": {"markets": [market1, market2], "settlement_markets": [],
+                      "future_markets": None, "current_time": None}}
+
+        with patch.object(internal_matcher, "_get_market_orders_mirror",
+                          side_effect=mirrors.get), \
+                patch.object(internal_matcher, "_get_market_recommendations",
+                             side_effect=lambda _, __, ___, mirror: [
+                                 {"version": mirror.version}]), \
+                patch("gsy_e.models.myco_matcher.myco_internal_matcher.global_objects"):
+            internal_matcher.match_recommendations()
+
+        # The recommendations that were calculated before the trades of market1 are not applied.
+        market2.match_recommendations.assert_called_once_with([{"version": 2}])
+
+    @staticmethod
+    def test_matcher_can_be_pickled(internal_matcher):
+        assert internal_matcher._matching_executor is not None
+        assert internal_matcher.__getstate__()["_matching_executor"] is None
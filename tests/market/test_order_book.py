@@ -0,0 +1,128 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from copy import deepcopy
+
+import pytest
+from gsy_framework.data_classes import Bid, Offer
+from pendulum import now
+
+from gsy_e.models.market.order_book import OrderBook
+
+
+@pytest.fixture(name="order_book")
+def order_book_fixture():
+    offers = [Offer("id1", now(), 30, 1, "seller"),
+              Offer("id2", now(), 10, 1, "seller"),
+              Offer("id3", now(), 20, 1, "seller"),
+              Offer("id4", now(), 10, 1, "seller")]
+    return OrderBook({offer.id: offer for offer in offers})
+
+
+class TestOrderBook:
+
+    @staticmethod
+    def test_orders_are_sorted_like_a_stable_sort(order_book):
+        assert [o.id for o in order_book.sorted_orders()] == ["id2", "id4", "id3", "id1"]
+        assert ([o.id for o in order_book.sorted_orders(reverse=True)] ==
+                [o.id for o in reversed(sorted(order_book.values(),
+                                               key=lambda o: o.energy_rate))])
+
+    @staticmethod
+    def test_mapping_interface_is_kept_in_sync_with_the_index(order_book):
+        assert order_book.pop("id2").id == "id2"
+        assert order_book.pop("id2", None) is None
+        del order_book["id1"]
+        order_book["id5"] = Offer("id5", now(), 5, 1, "seller")
+        assert list(order_book.keys()) == ["id3", "id4", "id5"]
+        assert "id5" in order_book and order_book.get("id1") is None
+        assert [o.id for o in order_book.sorted_orders()] == ["id5", "id4", "id3"]
+        with pytest.raises(KeyError):
+            order_book.pop("id1")
+
+    @staticmethod
+    def test_replacing_an_order_reindexes_it(order_book):
+        order_book["id2"] = Offer("id2", now(), 40, 1, "seller")
+        assert [o.id for o in order_book.sorted_orders()] == ["id4", "id3", "id1", "id2"]
+
+    @staticmethod
+    def test_price_updates_of_orders_in_the_book_do_not_break_deletion(order_book):
+        order_book["id3"].update_price(50)
+        order_book.pop("id3")
+        assert [o.id for o in order_book.sorted_orders()] == ["id2", "id4", "id1"]
+
+    @staticmethod
+    def test_best_orders_and_price_levels(order_book):
+        assert order_book.best_order().id == "id2"
+        assert order_book.best_order(reverse=True).id == "id1"
+        assert order_book.best_energy_rate() == 10
+        assert [o.id for o in order_book.orders_at_best_rate(0.0001)] == ["id2", "id4"]
+        assert [(rate, [o.id for o in orders]) for rate, orders in order_book.price_levels()] == [
+            (10, ["id2", "id4"]), (20, ["id3"]), (30, ["id1"])]
+        order_book.clear()
+        assert order_book.best_order() is None
+        assert order_book.orders_at_best_rate(0.0001) == []
+
+    @staticmethod
+    def test_copies_do_not_share_the_index(order_book):
+        for copied_book in (order_book.copy(), deepcopy(order_book)):
+            copied_book.pop("id2")
+            assert [o.id for o in copied_book.sorted_orders()] == ["id4", "id3", "id1"]
+        assert [o.id for o in order_book.sorted_orders()] == ["id2", "id4", "id3", "id1"]
+
+    @staticmethod
+    def test_snapshots_are_shared_until_the_book_changes(order_book):
+        snapshot = order_book.snapshot()
+        assert snapshot == order_book
+        assert order_book.snapshot() == snapshot
+        with pytest.raises(TypeError):
+            snapshot["id5"] = Offer("id5", now(), 5, 1, "seller")
+        for offer_id in snapshot:
+            order_book.pop(offer_id)
+        assert len(snapshot) == 4 and len(order_book.snapshot()) == 0
+        assert snapshot["id1"] is not None
+
+    @staticmethod
+    def test_orders_are_indexed_by_owner_and_origin():
+        offers = OrderBook()
+        offers["id1"] = Offer("id1", now(), 10, 1, "MA", seller_origin_id="house1",
+                              seller_id="ma_uuid")
+        offers["id2"] = Offer("id2", now(), 10, 1, "MA", seller_origin_id="house2",
+                              seller_id="ma_uuid")
+        offers["id3"] = Offer("id3", now(), 10, 1, "house1", seller_origin_id="house1",
+                              seller_id="house1")
+        assert [o.id for o in offers.orders_by_owner_id("ma_uuid")] == ["id1", "id2"]
+        assert offers.first_order_by_origin_id("house1").id == "id1"
+        del offers["id1"]
+        assert offers.first_order_by_origin_id("house1").id == "id3"
+        assert [o.id for o in offers.orders_by_owner_id("ma_uuid")] == ["id2"]
+        offers["id2"] = Offer("id2", now(), 10, 1, "house2", seller_origin_id="house2",
+                              seller_id="house2")
+        assert offers.orders_by_owner_id("ma_uuid") == []
+        assert offers.first_order_by_origin_id("unknown") is None
+
+        bids = OrderBook({"bid1": Bid("bid1", now(), 10, 1, "buyer", buyer_origin_id="house3",
+                                      buyer_id="buyer_uuid")})
+        assert bids.orders_by_owner_id("buyer_uuid")[0].id == "bid1"
+        assert bids.first_order_by_origin_id("house3").id == "bid1"
+
+    @staticmethod
+    def test_bids_are_sorted_in_descending_order():
+        bids = OrderBook({"bid1": Bid("bid1", now(), 10, 1, "buyer"),
+                          "bid2": Bid("bid2", now(), 20, 1, "buyer")})
+        assert bids.best_order(reverse=True).id == "bid2"
+        assert [b.id for b in bids.sorted_orders(reverse=True)] == ["bid2", "bid1"]
@@ -0,0 +1,64 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# pylint: disable=protected-access
+import pickle
+
+import pytest
+from gsy_framework.data_classes import Bid, Offer
+from pendulum import now
+
+from gsy_e.models.market.order_history import CompactOrderHistory
+
+
+@pytest.fixture(name="orders")
+def orders_fixture():
+    return [Offer("offer1", now(), 10, 1, "seller", seller_origin="seller_origin"),
+            Bid("bid1", now(), 3.5, 2, "buyer", buyer_origin="buyer_origin"),
+            Offer("offer2", now(), 2.5, 0.5, "seller", seller_origin="seller_origin",
+                  attributes={"energy_type": "PV"})]
+
+
+class TestCompactOrderHistory:
+
+    @staticmethod
+    def test_history_can_be_read_like_the_list_of_orders(orders):
+        history = CompactOrderHistory(orders)
+        assert len(history) == 3
+        assert [order.serializable_dict() for order in history] == [
+            order.serializable_dict() for order in orders]
+        assert [order.csv_values() for order in history] == [
+            order.csv_values() for order in orders]
+        assert [type(order) for order in history] == [Offer, Bid, Offer]
+        assert history[-1].id == "offer2"
+        assert [order.id for order in history[:2]] == ["offer1", "bid1"]
+        with pytest.raises(IndexError):
+            history[3]  # pylint: disable=pointless-statement
+
+    @staticmethod
+    def test_history_stores_attributes_per_column(orders):
+        history = CompactOrderHistory(orders)
+        offer_columns = dict(zip(history._schemas[0][1], history._columns[0]))
+        assert offer_columns["id"] == ["offer1", "offer2"]
+        assert offer_columns["seller_origin"][0] is offer_columns["seller_origin"][1]
+        assert history[0] is not orders[0]
+
+    @staticmethod
+    def test_history_can_be_pickled(orders):
+        history = pickle.loads(pickle.dumps(CompactOrderHistory(orders)))
+        assert [order.serializable_dict() for order in history] == [
+            order.serializable_dict() for order in orders]
@@ -0,0 +1,188 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from math import isclose
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from gsy_framework.constants_limits import ConstSettings
+from gsy_framework.data_classes import Bid, Offer
+from gsy_framework.matching_algorithms import (
+    PayAsBidMatchingAlgorithm, PayAsClearMatchingAlgorithm)
+from pendulum import now
+
+from gsy_e.models.myco_matcher.vectorized_matching import VectorizedMatchingEngine
+
+
+def _serialize_order(order):
+    return order.serializable_dict()
+
+
+def _create_orders(offer_rates, bid_rates):
+    offers = [Offer(f"offer{index}", now(), rate, 1, "seller")
+              for index, rate in enumerate(offer_rates)]
+    bids = [Bid(f"bid{index}", now(), rate, 1, "buyer")
+            for index, rate in enumerate(bid_rates)]
+    return offers, bids
+
+
+def _create_random_orders(seed, buyers, sellers, order_count=20):
+    random_generator = np.random.default_rng(seed)
+
+    def create_orders(order_class, participants):
+        return [
+            order_class(f"{order_class.__name__.lower()}{index}", now(), rate * energy, energy,
+                        participants[random_generator.integers(len(participants))])
+            for index, (rate, energy) in enumerate(zip(
+                random_generator.integers(10, 30, order_count).tolist(),
+                random_generator.choice([0.25, 0.5, 1., 1.5, 3.], order_count).tolist()))]
+    return create_orders(Offer, sellers), create_orders(Bid, buyers)
+
+
+def _get_framework_recommendations(matching_algorithm, bids, offers):
+    return matching_algorithm.get_matches_recommendations({
+        "area": {"2022-01-17T12:00": {
+            "bids": [bid.serializable_dict() for bid in bids],
+            "offers": [offer.serializable_dict() for offer in offers],
+            "current_time": now()}}})
+
+
+def _assert_same_recommendations(recommendations, expected_recommendations):
+    assert [(recommendation["bid"]["id"], recommendation["offer"]["id"])
+            for recommendation in recommendations] == [
+                (recommendation["bid"]["id"], recommendation["offer"]["id"])
+                for recommendation in expected_recommendations]
+    for recommendation, expected_recommendation in zip(
+            recommendations, expected_recommendations):
+        assert isclose(recommendation["selected_energy"],
+                       expected_recommendation["selected_energy"], abs_tol=1e-9)
+        assert isclose(recommendation["trade_rate"], expected_recommendation["trade_rate"])
+
+
+class TestVectorizedMatchingEngine:
+
+    @staticmethod
+    @pytest.mark.parametrize("offer_rates, bid_rates, clearing_rate, clearing_energy", [
+        ([1, 2, 3, 4, 5, 6, 7], [1, 2, 3, 4, 5, 6, 7], 4, 4),
+        ([1, 2, 3, 4, 5, 6, 7], [7, 6, 5, 4, 3, 2, 1], 4, 4),
+        ([8, 9, 10, 11, 12, 13, 14], [8, 9, 10, 11, 12, 13, 14], 11, 4),
+        ([2, 3, 3, 5, 6, 7, 8], [1, 2, 3, 4, 5, 6, 7], 5, 3),
+        ([10, 10, 10, 10, 10, 10, 10], [1, 2, 3, 4, 10, 10, 10], 10, 3),
+        ([1, 2, 5, 5, 5, 6, 7], [5, 5, 5, 5, 5, 5, 5], 5, 5),
+        ([1.1, 2.2, 3.3], [3.3, 2.2, 1.1], 2.2, 2),
+        ([5, 6], [1, 2], 0, 0),
+    ])
+    def test_get_clearing_point(offer_rates, bid_rates, clearing_rate, clearing_energy):
+        offers, bids = _create_orders(offer_rates, bid_rates)
+        engine = VectorizedMatchingEngine(pay_as_clear=True)
+        assert engine.get_clearing_point(bids, offers) == (clearing_rate, clearing_energy)
+
+    @staticmethod
+    @pytest.mark.parametrize("pay_as_clear, trade_rates", [(False, [7, 6, 5]), (True, [5, 5, 5])])
+    def test_get_matches_recommendations(pay_as_clear, trade_rates):
+        offers, bids = _create_orders([3, 1, 2, 8], [5, 7, 6, 2])
+        engine = VectorizedMatchingEngine(pay_as_clear=pay_as_clear)
+        recommendations = engine.get_matches_recommendations(
+            "area", "2022-01-17T12:00", bids, offers, _serialize_order)
+        assert [(recommendation["bid"]["id"], recommendation["offer"]["id"])
+                for recommendation in recommendations] == [
+                    ("bid1", "offer1"), ("bid2", "offer2"), ("bid0", "offer0")]
+        assert [recommendation["trade_rate"] for recommendation in recommendations] == trade_rates
+        assert all(recommendation["selected_energy"] == 1 and
+                   recommendation["market_id"] == "area" and
+                   recommendation["time_slot"] == "2022-01-17T12:00"
+                   for recommendation in recommendations)
+
+    @staticmethod
+    def test_pay_as_bid_matches_every_order_once():
+        offers = [Offer("offer1", now(), 1, 1, "seller1"), Offer("offer2", now(), 8, 2, "seller2")]
+        bids = [Bid("bid1", now(), 12, 2, "buyer1"), Bid("bid2", now(), 3, 1, "buyer2")]
+        recommendations = VectorizedMatchingEngine().get_matches_recommendations(
+            "area", "2022-01-17T12:00", bids, offers, _serialize_order)
+        # The residual of bid1 is matched with offer2 by the next call.
+        assert [(recommendation["bid"]["id"], recommendation["offer"]["id"],
+                 recommendation["selected_energy"]) for recommendation in recommendations] == [
+                    ("bid1", "offer1", 1)]
+
+    @staticmethod
+    def test_pay_as_clear_matches_partially_matched_orders_with_further_orders():
+        offers = [Offer("offer1", now(), 1, 1, "seller1"), Offer("offer2", now(), 4, 2, "seller2")]
+        bids = [Bid("bid1", now(), 12, 2, "buyer1"), Bid("bid2", now(), 3, 1, "buyer2")]
+        recommendations = VectorizedMatchingEngine(pay_as_clear=True).get_matches_recommendations(
+            "area", "2022-01-17T12:00", bids, offers, _serialize_order)
+        assert [(recommendation["bid"]["id"], recommendation["offer"]["id"],
+                 recommendation["selected_energy"], recommendation["trade_rate"])
+                for recommendation in recommendations] == [
+                    ("bid1", "offer1", 1, 3), ("bid1", "offer2", 1, 3), ("bid2", "offer2", 1, 3)]
+
+    @staticmethod
+    def test_orders_of_the_same_participant_are_not_matched():
+        offers = [Offer("offer1", now(), 1, 1, "A"), Offer("offer2", now(), 2, 1, "B")]
+        bids = [Bid("bid1", now(), 3, 1, "A")]
+        recommendations = VectorizedMatchingEngine().get_matches_recommendations(
+            "area", "2022-01-17T12:00", bids, offers, _serialize_order)
+        assert len(recommendations) == 1
+        assert recommendations[0]["offer"]["id"] == "offer2"
+
+    @staticmethod
+    def test_can_match_rejects_orders_with_requirements():
+        offers, bids = _create_orders([1], [2])
+        assert VectorizedMatchingEngine.can_match(bids, offers)
+        bids[0].requirements = [{"trading_partners": ["seller"]}]
+        assert not VectorizedMatchingEngine.can_match(bids, offers)
+
+
+class TestVectorizedMatchingEngineParity:
+    """The recommendations have to be the same as the ones of the gsy-framework algorithms."""
+
+    @staticmethod
+    @pytest.fixture(autouse=True)
+    def pay_as_clear_aggregation_fixture():
+        with patch.object(ConstSettings.MASettings, "PAY_AS_CLEAR_AGGREGATION_ALGORITHM", 1):
+            yield
+
+    @staticmethod
+    @pytest.mark.parametrize("pay_as_clear, matching_algorithm", [
+        (False, PayAsBidMatchingAlgorithm()), (True, PayAsClearMatchingAlgorithm())])
+    @pytest.mark.parametrize("seed", range(10))
+    @pytest.mark.parametrize("buyers, sellers", [
+        (["H1", "H2", "H3"], ["PV1", "PV2"]), (["H1", "H2", "S1"], ["PV1", "S1"])])
+    def test_recommendations_are_the_same_as_of_gsy_framework(
+            pay_as_clear, matching_algorithm, seed, buyers, sellers):
+        offers, bids = _create_random_orders(seed, buyers, sellers)
+        recommendations = VectorizedMatchingEngine(pay_as_clear).get_matches_recommendations(
+            "area", "2022-01-17T12:00", bids, offers, _serialize_order)
+        _assert_same_recommendations(
+            recommendations, _get_framework_recommendations(matching_algorithm, bids, offers))
+
+    @staticmethod
+    @pytest.mark.parametrize("offer_rates, bid_rates", [
+        ([1, 2, 3, 4, 5, 6, 7], [7, 6, 5, 4, 3, 2, 1]),
+        ([2, 3, 3, 5, 6, 7, 8], [1, 2, 3, 4, 5, 6, 7]),
+        ([10, 10, 10, 10, 10, 10, 10], [1, 2, 3, 4, 10, 10, 10]),
+        ([1, 2, 5, 5, 5, 6, 7], [5, 5, 5, 5, 5, 5, 5]),
+        ([1.1, 2.2, 3.3], [3.3, 2.2, 1.1]),
+        ([5, 6], [1, 2]),
+    ])
+    def test_clearing_point_is_the_same_as_of_gsy_framework(offer_rates, bid_rates):
+        offers, bids = _create_orders(offer_rates, bid_rates)
+        clearing = PayAsClearMatchingAlgorithm().get_clearing_point(
+            [bid.serializable_dict() for bid in bids],
+            [offer.serializable_dict() for offer in offers], now(), "area")
+        assert VectorizedMatchingEngine(pay_as_clear=True).get_clearing_point(
+            bids, offers) == ((clearing.rate, clearing.energy) if clearing else (0, 0))
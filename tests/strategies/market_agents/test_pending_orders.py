@@ -0,0 +1,116 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# pylint: disable=missing-function-docstring, protected-access
+import pytest
+from gsy_framework.data_classes import Offer
+from pendulum import now
+
+from gsy_e.models.market.order_book import OrderBook
+from gsy_e.models.strategy.market_agents.pending_orders import PendingOrders
+
+
+def _offer(offer_id: str) -> Offer:
+    return Offer(offer_id, now(), 10, 1, "seller")
+
+
+@pytest.fixture(name="order_book")
+def order_book_fixture() -> OrderBook:
+    return OrderBook({"o1": _offer("o1"), "o2": _offer("o2")})
+
+
+@pytest.fixture(name="pending_orders")
+def pending_orders_fixture(order_book) -> PendingOrders:
+    pending_orders = PendingOrders()
+    pending_orders.age_new_orders(order_book, 0)
+    return pending_orders
+
+
+class TestPendingOrders:
+
+    @staticmethod
+    def test_age_new_orders_only_ages_the_orders_added_since_the_last_tick(
+            order_book, pending_orders):
+        assert pending_orders.ages == {"o1": 0, "o2": 0}
+        order_book["o3"] = _offer("o3")
+        pending_orders.age_new_orders(order_book, 2)
+        assert pending_orders.ages == {"o1": 0, "o2": 0, "o3": 2}
+        assert pending_orders._unaged_order_ids == {}
+
+    @staticmethod
+    def test_age_new_orders_scans_order_books_that_do_not_report_their_changes():
+        pending_orders = PendingOrders()
+        orders = {"o1": _offer("o1")}
+        pending_orders.age_new_orders(orders, 0)
+        orders["o2"] = _offer("o2")
+        pending_orders.age_new_orders(orders, 1)
+        assert pending_orders.ages == {"o1": 0, "o2": 1}
+
+    @staticmethod
+    def test_pop_due_order_ids_returns_orders_whose_minimum_age_elapsed(
+            order_book, pending_orders):
+        order_book["o3"] = _offer("o3")
+        pending_orders.age_new_orders(order_book, 2)
+        assert pending_orders.pop_due_order_ids(2, 2) == ["o1", "o2"]
+        # Due orders are returned until they are parked or discarded
+        pending_orders.park("o1")
+        pending_orders.discard("o2")
+        assert pending_orders.pop_due_order_ids(4, 2) == ["o3"]
+        assert pending_orders.get_next_due_tick(4, 2, {}) is None
+
+    @staticmethod
+    def test_pop_due_order_ids_returns_orders_in_the_order_of_the_market(
+            order_book, pending_orders):
+        order_book["o1"] = order_book.pop("o1")
+        assert pending_orders.pop_due_order_ids(0, 0) == ["o1", "o2"]
+        assert pending_orders.pop_due_order_ids(0, 0, order_book) == ["o2", "o1"]
+
+    @staticmethod
+    def test_parked_orders_are_visited_again_if_released_or_added_again(
+            order_book, pending_orders):
+        assert pending_orders.pop_due_order_ids(1, 1) == ["o1", "o2"]
+        pending_orders.park("o1")
+        pending_orders.park("o2")
+        assert pending_orders.pop_due_order_ids(1, 1) == []
+        pending_orders.release("o1")
+        order_book["o2"] = order_book.pop("o2")
+        pending_orders.age_new_orders(order_book, 2)
+        assert pending_orders.pop_due_order_ids(2, 1) == ["o1", "o2"]
+        assert pending_orders.ages == {"o1": 0, "o2": 0}
+
+    @staticmethod
+    def test_discarded_orders_are_aged_again_if_still_in_the_market(order_book, pending_orders):
+        pending_orders.discard("o1")
+        pending_orders.age_new_orders(order_book, 3)
+        assert pending_orders.ages == {"o2": 0, "o1": 3}
+        assert pending_orders.get_next_due_tick(3, 2, {}) == 5
+        assert pending_orders.get_next_due_tick(3, 2, {"o1": None}) is None
+
+    @staticmethod
+    def test_rename_transfers_the_age_of_the_order(order_book, pending_orders):
+        order_book["o3"] = _offer("o3")
+        pending_orders.rename("o1", "o3")
+        pending_orders.age_new_orders(order_book, 2)
+        assert pending_orders.ages == {"o2": 0, "o3": 0, "o1": 2}
+        assert pending_orders.pop_due_order_ids(2, 1) == ["o2", "o3"]
+
+    @staticmethod
+    def test_detach_stops_following_the_order_book(order_book, pending_orders):
+        pending_orders.detach()
+        order_book["o3"] = _offer("o3")
+        assert pending_orders._unaged_order_ids == {}
+        assert order_book._listeners == []
@@ -27,6 +27,7 @@ from gsy_framework.data_classes import Offer, Trade, Bid
 from gsy_framework.enums import SpotMarketTypeEnum
 
 from gsy_e.constants import TIME_ZONE
+from gsy_e.events.event_structures import MarketEvent
 from gsy_e.gsy_e_core.blockchain_interface import NonBlockchainInterface
 from gsy_e.gsy_e_core.exceptions import MarketException
 from gsy_e.models.market.one_sided import OneSidedMarket
@@ -290,6 +291,22 @@ def test_bid_events_fail_for_one_sided_market(base):
                              residual_bid=test_bid)
 
 
+@pytest.mark.parametrize("market_type, subscribed", [
+    (SpotMarketTypeEnum.ONE_SIDED.value, True),
+    (SpotMarketTypeEnum.TWO_SIDED.value, False)])
+def test_bid_enabled_strategy_subscribes_to_offers_only_in_one_sided_market(
+        market_type, subscribed):
+    class OfferAcceptingStrategy(BidEnabledStrategy):
+        def event_offer(self, *, market_id, offer):
+            pass
+
+    with patch("gsy_framework.constants_limits.ConstSettings.MASettings.MARKET_TYPE",
+               market_type):
+        subscriptions = OfferAcceptingStrategy().get_market_event_subscriptions()
+    assert (MarketEvent.OFFER in subscriptions) is subscribed
+    assert MarketEvent.BID_TRADED in subscriptions
+
+
 def test_bid_deleted_removes_bid_from_posted(base):
     ConstSettings.MASettings.MARKET_TYPE = 2
     test_bid = Bid("123", pendulum.now(), 12, 23, base.owner.name, "B")
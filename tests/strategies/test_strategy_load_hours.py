@@ -123,6 +123,9 @@ class FakeMarket:
     def get_bids(self):
         return deepcopy(self.bids)
 
+    def get_bids_by_buyer_id(self, buyer_id):
+        return [bid for bid in self.bids.values() if bid.buyer_id == buyer_id]
+
     def bid(self, price: float, energy: float, buyer: str, original_price=None,
             buyer_origin=None, buyer_origin_id=None, buyer_id=None,
             attributes=None, requirements=None, time_slot=None) -> Bid:
@@ -190,6 +190,16 @@ def testing_activation(pv_test1):
     ENERGY_FORECAST = pv_test1.state._energy_production_forecast_kWh
 
 
+@pytest.mark.parametrize("future_market_duration_hours, expected_wake_up_tick", [
+    (0, 7), (1, 3)])
+def test_get_next_wake_up_tick_wakes_up_on_every_tick_with_future_markets(
+        pv_test1, future_market_duration_hours, expected_wake_up_tick):
+    pv_test1.offer_update.get_next_update_tick = Mock(return_value=7)
+    with patch("gsy_framework.constants_limits.GlobalConfig.FUTURE_MARKET_DURATION_HOURS",
+               future_market_duration_hours):
+        assert pv_test1.get_next_wake_up_tick() == expected_wake_up_tick
+
+
 """TEST2"""
 
 
@@ -154,6 +154,9 @@ class FakeMarket:
     def get_offers(self):
         return self.offers
 
+    def get_offers_by_seller_id(self, seller_id):
+        return [offer for offer in self.offers.values() if offer.seller_id == seller_id]
+
     @property
     def time_slot(self):
         return DateTime.now(tz=TIME_ZONE).start_of('day')
@@ -0,0 +1,176 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import csv
+import json
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+
+import pytest
+from gsy_framework.constants_limits import ConstSettings, GlobalConfig
+from gsy_framework.enums import SpotMarketTypeEnum
+from pendulum import duration
+
+from gsy_e.gsy_e_core.benchmark import (
+    BENCHMARK_NUMBER_OF_HOUSES, BENCHMARK_SCENARIOS, BenchmarkScenario,
+    parse_import_time_output, run_benchmark)
+from gsy_e.gsy_e_core.phase_timer import (
+    PHASE_HISTOGRAM_BIN_LABELS, PHASE_PROFILE_FILE_NAME, PhaseProfiler, PhaseTimer)
+from gsy_e.setup.benchmark import scaling_houses
+
+
+class TestBenchmark:
+
+    @staticmethod
+    @pytest.fixture(name="restore_settings")
+    def restore_settings_fixture():
+        original_market_type = ConstSettings.MASettings.MARKET_TYPE
+        original_settlement = ConstSettings.SettlementMarketSettings.ENABLE_SETTLEMENT_MARKETS
+        original_future_duration = GlobalConfig.FUTURE_MARKET_DURATION_HOURS
+        original_number_of_houses = scaling_houses.NUMBER_OF_HOUSES
+        yield
+        ConstSettings.MASettings.MARKET_TYPE = original_market_type
+        ConstSettings.SettlementMarketSettings.ENABLE_SETTLEMENT_MARKETS = original_settlement
+        GlobalConfig.FUTURE_MARKET_DURATION_HOURS = original_future_duration
+        scaling_houses.NUMBER_OF_HOUSES = original_number_of_houses
+
+    @staticmethod
+    def test_benchmark_scenarios_cover_all_house_numbers():
+        assert len(BENCHMARK_SCENARIOS) == 3 * len(BENCHMARK_NUMBER_OF_HOUSES)
+        assert {scenario.number_of_houses for scenario in BENCHMARK_SCENARIOS.values()} == set(
+            BENCHMARK_NUMBER_OF_HOUSES)
+        assert "houses_10_one_sided" in BENCHMARK_SCENARIOS
+        assert "houses_5000_two_sided_settlement_future" in BENCHMARK_SCENARIOS
+
+    @staticmethod
+    @pytest.mark.usefixtures("restore_settings")
+    def test_apply_settings_configures_global_settings_and_setup():
+        scenario = BenchmarkScenario(
+            100, SpotMarketTypeEnum.TWO_SIDED.value, enable_settlement_markets=True,
+            future_market_duration_hours=4)
+        scenario.apply_settings()
+        assert ConstSettings.MASettings.MARKET_TYPE == SpotMarketTypeEnum.TWO_SIDED.value
+        assert ConstSettings.SettlementMarketSettings.ENABLE_SETTLEMENT_MARKETS is True
+        assert GlobalConfig.FUTURE_MARKET_DURATION_HOURS == 4
+        assert scaling_houses.NUMBER_OF_HOUSES == 100
+
+    @staticmethod
+    @patch("gsy_e.gsy_e_core.benchmark.measure_import_time",
+           return_value={"module": "gsy_e.gsy_e_core.cli", "total_s": 1.0, "packages_s": {}})
+    @patch("gsy_e.gsy_e_core.benchmark.ProcessPoolExecutor")
+    def test_run_benchmark_writes_results_to_json(executor_mock, _import_time_mock, tmpdir):
+        scenario_results = {"name": "houses_10_one_sided", "ticks_per_second": 1.0,
+                            "slots_per_second": 0.1, "peak_rss_mb": 100.0}
+        executor_mock.return_value.__enter__.return_value.submit.return_value.result.\
+            return_value = scenario_results
+        output_path = os.path.join(tmpdir, "benchmark.json")
+        run_benchmark(["houses_10_one_sided"], duration(hours=1), duration(minutes=15),
+                      duration(seconds=15), 0, output_path)
+        with open(output_path, "r", encoding="utf-8") as output_file:
+            results = json.load(output_file)
+        assert results["scenarios"] == [scenario_results]
+        assert results["settings"]["slot_length_s"] == 900
+        assert results["import_time"]["total_s"] == 1.0
+
+    @staticmethod
+    def test_parse_import_time_output_sums_self_time_per_package():
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 |       plotly.io\n"
+            "import time:       300 |        400 |     plotly\n"
+            "import time:        50 |         50 |     redis\n"
+            "import time:        20 |        470 |   gsy_e.gsy_e_core.cli\n")
+        results = parse_import_time_output(output, "gsy_e.gsy_e_core.cli")
+        assert results["total_s"] == 470 / 1e6
+        assert list(results["packages_s"].keys()) == ["plotly", "redis", "gsy_e"]
+        assert results["packages_s"]["plotly"] == 400 / 1e6
+
+    @staticmethod
+    def test_cli_does_not_import_the_simulation():
+        completed_process = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, gsy_e.gsy_e_core.cli; print(sorted(module for module in ("
+             "'gsy_e.gsy_e_core.simulation', 'gsy_e.gsy_e_core.simulation_branches', "
+             "'gsy_e.setup.benchmark.scaling_houses') if module in sys.modules))"],
+            capture_output=True, text=True, check=True)
+        assert completed_process.stdout.strip() == "[]"
+
+    @staticmethod
+    def test_simulation_does_not_import_redis():
+        completed_process = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, gsy_e.gsy_e_core.cli, gsy_e.gsy_e_core.simulation; "
+             "print('redis' in sys.modules)"],
+            capture_output=True, text=True, check=True)
+        assert completed_process.stdout.strip() == "False"
+
+
+class TestPhaseTimer:
+
+    @staticmethod
+    def test_measure_does_not_record_if_disabled():
+        phase_timer = PhaseTimer()
+        with phase_timer.measure("tick"):
+            pass
+        assert phase_timer.as_dict() == {}
+
+    @staticmethod
+    def test_measure_accumulates_time_and_calls_per_phase():
+        phase_timer = PhaseTimer(enabled=True)
+        for _ in range(3):
+            with phase_timer.measure("tick"):
+                pass
+        phases = phase_timer.as_dict()
+        assert phases["tick"]["calls"] == 3
+        assert phases["tick"]["total_time_s"] >= 0
+        phase_timer.reset()
+        assert phase_timer.as_dict() == {}
+
+
+class TestPhaseProfiler:
+
+    @staticmethod
+    def test_measure_records_histogram_per_slot():
+        phase_profiler = PhaseProfiler()
+        phase_profiler.start_slot("slot_1")
+        phase_profiler._record("tick", 5e-6)
+        phase_profiler._record("tick", 2e-3)
+        phase_profiler.start_slot("slot_2")
+        phase_profiler._record("tick", 2.0)
+        assert phase_profiler.slot_profiles["slot_1"]["tick"]["histogram"] == [
+            1, 0, 0, 1, 0, 0, 0]
+        assert phase_profiler.slot_profiles["slot_2"]["tick"]["histogram"] == [
+            0, 0, 0, 0, 0, 0, 1]
+        assert phase_profiler.slot_profiles["slot_1"]["tick"]["max_time_s"] == 2e-3
+        assert phase_profiler.as_dict()["tick"]["calls"] == 3
+
+    @staticmethod
+    def test_export_to_csv_writes_one_row_per_slot_and_phase(tmpdir):
+        phase_profiler = PhaseProfiler()
+        phase_profiler.start_slot("slot_1")
+        with phase_profiler.measure("tick"):
+            pass
+        with phase_profiler.measure("export"):
+            pass
+        phase_profiler.export_to_csv(str(tmpdir))
+        with open(os.path.join(tmpdir, PHASE_PROFILE_FILE_NAME), "r",
+                  encoding="utf-8") as csv_file:
+            rows = list(csv.reader(csv_file))
+        assert rows[0][-len(PHASE_HISTOGRAM_BIN_LABELS):] == list(PHASE_HISTOGRAM_BIN_LABELS)
+        assert [row[:2] for row in rows[1:]] == [["slot_1", "tick"], ["slot_1", "export"]]
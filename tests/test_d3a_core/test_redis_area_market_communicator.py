@@ -10,8 +10,7 @@ from gsy_e.gsy_e_core.redis_connections.redis_area_market_communicator import (
 
 @pytest.fixture(scope="function", autouse=True)
 def strict_redis():
-    with patch("gsy_e.gsy_e_core.redis_connections.redis_area_market_communicator.StrictRedis",
-               spec=StrictRedis):
+    with patch("redis.StrictRedis", spec=StrictRedis):
 
         yield
 
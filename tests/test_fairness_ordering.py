@@ -0,0 +1,80 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# pylint: disable=missing-function-docstring
+import pytest
+from numpy import random
+
+from gsy_e.gsy_e_core.fairness_ordering import FairnessOrdering
+
+
+@pytest.fixture(name="fairness_ordering")
+def fairness_ordering_fixture():
+    fairness_ordering = FairnessOrdering()
+    fairness_ordering.activate(True)
+    return fairness_ordering
+
+
+class TestFairnessOrdering:
+
+    @staticmethod
+    def test_shuffle_draws_one_random_number_per_item_if_disabled():
+        items = list(range(10))
+        random.seed(0)
+        shuffled_items = FairnessOrdering().shuffle("area", items)
+        random.seed(0)
+        assert shuffled_items == sorted(items, key=lambda _: random.random())
+
+    @staticmethod
+    def test_shuffle_reuses_the_permutation_of_the_owner_during_a_tick(fairness_ordering):
+        items = list(range(100))
+        shuffled_items = fairness_ordering.shuffle("area", items)
+        assert sorted(shuffled_items) == items
+        random_state = random.get_state()[1].copy()
+        assert fairness_ordering.shuffle("area", items) == shuffled_items
+        assert fairness_ordering.shuffle("area", [str(item) for item in items]) == [
+            str(item) for item in shuffled_items]
+        # No random numbers are drawn for the reused permutation
+        assert (random.get_state()[1] == random_state).all()
+
+    @staticmethod
+    def test_shuffle_draws_new_permutations_for_other_owners_sizes_and_ticks(fairness_ordering):
+        random.seed(0)
+        items = list(range(100))
+        shuffled_items = fairness_ordering.shuffle("area", items)
+        assert fairness_ordering.shuffle("market", items) != shuffled_items
+        assert len(fairness_ordering.shuffle("area", items[:50])) == 50
+        fairness_ordering.start_tick()
+        assert fairness_ordering.shuffle("area", items) != shuffled_items
+
+    @staticmethod
+    def test_shuffle_is_reproducible_for_a_seed(fairness_ordering):
+        items = list(range(100))
+        random.seed(1)
+        shuffled_items = fairness_ordering.shuffle("area", items)
+        fairness_ordering.start_tick()
+        random.seed(1)
+        assert fairness_ordering.shuffle("area", items) == shuffled_items
+
+    @staticmethod
+    def test_get_fairness_keys_orders_subsets_like_shuffle(fairness_ordering):
+        items = list(range(100))
+        shuffled_items = fairness_ordering.shuffle("area", items)
+        fairness_keys = fairness_ordering.get_fairness_keys("area", len(items))
+        subset = [1, 5, 17, 42, 99]
+        assert sorted(subset, key=fairness_keys.__getitem__) == [
+            item for item in shuffled_items if item in subset]
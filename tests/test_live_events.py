@@ -78,7 +78,7 @@ class TestLiveEvents(unittest.TestCase):
         }
 
         self.live_events.add_event(event_dict)
-        self.live_events.handle_all_events(self.area_grid)
+        assert self.live_events.handle_all_events(self.area_grid) is True
 
         new_load = [c for c in self.area_house1.children if c.name == "new_load"][0]
         assert isinstance(new_load.strategy, LoadHoursStrategy)
@@ -130,7 +130,7 @@ class TestLiveEvents(unittest.TestCase):
         }
 
         self.live_events.add_event(event_dict)
-        self.live_events.handle_all_events(self.area_grid)
+        assert self.live_events.handle_all_events(self.area_grid) is True
 
         assert len(self.area_house1.children) == 1
         assert all(c.uuid != self.area1.uuid for c in self.area_house1.children)
@@ -20,6 +20,7 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from copy import deepcopy
 from math import isclose
+from unittest.mock import patch
 from uuid import uuid4
 
 import pendulum
@@ -32,10 +33,11 @@ from gsy_e.constants import TIME_FORMAT, TIME_ZONE
 from gsy_e.models.area import DEFAULT_CONFIG
 from gsy_e.models.market import GridFee
 from gsy_e.models.market.grid_fees.base_model import GridFees
+from gsy_e.models.market.order_book import OrderBook
 from gsy_e.models.strategy.market_agents.one_sided_agent import OneSidedAgent
 from gsy_e.models.strategy.market_agents.settlement_agent import SettlementAgent
 from gsy_e.models.strategy.market_agents.two_sided_agent import TwoSidedAgent
-from gsy_e.models.strategy.market_agents.two_sided_engine import BidInfo
+from gsy_e.models.strategy.market_agents.two_sided_engine import BidInfo, TwoSidedEngine
 
 
 TRANSFER_FEES = GridFee(grid_fee_percentage=0, grid_fee_const=0)
@@ -70,6 +72,8 @@ class FakeMarket:
         self.bids = {bid.id: bid for bid in self._bids}
         self.offer_call_count = 0
         self.bid_call_count = 0
+        self.bids_bulk_call_count = 0
+        self.offers_bulk_events = []
         self.forwarded_offer_id = "fwd"
         self.forwarded_bid_id = "fwd_bid_id"
         self.calls_energy = []
@@ -185,6 +189,13 @@ class FakeMarket:
     def dispatch_market_offer_event(self, offer):
         pass
 
+    def offers_bulk(self, offers_kwargs, dispatch_event=True):
+        return [self.offer(offer_id=f"uuid_{index}", dispatch_event=dispatch_event, **kwargs)
+                for index, kwargs in enumerate(offers_kwargs)]
+
+    def dispatch_market_offers_event(self, offers):
+        self.offers_bulk_events.append(offers)
+
     def bid(self, price: float, energy: float, buyer: str,
             bid_id: str = None, original_price=None, buyer_origin=None,
             adapt_price_with_fees=True, buyer_origin_id=None, buyer_id=None,
@@ -209,6 +220,11 @@ class FakeMarket:
 
         return bid
 
+    def bids_bulk(self, bids_kwargs):
+        self.bids_bulk_call_count += 1
+        return [self.bid(bid_id=f"uuid_{index}", **kwargs)
+                for index, kwargs in enumerate(bids_kwargs)]
+
     def split_offer(self, original_offer, energy, orig_offer_price):
         self.offers.pop(original_offer.id, None)
         # same offer id is used for the new accepted_offer
@@ -699,3 +715,163 @@ class TestMAOffer:
         offer_info = engine.forwarded_offers[residual_offer_id]
         assert offer_info.source_offer.id == "uuid"
         assert offer_info.target_offer.id == residual_offer_id
+
+
+class TestMAWakeUpTick:
+
+    @staticmethod
+    def test_ma_wakes_up_when_offer_can_be_forwarded():
+        lower_market = FakeMarket([Offer("id", pendulum.now(), 1, 1, "other", 1)])
+        higher_market = FakeMarket([])
+        market_agent = OneSidedAgent(
+            owner=FakeArea("owner"), higher_market=higher_market, lower_market=lower_market,
+            min_offer_age=4)
+        assert market_agent.get_next_wake_up_tick() is None
+        market_agent.event_tick()
+        assert market_agent.get_next_wake_up_tick() == 14
+        market_agent.owner.current_tick = 13
+        market_agent.event_tick()
+        assert higher_market.offer_call_count == 0
+        assert market_agent.get_next_wake_up_tick() == 14
+
+
+class TestMABulkForwarding:
+
+    @staticmethod
+    def teardown_method():
+        ConstSettings.MASettings.MARKET_TYPE = 1
+
+    @staticmethod
+    @patch("gsy_e.constants.BULK_ORDER_FORWARDING", True)
+    def test_ma_forwards_due_orders_in_one_batch():
+        ConstSettings.MASettings.MARKET_TYPE = 2
+        lower_market = FakeMarket(
+            offers=[Offer("id1", pendulum.now(), 1, 1, "other", 1),
+                    Offer("id2", pendulum.now(), 2, 1, "other", 2)],
+            bids=[Bid("bid1", pendulum.now(), 10, 10, "B", 10),
+                  Bid("bid2", pendulum.now(), 5, 10, "C", 5)])
+        higher_market = FakeMarket([], [])
+        market_agent = TwoSidedAgent(
+            owner=FakeArea("owner"), lower_market=lower_market, higher_market=higher_market)
+        market_agent.event_tick()
+        market_agent.owner.current_tick += 2
+        market_agent.event_tick()
+
+        assert len(higher_market.offers_bulk_events) == 1
+        assert [offer.id for offer in higher_market.offers_bulk_events[0]] == [
+            "uuid_0", "uuid_1"]
+        assert higher_market.bids_bulk_call_count == 1
+        assert higher_market.bid_call_count == 2
+        engine = next(
+            engine for engine in market_agent.engines if engine.markets.source is lower_market)
+        assert set(engine.forwarded_offers) == {"id1", "id2", "uuid_0", "uuid_1"}
+        assert set(engine.forwarded_bids) == {"bid1", "bid2", "uuid_0", "uuid_1"}
+
+
+class TestMAMatchableBidForwarding:
+
+    @staticmethod
+    def teardown_method():
+        ConstSettings.MASettings.MARKET_TYPE = 1
+
+    @staticmethod
+    @patch("gsy_e.constants.MATCHABLE_BID_FORWARDING", True)
+    def test_ma_forwards_bids_that_can_be_matched_above():
+        ConstSettings.MASettings.MARKET_TYPE = 2
+        lower_market = FakeMarket(
+            offers=[], bids=[Bid("cheap_bid", pendulum.now(), 1, 1, "B", 1),
+                             Bid("expensive_bid", pendulum.now(), 10, 1, "C", 10)])
+        higher_market = FakeMarket([], [])
+        higher_market.offers = OrderBook()
+        root_market = FakeMarket([], [])
+        root_market.offers = OrderBook({"offer": Offer("offer", pendulum.now(), 5, 1, "D", 5)})
+        owner = FakeArea("owner")
+        owner.parent = FakeArea("parent")
+        owner.parent.parent = FakeArea("root")
+        owner.parent.parent.parent = None
+        owner.parent.parent.get_market = lambda time_slot: root_market
+        market_agent = TwoSidedAgent(
+            owner=owner, lower_market=lower_market, higher_market=higher_market)
+        market_agent.event_tick()
+        market_agent.owner.current_tick += 2
+        market_agent.event_tick()
+
+        # Only the expensive bid can be matched with the offer of the root market
+        assert higher_market.bid_call_count == 1
+        assert higher_market.forwarded_bid.energy_rate == 10
+
+        higher_market.offers["offer_2"] = Offer("offer_2", pendulum.now(), 0.5, 1, "E", 0.5)
+        market_agent.owner.current_tick += 1
+        market_agent.event_tick()
+        assert higher_market.bid_call_count == 2
+        assert higher_market.forwarded_bid.energy_rate == 1
+
+    @staticmethod
+    @patch("gsy_e.constants.MATCHABLE_BID_FORWARDING", True)
+    @patch.object(TwoSidedEngine, "_can_bid_be_matched_above", autospec=True, return_value=False)
+    def test_ma_checks_held_back_bids_again_only_after_matching_offers_are_posted(
+            can_bid_be_matched_mock):
+        ConstSettings.MASettings.MARKET_TYPE = 2
+        lower_market = FakeMarket(offers=[], bids=[Bid("bid", pendulum.now(), 1, 1, "B", 1)])
+        higher_market = FakeMarket([], [])
+        higher_market.offers = OrderBook()
+        owner = FakeArea("owner")
+        owner.parent = FakeArea("parent")
+        owner.parent.parent = None
+        market_agent = TwoSidedAgent(
+            owner=owner, lower_market=lower_market, higher_market=higher_market)
+        market_agent.event_tick()
+        market_agent.owner.current_tick += 2
+        market_agent.event_tick()
+        assert can_bid_be_matched_mock.call_count == 1
+
+        for offer in (None, Offer("expensive_offer", pendulum.now(), 5, 1, "E", 5),
+                      Offer("cheap_offer", pendulum.now(), 0.5, 1, "E", 0.5)):
+            if offer is not None:
+                higher_market.offers[offer.id] = offer
+            market_agent.owner.current_tick += 1
+            market_agent.event_tick()
+        # The held back bid is only checked again after the cheap offer was posted
+        assert can_bid_be_matched_mock.call_count == 2
+        assert higher_market.bid_call_count == 0
+
+    @staticmethod
+    @patch("gsy_e.constants.MATCHABLE_BID_FORWARDING", True)
+    @patch.object(TwoSidedEngine, "_can_bid_be_matched_above", autospec=True, return_value=False)
+    def test_ma_forgets_held_back_bids_that_were_deleted_and_posted_again(
+            can_bid_be_matched_mock):
+        ConstSettings.MASettings.MARKET_TYPE = 2
+        bid = Bid("bid", pendulum.now(), 1, 1, "B", 1)
+        lower_market = FakeMarket(offers=[], bids=[bid])
+        lower_market.bids = OrderBook(lower_market.bids)
+        higher_market = FakeMarket([], [])
+        higher_market.offers = OrderBook()
+        owner = FakeArea("owner")
+        owner.parent = FakeArea("parent")
+        owner.parent.parent = None
+        market_agent = TwoSidedAgent(
+            owner=owner, lower_market=lower_market, higher_market=higher_market)
+        engine = next(
+            engine for engine in market_agent.engines if engine.markets.source is lower_market)
+        market_agent.event_tick()
+        market_agent.owner.current_tick += 2
+        market_agent.event_tick()
+        assert can_bid_be_matched_mock.call_count == 1
+
+        # The strategy updates the rate of its bid by posting it again with a new id
+        lower_market.bids.pop(bid.id)
+        market_agent.event_bid_deleted(market_id=lower_market.id, bid=bid)
+        lower_market.bids["bid_2"] = Bid("bid_2", pendulum.now(), 2, 1, "B", 2)
+        assert "bid" not in engine.bid_age
+        for _ in range(3):
+            market_agent.owner.current_tick += 1
+            market_agent.event_tick()
+        assert can_bid_be_matched_mock.call_count == 2
+        assert set(engine._held_back_bids._bid_rates) == {"bid_2"}
+
+        # Only the posted bid is released and checked again
+        higher_market.offers["offer"] = Offer("offer", pendulum.now(), 0.5, 1, "E", 0.5)
+        market_agent.owner.current_tick += 1
+        market_agent.event_tick()
+        assert can_bid_be_matched_mock.call_count == 3
+        assert set(engine._held_back_bids._bid_rates) == {"bid_2"}
@@ -0,0 +1,73 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import gc
+from unittest.mock import patch
+
+import pytest
+
+from gsy_e.gsy_e_core.memory_policy import MemoryPolicy, MemoryPolicyMode
+
+
+class TestMemoryPolicy:
+
+    @staticmethod
+    @patch("gsy_e.gsy_e_core.memory_policy.gc.collect", return_value=0)
+    def test_none_policy_does_not_collect(gc_collect_mock):
+        memory_policy = MemoryPolicy(MemoryPolicyMode.NONE.value)
+        memory_policy.event_setup_finished()
+        for slot_number in range(5):
+            memory_policy.event_market_cycle(slot_number)
+        gc_collect_mock.assert_not_called()
+        assert memory_policy.report()["collections"] == 0
+
+    @staticmethod
+    @patch("gsy_e.gsy_e_core.memory_policy.gc.collect", return_value=10)
+    def test_every_n_slots_policy_collects_periodically(gc_collect_mock):
+        memory_policy = MemoryPolicy(MemoryPolicyMode.EVERY_N_SLOTS.value, 3)
+        for slot_number in range(7):
+            memory_policy.event_market_cycle(slot_number)
+        assert gc_collect_mock.call_count == 3
+        assert memory_policy.report()["collected_objects"] == 30
+
+    @staticmethod
+    @patch("gsy_e.gsy_e_core.memory_policy.gc.collect", return_value=0)
+    def test_rss_threshold_policy_collects_only_above_threshold(gc_collect_mock):
+        memory_policy = MemoryPolicy(MemoryPolicyMode.RSS_THRESHOLD.value, rss_threshold_mb=100)
+        with patch.object(memory_policy, "_get_rss_mb", side_effect=[50, 120, 105, 110, 112]):
+            memory_policy.event_market_cycle(0)
+            memory_policy.event_market_cycle(1)
+            memory_policy.event_market_cycle(2)
+            memory_policy.event_market_cycle(3)
+        # the next threshold is raised to 10% above the RSS after the collection
+        assert gc_collect_mock.call_count == 1
+
+    @staticmethod
+    def test_freeze_after_setup_policy_freezes_setup_objects():
+        memory_policy = MemoryPolicy(MemoryPolicyMode.FREEZE_AFTER_SETUP.value)
+        try:
+            memory_policy.event_setup_finished()
+            assert memory_policy.report()["frozen_objects"] == gc.get_freeze_count() > 0
+        finally:
+            gc.unfreeze()
+
+    @staticmethod
+    def test_invalid_configuration_raises_value_error():
+        with pytest.raises(ValueError):
+            MemoryPolicy(MemoryPolicyMode.RSS_THRESHOLD.value)
+        with pytest.raises(ValueError):
+            MemoryPolicy(MemoryPolicyMode.EVERY_N_SLOTS.value, 0)
@@ -16,17 +16,22 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 import unittest
-from unittest.mock import MagicMock
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 
-from gsy_framework.constants_limits import TIME_ZONE, GlobalConfig
+from gsy_framework.constants_limits import TIME_ZONE, ConstSettings, GlobalConfig
+from gsy_framework.enums import BidOfferMatchAlgoEnum
 from gsy_framework.kafka_communication.kafka_producer import (DisabledKafkaConnection,
                                                               KafkaConnection)
 from gsy_framework.sim_results.all_results import ResultsHandler
 from pendulum import duration, today
 
+import gsy_e.constants
 from gsy_e.gsy_e_core.sim_results.endpoint_buffer import SimulationEndpointBuffer
 from gsy_e.gsy_e_core.simulation import Simulation
 from gsy_e.models.config import SimulationConfig
+from gsy_e.models.market import RLOCK_MEMBER_NAME
+from gsy_e.setup import default_2a
 
 
 class SimulationTest(unittest.TestCase):
@@ -35,6 +40,7 @@ class SimulationTest(unittest.TestCase):
         GlobalConfig.sim_duration = duration(days=GlobalConfig.DURATION_D)
         GlobalConfig.slot_length = duration(minutes=GlobalConfig.SLOT_LENGTH_M)
         GlobalConfig.tick_length = duration(seconds=GlobalConfig.TICK_LENGTH_S)
+        gsy_e.constants.SINGLE_THREADED_MARKETS = False
 
     @staticmethod
     def test_results_are_sent_via_kafka_if_not_started_from_cli():
@@ -87,3 +93,49 @@ class SimulationTest(unittest.TestCase):
 
         simulation.endpoint_buffer.prepare_results_for_publish.assert_called_once()
         simulation.kafka_connection.publish.assert_called_once()
+
+    @staticmethod
+    def test_markets_are_single_threaded_if_started_from_cli():
+        simulation_config = SimulationConfig(duration(hours=int(12)),
+                                             duration(minutes=int(60)),
+                                             duration(seconds=int(60)),
+                                             cloud_coverage=0,
+                                             market_maker_rate=30,
+                                             start_date=today(tz=TIME_ZONE),
+                                             external_connection_enabled=False)
+        simulation = Simulation(
+            "default_2a", simulation_config, None, 0, False, duration(), False, False, None, None,
+            None, False
+        )
+        assert simulation.redis_connection is None
+        assert gsy_e.constants.SINGLE_THREADED_MARKETS is True
+
+    @staticmethod
+    def test_markets_have_locks_if_setup_enables_external_matching():
+        def get_setup(config):
+            ConstSettings.MASettings.BID_OFFER_MATCH_TYPE = BidOfferMatchAlgoEnum.EXTERNAL.value
+            return default_2a.get_setup(config)
+
+        def load_setup_module(simulation):
+            simulation.setup_module = SimpleNamespace(get_setup=get_setup)
+
+        simulation_config = SimulationConfig(duration(hours=int(12)),
+                                             duration(minutes=int(60)),
+                                             duration(seconds=int(60)),
+                                             cloud_coverage=0,
+                                             market_maker_rate=30,
+                                             start_date=today(tz=TIME_ZONE),
+                                             external_connection_enabled=False)
+        match_type = ConstSettings.MASettings.BID_OFFER_MATCH_TYPE
+        try:
+            with patch.object(Simulation, "_load_setup_module", load_setup_module), \
+                    patch.object(Simulation, "_create_redis_connection"), \
+                    patch("gsy_e.gsy_e_core.simulation.bid_offer_matcher"):
+                simulation = Simulation(
+                    "default_2a", simulation_config, None, 0, False, duration(), False, False,
+                    None, None, None, False
+                )
+        finally:
+            ConstSettings.MASettings.BID_OFFER_MATCH_TYPE = match_type
+        assert gsy_e.constants.SINGLE_THREADED_MARKETS is False
+        assert getattr(simulation.area.spot_market, RLOCK_MEMBER_NAME) is not None
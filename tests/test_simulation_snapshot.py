@@ -0,0 +1,113 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import json
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+from numpy import random
+from pendulum import now
+
+from gsy_e.gsy_e_core.exceptions import SimulationException
+from gsy_e.gsy_e_core.simulation_branches import get_branch_name, run_simulation_branches
+from gsy_e.gsy_e_core.simulation_snapshot import (
+    SimulationSnapshot, get_settings_class_state, restore_settings_class_state)
+from gsy_e.models.market import RLOCK_MEMBER_NAME
+from gsy_e.models.market.two_sided import TwoSidedMarket
+
+
+class FakeSettings:
+    VALUE = 1
+
+    class NestedSettings:
+        NESTED_VALUE = "a"
+
+    @staticmethod
+    def method():
+        return 0
+
+
+class TestSimulationSnapshot:
+
+    @staticmethod
+    def test_settings_class_state_can_be_restored():
+        settings = get_settings_class_state(FakeSettings)
+        assert settings == {"VALUE": 1, "NestedSettings": {"NESTED_VALUE": "a"}}
+        FakeSettings.VALUE = 2
+        FakeSettings.NestedSettings.NESTED_VALUE = "b"
+        restore_settings_class_state(FakeSettings, settings)
+        assert FakeSettings.VALUE == 1
+        assert FakeSettings.NestedSettings.NESTED_VALUE == "a"
+
+    @staticmethod
+    def test_snapshot_restores_market_and_random_state(tmpdir):
+        market = TwoSidedMarket(time_slot=now())
+        market.bid(10, 1, "buyer", buyer_origin="buyer")
+        snapshot_path = os.path.join(tmpdir, "snapshot.pickle")
+        random.seed(0)
+        SimulationSnapshot.capture("default_2a", 4, 0, None, market, {}).save(snapshot_path)
+        expected_random_numbers = random.random(3)
+
+        snapshot = SimulationSnapshot.load(snapshot_path)
+        snapshot.restore_global_state()
+        assert (random.random(3) == expected_random_numbers).all()
+        assert snapshot.slot_number == 4
+        assert list(snapshot.area.bids.values())[0].buyer == "buyer"
+        assert getattr(snapshot.area, RLOCK_MEMBER_NAME) is not getattr(
+            market, RLOCK_MEMBER_NAME)
+
+    @staticmethod
+    def test_load_rejects_snapshots_of_other_format_versions(tmpdir):
+        snapshot_path = os.path.join(tmpdir, "snapshot.pickle")
+        snapshot = SimulationSnapshot.capture("default_2a", 4, 0, None, None, {})
+        snapshot.format_version = 0
+        snapshot.save(snapshot_path)
+        with pytest.raises(SimulationException):
+            SimulationSnapshot.load(snapshot_path)
+
+        with open(snapshot_path, "wb") as snapshot_file:
+            pickle.dump({"area": None}, snapshot_file)
+        with pytest.raises(SimulationException):
+            SimulationSnapshot.load(snapshot_path)
+
+
+class TestSimulationBranches:
+
+    @staticmethod
+    def test_get_branch_name():
+        assert get_branch_name("/tmp/events/more_pv.json", 1) == "more_pv"
+        assert get_branch_name(None, 1) == "branch_0001"
+
+    @staticmethod
+    @patch("gsy_e.gsy_e_core.simulation_branches.ProcessPoolExecutor", ThreadPoolExecutor)
+    @patch("gsy_e.gsy_e_core.simulation_branches.run_simulation_branch")
+    def test_run_simulation_branches_starts_one_branch_per_live_events_file(
+            run_branch_mock, tmpdir):
+        live_event = {"eventType": "delete_area", "area_uuid": "uuid"}
+        live_events_path = os.path.join(tmpdir, "delete_house.json")
+        with open(live_events_path, "w", encoding="utf-8") as live_events_file:
+            json.dump([live_event], live_events_file)
+        run_branch_mock.side_effect = lambda path, name, *args, **kwargs: {"name": name}
+
+        summary = run_simulation_branches("snapshot.pickle", [live_events_path, None])
+
+        assert summary == [{"name": "branch_0001"}, {"name": "delete_house"}]
+        branch_calls = {call.args[1]: call.args[2] for call in run_branch_mock.call_args_list}
+        assert branch_calls == {"delete_house": [live_event], "branch_0001": None}
@@ -0,0 +1,145 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import pickle
+from base64 import b64encode
+from zlib import decompress
+
+import pytest
+from pendulum import today
+
+from gsy_e.constants import TIME_ZONE
+from gsy_e.gsy_e_core.exceptions import SimulationException
+from gsy_e.gsy_e_core.sim_results.state_checkpoint import (
+    StateCheckpointWriter, merge_state_checkpoints)
+from gsy_e.models.state import ProductionState
+
+
+class FakeArea:
+    """Area with a production state and area stats, as returned by Area.get_checkpoint_state."""
+
+    def __init__(self, uuid, children=None):
+        self.uuid = uuid
+        self.children = children or []
+        self.current_tick = 0
+        self.state = ProductionState()
+        self.exported_energy = {}
+
+    def get_checkpoint_state(self):
+        return {**self.state.get_checkpoint_state(),
+                "current_tick": self.current_tick,
+                "area_stats": {"exported_energy": self.exported_energy}}
+
+
+def _decode(checkpoint):
+    return pickle.loads(decompress(checkpoint))
+
+
+class TestStateCheckpoint:
+
+    @staticmethod
+    @pytest.fixture(name="areas")
+    def areas_fixture():
+        child = FakeArea("child")
+        return FakeArea("root", [child]), child
+
+    @staticmethod
+    def test_delta_checkpoint_contains_only_changed_values(areas):
+        root, child = areas
+        time_slots = [today(tz=TIME_ZONE).add(hours=hour) for hour in range(3)]
+        for time_slot in time_slots:
+            child.state.set_available_energy(1.0, time_slot)
+        writer = StateCheckpointWriter(full_checkpoint_interval=10)
+        full_checkpoint = _decode(writer.create_checkpoint({"slot_number": 1}, root))
+        assert full_checkpoint["is_full"] is True
+        assert set(full_checkpoint["areas"]) == {"root", "child"}
+
+        child.state.decrement_available_energy(0.5, time_slots[1], "child")
+        delta_checkpoint = _decode(writer.create_checkpoint({"slot_number": 2}, root))
+        assert delta_checkpoint["is_full"] is False
+        assert list(delta_checkpoint["areas"]) == ["child"]
+        child_delta = delta_checkpoint["areas"]["child"]
+        assert child_delta["scalars"] == {}
+        time_slots_delta, values_delta = child_delta["series"]["available_energy_kWh"]
+        assert time_slots_delta.tolist() == [time_slots[1].int_timestamp]
+        assert values_delta.tolist() == [0.5]
+
+    @staticmethod
+    def test_full_checkpoint_is_created_after_interval(areas):
+        root, _ = areas
+        writer = StateCheckpointWriter(full_checkpoint_interval=2)
+        assert [_decode(writer.create_checkpoint({}, root))["is_full"]
+                for _ in range(5)] == [True, False, False, True, False]
+
+    @staticmethod
+    def test_merged_checkpoints_can_restore_the_state(areas):
+        root, child = areas
+        time_slots = [today(tz=TIME_ZONE).add(hours=hour) for hour in range(3)]
+        writer = StateCheckpointWriter(full_checkpoint_interval=10)
+        checkpoints = []
+        for tick, time_slot in enumerate(time_slots):
+            child.state.set_available_energy(2.0, time_slot)
+            child.state.decrement_available_energy(tick * 0.5, time_slot, "child")
+            child.current_tick = tick
+            root.exported_energy[time_slot] = tick
+            checkpoints.append(writer.create_checkpoint({"slot_number": tick}, root))
+
+        saved_state = merge_state_checkpoints(
+            [checkpoints[0], b64encode(checkpoints[1]).decode("ascii"), checkpoints[2]])
+
+        assert saved_state["general"] == {"slot_number": 2}
+        assert saved_state["areas"]["child"]["current_tick"] == 2
+        restored_state = ProductionState()
+        restored_state.restore_state(saved_state["areas"]["child"])
+        assert restored_state.get_state() == child.state.get_state()
+        assert list(saved_state["areas"]["root"]["area_stats"]["exported_energy"].values()) == [
+            0, 1, 2]
+
+    @staticmethod
+    def test_merge_requires_a_full_checkpoint(areas):
+        root, _ = areas
+        writer = StateCheckpointWriter(full_checkpoint_interval=10)
+        writer.create_checkpoint({}, root)
+        delta_checkpoint = writer.create_checkpoint({}, root)
+        with pytest.raises(SimulationException):
+            merge_state_checkpoints([delta_checkpoint])
+
+    @staticmethod
+    def test_full_checkpoint_is_created_after_dropped_checkpoint(areas):
+        root, _ = areas
+        writer = StateCheckpointWriter(full_checkpoint_interval=10)
+        writer.create_checkpoint({}, root)
+        writer.create_checkpoint({}, root)
+        writer.checkpoint_dropped()
+        assert [_decode(writer.create_checkpoint({}, root))["is_full"]
+                for _ in range(2)] == [True, False]
+
+    @staticmethod
+    def test_merged_checkpoints_do_not_contain_deleted_time_slots(areas):
+        root, _ = areas
+        time_slots = [today(tz=TIME_ZONE).add(hours=hour) for hour in range(3)]
+        writer = StateCheckpointWriter(full_checkpoint_interval=10)
+        root.exported_energy = {time_slot: 1 for time_slot in time_slots}
+        checkpoints = [writer.create_checkpoint({}, root)]
+        del root.exported_energy[time_slots[0]]
+        checkpoints.append(writer.create_checkpoint({}, root))
+
+        deleted_series = _decode(checkpoints[1])["areas"]["root"]["deleted_series"]
+        assert deleted_series["area_stats/exported_energy"].tolist() == [
+            time_slots[0].int_timestamp]
+        saved_state = merge_state_checkpoints(checkpoints)
+        assert len(saved_state["areas"]["root"]["area_stats"]["exported_energy"]) == 2
@@ -0,0 +1,130 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import csv
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import click
+import pytest
+from gsy_framework.constants_limits import ConstSettings
+from gsy_framework.enums import SpotMarketTypeEnum
+
+from gsy_e.gsy_e_core.cli import _parse_sweep_parameters
+from gsy_e.gsy_e_core.exceptions import SimulationException
+from gsy_e.gsy_e_core.sweep import (
+    SWEEP_SUMMARY_FILE_NAME, SweepRun, create_sweep_runs, run_sweep)
+
+
+class TestSweep:
+
+    @staticmethod
+    @pytest.fixture(name="restore_settings")
+    def restore_settings_fixture():
+        original_market_type = ConstSettings.MASettings.MARKET_TYPE
+        original_match_type = ConstSettings.MASettings.BID_OFFER_MATCH_TYPE
+        original_pricing_scheme = ConstSettings.MASettings.AlternativePricing.PRICING_SCHEME
+        original_grid_fee_type = ConstSettings.MASettings.GRID_FEE_TYPE
+        yield
+        ConstSettings.MASettings.MARKET_TYPE = original_market_type
+        ConstSettings.MASettings.BID_OFFER_MATCH_TYPE = original_match_type
+        ConstSettings.MASettings.AlternativePricing.PRICING_SCHEME = original_pricing_scheme
+        ConstSettings.MASettings.GRID_FEE_TYPE = original_grid_fee_type
+
+    @staticmethod
+    def test_create_sweep_runs_covers_all_combinations():
+        sweep_runs = create_sweep_runs({"seed": [0, 1, 2], "bid_offer_match_type": [1, 2]})
+        assert len(sweep_runs) == 6
+        assert [sweep_run.name for sweep_run in sweep_runs] == [
+            f"run_{index:04d}" for index in range(6)]
+        assert {(sweep_run.seed, sweep_run.bid_offer_match_type)
+                for sweep_run in sweep_runs} == {
+            (seed, match_type) for seed in [0, 1, 2] for match_type in [1, 2]}
+        assert all(sweep_run.market_type == ConstSettings.MASettings.MARKET_TYPE
+                   for sweep_run in sweep_runs)
+
+    @staticmethod
+    def test_create_sweep_runs_skips_alternative_pricing_in_two_sided_markets():
+        sweep_runs = create_sweep_runs({
+            "market_type": [SpotMarketTypeEnum.ONE_SIDED.value,
+                            SpotMarketTypeEnum.TWO_SIDED.value],
+            "pricing_scheme": [0, 1, 2, 3]})
+        assert len(sweep_runs) == 5
+        assert all(sweep_run.pricing_scheme == 0 for sweep_run in sweep_runs
+                   if sweep_run.market_type == SpotMarketTypeEnum.TWO_SIDED.value)
+
+    @staticmethod
+    @pytest.mark.parametrize("parameter_grid", [{"tick_length": [1, 2]}, {"seed": []}])
+    def test_create_sweep_runs_rejects_invalid_parameters(parameter_grid):
+        with pytest.raises(SimulationException):
+            create_sweep_runs(parameter_grid)
+
+    @staticmethod
+    @pytest.mark.usefixtures("restore_settings")
+    def test_apply_settings_configures_global_settings():
+        SweepRun(index=0, seed=1, market_type=SpotMarketTypeEnum.TWO_SIDED.value,
+                 bid_offer_match_type=2, pricing_scheme=0, grid_fee_type=2).apply_settings()
+        assert ConstSettings.MASettings.MARKET_TYPE == SpotMarketTypeEnum.TWO_SIDED.value
+        assert ConstSettings.MASettings.BID_OFFER_MATCH_TYPE == 2
+        assert ConstSettings.MASettings.GRID_FEE_TYPE == 2
+
+    @staticmethod
+    def test_apply_grid_fees_reconfigures_all_market_areas():
+        device = MagicMock(children=[])
+        house = MagicMock(children=[device])
+        grid = MagicMock(children=[house])
+        SweepRun(index=0, seed=1, market_type=1, bid_offer_match_type=1, pricing_scheme=0,
+                 grid_fee_type=1, grid_fee_constant=2.0).apply_grid_fees(grid)
+        grid.area_reconfigure_event.assert_called_once_with(
+            grid_fee_constant=2.0, grid_fee_percentage=None)
+        house.area_reconfigure_event.assert_called_once_with(
+            grid_fee_constant=2.0, grid_fee_percentage=None)
+        device.area_reconfigure_event.assert_not_called()
+
+    @staticmethod
+    @patch("gsy_e.gsy_e_core.sweep.ProcessPoolExecutor", ThreadPoolExecutor)
+    @patch("gsy_e.gsy_e_core.sweep._execute_sweep_run")
+    def test_run_sweep_writes_summary_of_all_runs(execute_mock, tmpdir):
+        def execute_sweep_run(sweep_run, *_args):
+            if sweep_run.seed == 1:
+                raise AssertionError("Simulation failed.")
+            return {"name": sweep_run.name, "seed": sweep_run.seed, "kpi_savings": 1.5}
+        execute_mock.side_effect = execute_sweep_run
+
+        summary = run_sweep("default_2a", {}, {"seed": [0, 1, 2]}, str(tmpdir), max_workers=2)
+        assert [row["name"] for row in summary] == ["run_0000", "run_0001", "run_0002"]
+        assert summary[1]["failed"] is True
+
+        with open(os.path.join(tmpdir, f"{SWEEP_SUMMARY_FILE_NAME}.json"), "r",
+                  encoding="utf-8") as json_file:
+            assert json.load(json_file) == summary
+        with open(os.path.join(tmpdir, f"{SWEEP_SUMMARY_FILE_NAME}.csv"), "r",
+                  encoding="utf-8") as csv_file:
+            rows = list(csv.DictReader(csv_file))
+        assert [row["seed"] for row in rows] == ["0", "1", "2"]
+        assert rows[0]["kpi_savings"] == "1.5"
+
+    @staticmethod
+    def test_parse_sweep_parameters():
+        assert _parse_sweep_parameters(["seed=0,1", "grid_fee_percentage=0.5,-1.5"]) == {
+            "seed": [0, 1], "grid_fee_percentage": [0.5, -1.5]}
+        with pytest.raises(click.BadParameter):
+            _parse_sweep_parameters(["seed"])
+        with pytest.raises(click.BadParameter):
+            _parse_sweep_parameters(["seed=a,b"])
@@ -0,0 +1,108 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# pylint: disable=missing-function-docstring, protected-access
+from unittest.mock import MagicMock
+
+import pytest
+from gsy_framework.constants_limits import GlobalConfig
+from pendulum import duration, today
+
+from gsy_e.constants import TIME_ZONE
+from gsy_e.gsy_e_core.tick_scheduler import TickScheduler
+from gsy_e.models.strategy.update_frequency import TemplateStrategyOfferUpdater
+
+
+@pytest.fixture(name="scheduler")
+def scheduler_fixture():
+    scheduler = TickScheduler()
+    scheduler.activate(True)
+    return scheduler
+
+
+class TestTickScheduler:
+
+    @staticmethod
+    def test_pop_next_tick_returns_next_tick_if_disabled():
+        scheduler = TickScheduler()
+        scheduler.request_wake_up(30)
+        assert scheduler.pop_next_tick(11, 60) == 11
+        assert scheduler.skipped_ticks == 0
+
+    @staticmethod
+    def test_pop_next_tick_skips_to_earliest_wake_up_tick(scheduler):
+        scheduler.request_wake_up(30)
+        scheduler.request_wake_up(None)
+        scheduler.request_wake_up(20)
+        assert scheduler.pop_next_tick(11, 60) == 20
+        assert scheduler.skipped_ticks == 9
+        # The requests are discarded after every pop
+        assert scheduler.pop_next_tick(21, 60) == 60
+        assert scheduler.skipped_ticks == 48
+
+    @staticmethod
+    def test_pop_next_tick_is_bounded_by_next_tick_and_slot_end(scheduler):
+        scheduler.request_wake_up(5)
+        assert scheduler.pop_next_tick(11, 60) == 11
+        scheduler.request_wake_up(100)
+        assert scheduler.pop_next_tick(12, 60) == 60
+
+    @staticmethod
+    def test_pop_next_tick_does_not_skip_after_market_activity(scheduler):
+        scheduler.request_wake_up(30)
+        scheduler.notify_market_activity()
+        assert scheduler.pop_next_tick(11, 60) == 11
+        assert scheduler.pop_next_tick(12, 60) == 60
+
+    @staticmethod
+    def test_activate_resets_the_state(scheduler):
+        scheduler.request_wake_up(30)
+        scheduler.pop_next_tick(11, 60)
+        scheduler.request_wake_up(40)
+        scheduler.activate(False)
+        assert scheduler.enabled is False
+        assert scheduler.skipped_ticks == 0
+        assert scheduler._next_wake_up_tick is None
+
+
+class TestTemplateStrategyUpdaterNextUpdateTick:
+
+    @staticmethod
+    @pytest.fixture(name="strategy")
+    def strategy_fixture():
+        strategy = MagicMock()
+        strategy.area.config.tick_length = duration(seconds=15)
+        strategy.area.spot_market.time_slot = today(tz=TIME_ZONE)
+        return strategy
+
+    @staticmethod
+    @pytest.mark.parametrize("update_counter, expected_tick", [
+        (0, 60), (1, 80), (2, 100), (3, 120), (4, None)])
+    def test_get_next_update_tick(strategy, update_counter, expected_tick):
+        assert GlobalConfig.slot_length == duration(minutes=15)
+        updater = TemplateStrategyOfferUpdater(
+            initial_rate=30, final_rate=10, update_interval=duration(minutes=5))
+        updater.update_counter[strategy.area.spot_market.time_slot] = update_counter
+        strategy.area.current_tick = 65
+        assert updater.get_next_update_tick(strategy) == expected_tick
+
+    @staticmethod
+    def test_get_next_update_tick_without_populated_time_slot(strategy):
+        updater = TemplateStrategyOfferUpdater(
+            initial_rate=30, final_rate=10, update_interval=duration(minutes=5))
+        strategy.area.current_tick = 65
+        assert updater.get_next_update_tick(strategy) is None
@@ -7,7 +7,7 @@ import pendulum
 import pytest
 from gsy_framework.constants_limits import ConstSettings
 from gsy_framework.data_classes import BidOfferMatch
-from gsy_framework.data_classes import TradeBidOfferInfo, Trade
+from gsy_framework.data_classes import TradeBidOfferInfo
 from gsy_framework.matching_algorithms import (
     PayAsBidMatchingAlgorithm, PayAsClearMatchingAlgorithm
 )
@@ -426,17 +426,18 @@ class TestTwoSidedMarket:
                 market_id="",
                 time_slot="").serializable_dict()
         ]
-        offer_trade = Trade("trade", 1, Offer("offer_id", pendulum.now(), 1, 1, "S"), "S", "B",
-                            residual=Offer("residual_offer", pendulum.now(), 0.5, 0.5, "S"),
-                            traded_energy=1, trade_price=1)
-        bid_trade = Trade("bid_trade", 1, Bid("bid_id2", pendulum.now(), 1, 1, "S"), "S", "B",
-                          residual=Bid("residual_bid_2", pendulum.now(), 1, 1, "S"),
-                          traded_energy=1, trade_price=1)
-        matches = TwoSidedMarket._replace_offers_bids_with_residual_in_recommendations_list(
-            matches, offer_trade, bid_trade
-        )
+        residual_offers = {
+            "offer_id": Offer("residual_offer", pendulum.now(), 0.5, 0.5, "S").serializable_dict(),
+            "residual_offer": Offer("residual_offer_2", pendulum.now(), 0.2, 0.2,
+                                    "S").serializable_dict()}
+        residual_bids = {
+            "bid_id2": Bid("residual_bid_2", pendulum.now(), 1, 1, "S").serializable_dict()}
+        matches = [TwoSidedMarket._replace_offers_bids_with_residuals(
+            match, residual_offers, residual_bids) for match in matches]
         assert len(matches) == 2
-        assert matches[0]["offer"]["id"] == "residual_offer"
+        assert matches[0]["offer"]["id"] == "residual_offer_2"
+        assert matches[0]["bid"]["id"] == "bid_id"
+        assert matches[1]["offer"]["id"] == "offer_id2"
         assert matches[1]["bid"]["id"] == "residual_bid_2"
 
 
@@ -462,3 +463,25 @@ class TestTwoSidedMarketMatchRecommendations:
         ]
         market.match_recommendations(recommendations)
         assert len(market.trades) == 1
+
+    @staticmethod
+    def test_match_recommendations_uses_residuals_of_previous_matches(market):
+        """Test that later recommendations are applied to the residuals of partial trades."""
+        bid = Bid("bid_id1", pendulum.now(),
+                  price=4, energy=2, buyer="Buyer", time_slot="2021-10-06T12:00")
+        offers = [Offer(f"offer_id{i}", pendulum.now(),
+                        price=2, energy=1, seller="Seller", time_slot="2021-10-06T12:00")
+                  for i in range(2)]
+
+        market.bids = {bid.id: bid}
+        market.offers = {offer.id: offer for offer in offers}
+
+        recommendations = [
+            BidOfferMatch(
+                bid=bid.serializable_dict(), offer=offer.serializable_dict(),
+                trade_rate=2, selected_energy=1, market_id=market.id,
+                time_slot="2021-10-06T12:00").serializable_dict()
+            for offer in offers]
+        assert market.match_recommendations(recommendations) is True
+        assert len(market.trades) == 2
+        assert len(market.bids) == 0 and len(market.offers) == 0